@@ -1,58 +1,55 @@
 """
 tk_calc_with_menus.py
 A Tkinter calculator GUI (SymPy-based) with keypad and fraction button
+
+SymPy is never imported by the GUI process: computations run in worker
+processes, which are started (and import SymPy) after the window is shown.
 """
 
+import time
+_T0 = time.perf_counter()
+
+import os
+import sys
 import tkinter as tk
 from tkinter import messagebox, scrolledtext, filedialog, simpledialog
-import sympy as sp
-
-# ---------- SymPy symbols ----------
-x, y = sp.symbols('x y')
-
-# ---------- COMPUTATION FUNCTIONS ----------
-def compute_simplify(expr_str: str) -> str:
-    expr = sp.sympify(expr_str)
-    return str(sp.simplify(expr))
-
-def compute_differentiate(expr_str: str) -> str:
-    expr = sp.sympify(expr_str)
-    return str(sp.diff(expr, x))
-
-def compute_integrate(expr_str: str) -> str:
-    expr = sp.sympify(expr_str)
-    return str(sp.integrate(expr, x))
-
-def compute_factor(expr_str: str) -> str:
-    expr = sp.sympify(expr_str)
-    return str(sp.factor(expr))
-
-def compute_newton_raphson(expr_str: str, init_guess, iterations=6) -> str:
-    func = sp.sympify(expr_str)
-    fprime = sp.diff(func, x)
-    root = sp.N(init_guess)
-    for i in range(iterations):
-        fval = sp.N(func.subs(x, root))
-        fprime_val = sp.N(fprime.subs(x, root))
-        if fprime_val == 0:
-            raise ZeroDivisionError("Derivative became zero during Newton-Raphson.")
-        root = root - fval / fprime_val
-    return str(sp.N(root, 12))
-
-def compute_solve(expr_str: str) -> str:
-    if '=' in expr_str:
-        left, right = expr_str.split('=', 1)
-        eq = sp.Eq(sp.sympify(left), sp.sympify(right))
-        sols = sp.solve(eq, x)
-    else:
-        expr = sp.sympify(expr_str)
-        sols = sp.solve(sp.Eq(expr, 0), x)
-    return str(sols)
-
-def compute_limit(expr_str: str, point_str: str) -> str:
-    expr = sp.sympify(expr_str)
-    pt = sp.sympify(point_str)
-    return str(sp.limit(expr, x, pt))
+from tkinter import ttk
+import portfolio
+import store
+from collections import deque
+from cache import RESULT_CACHE, make_key, normalize_expr
+from history import OutputHistory
+from profiling import PROFILER
+from workers import WorkerPool
+
+
+def __getattr__(name):
+    # "from C_calc import compute_*" still works, importing SymPy only when asked
+    if name.startswith("compute_"):
+        import compute
+        return getattr(compute, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# ---------- Background computation ----------
+POLL_MS = 100
+OUTPUT_WINDOW = 200           # most recent history entries kept in the output widget
+QUICK_SIMPLIFY_BUDGET = 2.0   # seconds of simplification work for Tools > Quick Simplify
+PLOT_VIEW = (-10.0, 10.0)     # initial x range of Tools > Plot
+ROOTS_FARM_WIDTH = 1000.0     # wider root-finding ranges are split across the workers
+# idle-time precompute: after the entry has been still for SPECULATE_DELAY_MS, the likely next
+# operations run as background jobs (cheapest first) and their results wait in RESULT_CACHE
+SPECULATE_DELAY_MS = 600
+SPECULATE_OPS = ("differentiate", "factor", "simplify")
+SPECULATE_TIMEOUT = 2.0       # seconds per speculative job
+SPECULATE_CPU_PER_MIN = 15.0  # worker seconds of speculation allowed per minute
+PLOT_HEIGHT = 220
+# seconds before a runaway job is killed (editable from Tools > Timeouts...)
+DEFAULT_TIMEOUTS = {
+    "simplify": 60, "quick_simplify": 30, "differentiate": 30, "integrate": 120, "definite_integral": 60, "factor": 60,
+    "newton": 30, "halley": 30, "derivatives_at": 30, "newton_digits": 120, "newton_multistart": 60, "solve": 60,
+    "real_roots": 120, "integrate_race": 120,
+    "system_newton": 30, "system_multistart": 60, "limit": 60, "plot": 30,
+}
 
 # ---------- GUI ----------
 class CalculatorGUI:
@@ -61,10 +58,33 @@ class CalculatorGUI:
         master.title("C-Calculator (with Menus)")
         master.geometry("800x720")
         self.theme = "dark"
+        self.pool = WorkerPool(preload=("compute",))
+        self.race_pool = None         # own workers for integration races, whose losers are killed
+        self.timeouts = dict(DEFAULT_TIMEOUTS)
+        self.job_rows = {}
+        self._polling = False
+        self.capture_var = tk.BooleanVar(value=False)
+        self.history = OutputHistory()
+        self._shown = deque()         # ids of the history entries currently in the output widget
+        self.dense_var = tk.BooleanVar(value=False)
+        self.plot_order_var = tk.IntVar(value=0)     # 0 plots f, 1 f', 2 f''
+        self.plot_expr = None
+        self.plot_view = PLOT_VIEW
+        self._plot_data = None        # (xs, ys, (ylo, yhi)) of the last finished plot job
+        self._plot_job = None
+        self._plot_next = None        # newest view requested while a plot job was running
+        self._drag_x = None
+        self.speculate_var = tk.BooleanVar(value=True)
+        self._speculative = {}        # cache key -> background job computing it
+        self._speculate_after = None
+        self._speculation_spent = deque()   # (finish time, worker seconds) of recent speculative jobs
+        self._busy = False            # progress bar running (user-requested jobs only)
         self._make_styles()
         self._build_widgets()
         self._build_menus()
         self._bind_shortcuts()
+        # warm the workers (they import SymPy) once the window is up
+        master.after(200, self.pool.start)
 
     def _make_styles(self):
         self.colors = {
@@ -100,12 +120,21 @@ class CalculatorGUI:
         self.title_label.config(bg=c["bg"], fg=c["fg"])
         self.input_frame.config(bg=c["bg"])
         self.output_area.config(bg=c["output_bg"], fg=c["fg"], insertbackground=c["insert_bg"])
+        self.plot_canvas.config(bg=c["output_bg"])
+        self._draw_plot()
         self.entry_expr.config(bg=c["entry_bg"], fg=c["fg"], insertbackground=c["insert_bg"])
         self.entry_init.config(bg=c["entry_bg"], fg=c["fg"], insertbackground=c["insert_bg"])
         for b in self.action_buttons:
             b.config(bg=c["button_bg"], fg=c["fg"])
         for btn in self.keypad_buttons:
             btn.config(bg=c["button_bg"], fg=c["fg"])
+        self.status_frame.config(bg=c["bg"])
+        self.status_label.config(bg=c["bg"], fg=c["fg"])
+        self.cancel_all_btn.config(bg=c["button_bg"], fg=c["fg"])
+        self.jobs_frame.config(bg=c["bg"])
+        for row, label in self.job_rows.values():
+            row.config(bg=c["bg"])
+            label.config(bg=c["bg"], fg=c["fg"])
 
     def _build_widgets(self):
         c = self.colors[self.theme]
@@ -117,7 +146,10 @@ class CalculatorGUI:
         self.input_frame.pack(padx=12, pady=6, fill="x")
 
         tk.Label(self.input_frame, text="Expression (use 'x'):", bg=c["bg"], fg=c["fg"], font=("Arial", 7)).grid(row=0, column=0, sticky="w")
-        self.entry_expr = tk.Entry(self.input_frame, font=("Arial", 8), width=30, insertbackground=c["insert_bg"])
+        self.expr_var = tk.StringVar()
+        self.expr_var.trace_add("write", self._on_expr_changed)
+        self.entry_expr = tk.Entry(self.input_frame, textvariable=self.expr_var, font=("Arial", 8), width=30,
+                                   insertbackground=c["insert_bg"])
         self.entry_expr.grid(row=1, column=0, columnspan=5, sticky="w", pady=6)
 
         tk.Label(self.input_frame, text="Initial guess (Newton-Raphson):", bg=c["bg"], fg=c["fg"], font=("Arial", 7)).grid(row=2, column=0, sticky="w", pady=(8,0))
@@ -127,6 +159,32 @@ class CalculatorGUI:
         self.output_area = scrolledtext.ScrolledText(self.master, width=88, height=6, font=("Courier", 9),
                                                      bg=c["output_bg"], fg=c["fg"], insertbackground=c["insert_bg"])
         self.output_area.pack(padx=12, pady=8, fill="both", expand=False)
+        self.output_area.tag_config("more", underline=True)
+        self.output_area.tag_bind("more", "<Button-1>", self._expand_entry)
+
+        # plot pane, shown by Tools > Plot: drag to pan, wheel to zoom, double-click to set the initial guess
+        self.plot_canvas = tk.Canvas(self.master, height=PLOT_HEIGHT, bg=c["output_bg"], highlightthickness=0)
+        self.plot_canvas.bind("<ButtonPress-1>", self._plot_press)
+        self.plot_canvas.bind("<B1-Motion>", self._plot_drag)
+        self.plot_canvas.bind("<ButtonRelease-1>", self._plot_release)
+        self.plot_canvas.bind("<Double-Button-1>", self._plot_pick)
+        self.plot_canvas.bind("<MouseWheel>", lambda e: self._plot_zoom(e, 0.8 if e.delta > 0 else 1.25))
+        self.plot_canvas.bind("<Button-4>", lambda e: self._plot_zoom(e, 0.8))
+        self.plot_canvas.bind("<Button-5>", lambda e: self._plot_zoom(e, 1.25))
+        self.plot_canvas.bind("<Configure>", lambda e: self._request_plot())
+
+        # running jobs: busy indicator, one row (with Cancel) per job
+        self.status_frame = tk.Frame(self.master, bg=c["bg"])
+        self.status_frame.pack(padx=12, fill="x")
+        self.status_label = tk.Label(self.status_frame, text="Ready", bg=c["bg"], fg=c["fg"], font=("Arial", 7))
+        self.status_label.pack(side="left")
+        self.progress = ttk.Progressbar(self.status_frame, mode="indeterminate", length=120)
+        self.progress.pack(side="left", padx=8)
+        self.cancel_all_btn = tk.Button(self.status_frame, text="Cancel All", font=("Arial", 6),
+                                        bg=c["button_bg"], fg=c["fg"], command=self.cancel_all_jobs)
+        self.cancel_all_btn.pack(side="right")
+        self.jobs_frame = tk.Frame(self.master, bg=c["bg"])
+        self.jobs_frame.pack(padx=12, fill="x")
 
         func_btn_frame = tk.Frame(self.master, bg=c["bg"])
         func_btn_frame.pack(pady=8)
@@ -232,16 +290,47 @@ class CalculatorGUI:
 
         tools_menu = tk.Menu(menubar, tearoff=0)
         tools_menu.add_command(label="Simplify", command=self.on_simplify)
+        tools_menu.add_command(label="Quick Simplify (time budget)", command=self.on_quick_simplify)
         tools_menu.add_command(label="Differentiate", command=self.on_diff)
+        tools_menu.add_command(label="Derivatives at Point...", command=self.on_derivatives_at)
         tools_menu.add_command(label="Integrate", command=self.on_integrate)
+        tools_menu.add_command(label="Integrate (race strategies)", command=self.on_integrate_race)
+        tools_menu.add_command(label="Definite Integral (numeric)...", command=self.on_definite_integral)
+        tools_menu.add_command(label="Definite Integral (exact)...", command=lambda: self.on_definite_integral(exact=True))
         tools_menu.add_command(label="Factor", command=self.on_factor)
         tools_menu.add_command(label="Newton-Raphson", command=self.on_newton)
+        tools_menu.add_command(label="Halley's Method", command=self.on_halley)
+        tools_menu.add_command(label="Newton (high precision)...", command=self.on_newton_digits)
+        tools_menu.add_command(label="Newton (all roots in range)...", command=self.on_newton_multistart)
         tools_menu.add_command(label="Solve (eqn)", command=self.on_solve)
+        tools_menu.add_command(label="Real Roots in Interval...", command=self.on_real_roots)
+        tools_menu.add_command(label="Solve System (Newton)...", command=self.on_system_newton)
+        tools_menu.add_command(label="Solve System (all starts in box)...", command=self.on_system_multistart)
         tools_menu.add_command(label="Limit", command=self.on_limit)
+        tools_menu.add_command(label="Plot", accelerator="Ctrl+P", command=self.on_plot)
+        tools_menu.add_checkbutton(label="Dense Plot Sampling (1M points)", variable=self.dense_var,
+                                   command=self._request_plot)
+        for order, label in enumerate(("Plot f", "Plot f'", "Plot f''")):
+            tools_menu.add_radiobutton(label=label, variable=self.plot_order_var, value=order,
+                                       command=self._plot_order_changed)
+        tools_menu.add_separator()
+        tools_menu.add_command(label="Cancel All Jobs", accelerator="Esc", command=self.cancel_all_jobs)
+        tools_menu.add_command(label="Timeouts...", command=self.set_timeouts)
         menubar.add_cascade(label="Tools", menu=tools_menu)
 
         view_menu = tk.Menu(menubar, tearoff=0)
         view_menu.add_command(label="Toggle Theme", command=self.toggle_theme, accelerator="Ctrl+T")
+        view_menu.add_separator()
+        view_menu.add_command(label="Cache Statistics", command=self.show_cache_stats)
+        view_menu.add_command(label="Clear Cache", command=self.clear_cache)
+        view_menu.add_separator()
+        view_menu.add_command(label="Performance Statistics...", command=self.show_perf_stats)
+        view_menu.add_command(label="Integration Strategy Wins", command=self.show_strategy_wins)
+        view_menu.add_checkbutton(label="Capture cProfile of Slowest Call", variable=self.capture_var)
+        view_menu.add_checkbutton(label="Precompute Likely Results While Idle", variable=self.speculate_var,
+                                  command=self._on_expr_changed)
+        self.persist_var = tk.BooleanVar(value=store.RESULT_STORE is not None)
+        view_menu.add_checkbutton(label="Persistent Cache", variable=self.persist_var, command=self.toggle_persistent_cache)
         menubar.add_cascade(label="View", menu=view_menu)
 
         help_menu = tk.Menu(menubar, tearoff=0)
@@ -259,6 +348,8 @@ class CalculatorGUI:
         self.master.bind_all("<Control-v>", lambda e: self.paste_to_expression())
         self.master.bind_all("<Control-l>", lambda e: self.clear_output())
         self.master.bind_all("<Control-t>", lambda e: self.toggle_theme())
+        self.master.bind_all("<Control-p>", lambda e: self.on_plot())
+        self.master.bind_all("<Escape>", lambda e: self.cancel_all_jobs())
 
     # ---------- Action methods ----------
     def _get_expr(self) -> str:
@@ -277,67 +368,193 @@ class CalculatorGUI:
         if not expr:
             messagebox.showinfo("Input required", "Please enter an expression first.")
             return
-        try:
-            res = compute_simplify(expr)
-            self._append_output(f"Simplified:\n{res}\n")
-        except Exception as e:
-            messagebox.showerror("Error (simplify)", str(e))
+        self._run_job("simplify", (expr,), "Simplified", "simplify")
+
+    def on_quick_simplify(self):
+        expr = self._get_expr()
+        if not expr:
+            messagebox.showinfo("Input required", "Please enter an expression first.")
+            return
+        self._run_job("quick_simplify", (expr, QUICK_SIMPLIFY_BUDGET),
+                      f"Simplified (best in {QUICK_SIMPLIFY_BUDGET:g}s)", "simplify")
 
     def on_diff(self):
         expr = self._get_expr()
         if not expr:
             messagebox.showinfo("Input required", "Please enter an expression first.")
             return
-        try:
-            res = compute_differentiate(expr)
-            self._append_output(f"Derivative wrt x:\n{res}\n")
-        except Exception as e:
-            messagebox.showerror("Error (differentiate)", str(e))
+        self._run_job("differentiate", (expr,), "Derivative wrt x", "differentiate")
+
+    def on_derivatives_at(self):
+        expr = self._get_expr()
+        if not expr:
+            messagebox.showinfo("Input required", "Please enter an expression first.")
+            return
+        point = simpledialog.askstring("Point", "Evaluate the derivatives at x =", initialvalue=self.entry_init.get().strip(),
+                                       parent=self.master)
+        if not point:
+            return
+        order = simpledialog.askinteger("Order", "Highest derivative:", initialvalue=2, minvalue=0, maxvalue=50,
+                                        parent=self.master)
+        if order is None:
+            return
+        self._run_job("derivatives_at", (expr, point, order), f"Derivatives at x = {point}", "differentiate")
 
     def on_integrate(self):
+        expr = self._get_expr()
+        if not expr:
+            messagebox.showinfo("Input required", "Please enter an expression first.")
+            return
+        self._run_job("integrate", (expr,), "Integral wrt x", "integrate")
+
+    def on_integrate_race(self):
+        expr = self._get_expr()
+        if not expr:
+            messagebox.showinfo("Input required", "Please enter an expression first.")
+            return
+        key = make_key("integrate_race", expr, ())
+        found, res = RESULT_CACHE.get(key)
+        if found:
+            self._append_output(res, heading=f"Integral wrt x (raced)  [{expr}]")
+            return
+        race = portfolio.Race(expr)
+        race.key = key
+        if self.race_pool is None:
+            self.race_pool = WorkerPool(preload=portfolio.PRELOAD)
+        race.start(self.race_pool, timeout=self.timeouts.get("integrate_race"))
+        self._add_job_row(race.classifier)
+        self._ensure_polling()
+
+    def on_definite_integral(self, exact=False):
+        expr = self._get_expr()
+        if not expr:
+            messagebox.showinfo("Input required", "Please enter an expression first.")
+            return
+        bounds = simpledialog.askstring("Integration bounds", "Bounds as a, b (e.g. 0, pi or 0, oo):", parent=self.master)
+        if bounds is None:
+            return
+        parts = [p.strip() for p in bounds.split(",")]
+        if len(parts) != 2 or not all(parts):
+            messagebox.showerror("Error (integrate)", "Enter the bounds as a, b.")
+            return
+        kind = "exact" if exact else "numeric"
+        self._run_job("definite_integral", (expr, parts[0], parts[1], exact),
+                      f"Integral from {parts[0]} to {parts[1]} ({kind})", "integrate")
+
+    def on_factor(self):
+        expr = self._get_expr()
+        if not expr:
+            messagebox.showinfo("Input required", "Please enter an expression first.")
+            return
+        self._run_job("factor", (expr,), "Factored form", "factor")
+
+    def on_newton(self):
         expr = self._get_expr()
         if not expr:
             messagebox.showinfo("Input required", "Please enter an expression first.")
             return
         try:
-            res = compute_integrate(expr)
-            self._append_output(f"Integral wrt x:\n{res}\n")
+            ig = self._get_init()
         except Exception as e:
-            messagebox.showerror("Error (integrate)", str(e))
+            messagebox.showerror("Error (Newton-Raphson)", str(e))
+            return
+        self._run_job("newton", (expr, ig), "Newton-Raphson root (approx)", "Newton-Raphson")
 
-    def on_factor(self):
+    def on_halley(self):
         expr = self._get_expr()
         if not expr:
             messagebox.showinfo("Input required", "Please enter an expression first.")
             return
         try:
-            res = compute_factor(expr)
-            self._append_output(f"Factored form:\n{res}\n")
+            ig = self._get_init()
         except Exception as e:
-            messagebox.showerror("Error (factor)", str(e))
+            messagebox.showerror("Error (Halley)", str(e))
+            return
+        self._run_job("halley", (expr, ig), "Halley root (approx)", "Halley")
 
-    def on_newton(self):
+    def on_newton_digits(self):
         expr = self._get_expr()
         if not expr:
             messagebox.showinfo("Input required", "Please enter an expression first.")
             return
         try:
             ig = self._get_init()
-            res = compute_newton_raphson(expr, ig)
-            self._append_output(f"Newton-Raphson root (approx):\n{res}\n")
         except Exception as e:
             messagebox.showerror("Error (Newton-Raphson)", str(e))
+            return
+        digits = simpledialog.askinteger("Digits", "Number of correct digits (up to 20000):", initialvalue=100,
+                                         minvalue=1, maxvalue=20000, parent=self.master)
+        if digits is None:
+            return
+        self._run_job("newton_digits", (expr, ig, digits), f"Newton-Raphson root ({digits} digits)", "Newton-Raphson")
+
+    def on_newton_multistart(self):
+        expr = self._get_expr()
+        if not expr:
+            messagebox.showinfo("Input required", "Please enter an expression first.")
+            return
+        rng = simpledialog.askstring("Initial guesses", "Range of initial guesses as start:stop[:count] (e.g. -10:10:2000):", parent=self.master)
+        if rng is None:
+            return
+        parts = [p.strip() for p in rng.split(":")]
+        if len(parts) not in (2, 3):
+            messagebox.showerror("Error (Newton-Raphson)", "Enter the range as start:stop or start:stop:count.")
+            return
+        self._run_job("newton_multistart", (expr, *parts), f"Newton-Raphson roots from {parts[0]} to {parts[1]}", "Newton-Raphson")
 
     def on_solve(self):
         expr = self._get_expr()
         if not expr:
             messagebox.showinfo("Input required", "Please enter an equation or expression first.")
             return
+        self._run_job("solve", (expr,), "Solve result", "solve")
+
+    def on_system_newton(self):
+        expr = self._get_expr()
+        if not expr:
+            messagebox.showinfo("Input required", "Enter the equations separated by ';' (e.g. x^2 + y^2 = 4; x*y = 1).")
+            return
+        start = simpledialog.askstring("Starting point", "Starting values in variable order x, y, ... (e.g. 1, 0.5):",
+                                       initialvalue=self.entry_init.get().strip(), parent=self.master)
+        if start is None:
+            return
+        self._run_job("system_newton", (expr, start), f"System solution from ({start})", "solve")
+
+    def on_system_multistart(self):
+        expr = self._get_expr()
+        if not expr:
+            messagebox.showinfo("Input required", "Enter the equations separated by ';' (e.g. x^2 + y^2 = 4; x*y = 1).")
+            return
+        rng = simpledialog.askstring("Starting box", "Range of every variable as lo:hi[:count] (e.g. -5:5:500):", parent=self.master)
+        if rng is None:
+            return
+        parts = [p.strip() for p in rng.split(":")]
+        if len(parts) not in (2, 3):
+            messagebox.showerror("Error (solve)", "Enter the range as lo:hi or lo:hi:count.")
+            return
+        self._run_job("system_multistart", (expr, *parts), f"System solutions from starts in [{parts[0]}, {parts[1]}]", "solve")
+
+    def on_real_roots(self):
+        expr = self._get_expr()
+        if not expr:
+            messagebox.showinfo("Input required", "Please enter an equation or expression first.")
+            return
+        rng = simpledialog.askstring("Interval", "Find every real root in lo, hi (e.g. -20, 20):", parent=self.master)
+        if rng is None:
+            return
+        parts = [p.strip() for p in rng.split(",")]
+        if len(parts) != 2 or not all(parts):
+            messagebox.showerror("Error (real roots)", "Enter the interval as lo, hi.")
+            return
+        lo, hi = parts
         try:
-            res = compute_solve(expr)
-            self._append_output(f"Solve result:\n{res}\n")
-        except Exception as e:
-            messagebox.showerror("Error (solve)", str(e))
+            width = float(hi) - float(lo)
+        except ValueError:          # symbolic bounds such as pi: left to the worker
+            width = 0.0
+        if width > ROOTS_FARM_WIDTH and self.pool.size > 1:
+            self._farm_real_roots(expr, lo, hi)
+        else:
+            self._run_job("real_roots", (expr, lo, hi), f"Real roots in [{lo}, {hi}]", "real roots")
 
     def on_limit(self):
         expr = self._get_expr()
@@ -347,11 +564,376 @@ class CalculatorGUI:
         point = simpledialog.askstring("Limit point", "Limit as x → (enter a value or oo for infinity):", parent=self.master)
         if point is None:
             return
+        self._run_job("limit", (expr, point), f"Limit as x→{point}", "limit")
+
+    def on_plot(self):
+        expr = self._get_expr()
+        if not expr:
+            messagebox.showinfo("Input required", "Please enter an expression first.")
+            return
+        if not self.plot_canvas.winfo_ismapped():
+            self.plot_canvas.pack(padx=12, pady=(0, 8), fill="x", before=self.status_frame)
+        if expr != self.plot_expr:
+            self.plot_expr, self.plot_view, self._plot_data = expr, PLOT_VIEW, None
+        self._request_plot()
+
+    # ---------- Plot pane ----------
+    def _request_plot(self):
+        """Ask a worker for the current view; while one plot job runs, only the newest view waits."""
+        if self.plot_expr is None:
+            return
+        width = max(self.plot_canvas.winfo_width(), 100)
+        args = (self.plot_expr, *self.plot_view, width, self.dense_var.get(), self.plot_order_var.get())
+        if self._plot_job is not None:
+            self._plot_next = args
+            return
+        # same worker as the last request, so the expression's sample cache is reused
+        self._plot_job = self.pool.submit("compute:plot_points", args, timeout=self.timeouts.get("plot"),
+                                          tag=("plot", args), affinity=normalize_expr(args[0]))
+        self._ensure_polling()
+
+    def _plot_finished(self, job):
+        self._plot_job = None
+        expr = job.tag[1][0]
+        if expr == self.plot_expr:
+            if job.status == "done":
+                self._plot_data = job.result
+                self._draw_plot()
+            else:
+                if job.status != "cancelled":
+                    self._append_output(f"[Plot failed: {expr}: {job.error}]\n")
+                self._plot_next = None
+        if self._plot_next is not None:
+            args, self._plot_next = self._plot_next, None
+            if args[0] == self.plot_expr:
+                self._request_plot()
+
+    def _plot_order_changed(self):
+        # another function of the same entry: its y range is unrelated to the one drawn
+        self._plot_data = None
+        self._request_plot()
+
+    def _plot_scale(self):
+        # (x -> pixel, y -> pixel, pixel -> x) for the current view
+        w, h = max(self.plot_canvas.winfo_width(), 2), max(self.plot_canvas.winfo_height(), 2)
+        lo, hi = self.plot_view
+        ylo, yhi = self._plot_data[2]
+        return (lambda v: (v - lo) / (hi - lo) * w,
+                lambda v: min(max(h - (v - ylo) / (yhi - ylo) * h, -h), 2 * h),   # clipped: Tk needs sane coordinates
+                lambda px: lo + px / w * (hi - lo))
+
+    def _draw_plot(self):
+        """Redraw the last samples in the current view (the points keep their x, so a pan shows at once)."""
+        canvas = self.plot_canvas
+        canvas.delete("all")
+        if self._plot_data is None:
+            return
+        fg = self.colors[self.theme]["fg"]
+        xs, ys, (ylo, yhi) = self._plot_data
+        px, py, _ = self._plot_scale()
+        w, h = canvas.winfo_width(), canvas.winfo_height()
+        lo, hi = self.plot_view
+        if lo < 0 < hi:
+            canvas.create_line(px(0), 0, px(0), h, fill="gray50")
+        if ylo < 0 < yhi:
+            canvas.create_line(0, py(0), w, py(0), fill="gray50")
+        segment = []
+        for xv, yv in zip(xs, ys):
+            if yv != yv:                    # NaN: pole, gap or undefined
+                if len(segment) >= 4:
+                    canvas.create_line(*segment, fill="#ff6600")
+                segment = []
+            else:
+                segment += (px(xv), py(yv))
+        if len(segment) >= 4:
+            canvas.create_line(*segment, fill="#ff6600")
+        font = ("Arial", 7)
+        canvas.create_text(2, h - 2, text=f"{lo:.4g}", anchor="sw", fill=fg, font=font)
+        canvas.create_text(w - 2, h - 2, text=f"{hi:.4g}", anchor="se", fill=fg, font=font)
+        canvas.create_text(2, 2, text=f"{yhi:.4g}", anchor="nw", fill=fg, font=font)
+        canvas.create_text(2, h - 14, text=f"{ylo:.4g}", anchor="sw", fill=fg, font=font)
+        prime = "'" * self.plot_order_var.get()
+        canvas.create_text(w - 2, 2, text=f"y{prime} for y = {self.plot_expr}" if prime else f"y = {self.plot_expr}",
+                           anchor="ne", fill=fg, font=font)
+
+    def _plot_press(self, event):
+        self._drag_x = event.x
+
+    def _plot_drag(self, event):
+        if self._drag_x is None or self._plot_data is None:
+            return
+        lo, hi = self.plot_view
+        shift = (self._drag_x - event.x) / max(self.plot_canvas.winfo_width(), 2) * (hi - lo)
+        self._drag_x = event.x
+        self.plot_view = (lo + shift, hi + shift)
+        self._draw_plot()
+        self._request_plot()
+
+    def _plot_release(self, event):
+        self._drag_x = None
+
+    def _plot_zoom(self, event, factor):
+        if self._plot_data is None:
+            return
+        lo, hi = self.plot_view
+        at = self._plot_scale()[2](event.x)
+        self.plot_view = (at - (at - lo) * factor, at + (hi - at) * factor)
+        self._draw_plot()
+        self._request_plot()
+
+    def _plot_pick(self, event):
+        if self._plot_data is None:
+            return
+        value = self._plot_scale()[2](event.x)
+        self.entry_init.delete(0, tk.END)
+        self.entry_init.insert(0, f"{value:.6g}")
+        self.status_label.config(text=f"Initial guess set to {value:.6g}")
+
+    # ---------- Speculative precompute ----------
+    def _on_expr_changed(self, *_):
+        """Entry text changed: drop the speculation for the old text and restart the debounce."""
+        if self._speculate_after is not None:
+            self.master.after_cancel(self._speculate_after)
+            self._speculate_after = None
+        current = normalize_expr(self._get_expr())
+        for key, job in list(self._speculative.items()):
+            if key[1] != current:
+                del self._speculative[key]
+                # killing a running job would also kill its warm worker: let it finish, drop the result
+                if job.status == "pending":
+                    self.pool.cancel(job)   # reported (and forgotten) by the next poll
+        if self.speculate_var.get() and current:
+            self._speculate_after = self.master.after(SPECULATE_DELAY_MS, self._speculate)
+
+    def _speculation_budget_left(self) -> float:
+        now = time.monotonic()
+        while self._speculation_spent and self._speculation_spent[0][0] < now - 60:
+            self._speculation_spent.popleft()
+        return SPECULATE_CPU_PER_MIN - sum(sec for _, sec in self._speculation_spent)
+
+    def _speculate(self):
+        self._speculate_after = None
+        expr = self._get_expr()
+        if not expr or not self.speculate_var.get():
+            return
+        # never alongside work the user asked for, and within the CPU budget
+        if any(j.id in self.job_rows for pool in self._pools() for j in pool.running() + pool.pending()):
+            return
+        if self._speculation_budget_left() < SPECULATE_TIMEOUT:
+            return
+        for operation in SPECULATE_OPS:
+            key = make_key(operation, expr, ())
+            if key in self._speculative or RESULT_CACHE.get(key)[0]:
+                continue
+            self._speculative[key] = self.pool.submit(
+                "profiling:run_operation", (False, operation, expr), timeout=SPECULATE_TIMEOUT,
+                tag=("speculate", key), affinity=key[1], background=True)
+        self._ensure_polling(busy=False)
+
+    def _speculation_finished(self, job):
+        key = job.tag[1]
+        current = self._speculative.get(key) is job     # not dropped by an edit meanwhile
+        if current:
+            del self._speculative[key]
+        self._speculation_spent.append((time.monotonic(), job.elapsed))
+        PROFILER.merge(job.extras.get("profile"))
+        if current and job.status == "done":
+            RESULT_CACHE.put(key, job.result)
+
+    # ---------- Farmed root finding ----------
+    def _farm_real_roots(self, expr, lo, hi):
+        """One piece of a wide range per worker; a last job merges the pieces into the usual result."""
+        heading = f"Real roots in [{lo}, {hi}]"
+        key = make_key("real_roots", expr, (lo, hi))
+        found, res = RESULT_CACHE.get(key)
+        if found:
+            self._append_output(res, heading=f"{heading}  [{expr}]")
+            return
+        a, b, n = float(lo), float(hi), self.pool.size
+        edges = [a + (b - a) * i / n for i in range(n)] + [b]
+        farm = {"expr": expr, "lo": lo, "hi": hi, "heading": heading, "key": key, "parts": [None] * n, "jobs": []}
+        for i in range(n):
+            farm["jobs"].append(self.pool.submit("compute:real_roots_part", (expr, edges[i], edges[i + 1]),
+                                                 timeout=self.timeouts.get("real_roots"), tag=("roots", farm, i),
+                                                 affinity=key[1]))
+        self._ensure_polling()
+
+    def _roots_part_finished(self, job):
+        _, farm, i = job.tag
+        if farm.get("failed"):
+            return
+        if job.status != "done":
+            farm["failed"] = True
+            for other in farm["jobs"]:
+                self.pool.cancel(other)
+            if job.status == "cancelled":
+                self._append_output(f"[Cancelled: {farm['heading']}  [{farm['expr']}]]\n")
+            else:
+                messagebox.showerror("Error (real roots)", f"{farm['expr']}\n\n{job.error}")
+            return
+        farm["parts"][i] = job.result
+        if all(p is not None for p in farm["parts"]):
+            merge = self.pool.submit("compute:merge_real_roots", (farm["expr"], farm["lo"], farm["hi"], farm["parts"]),
+                                     timeout=self.timeouts.get("real_roots"),
+                                     tag=(farm["heading"], "real roots", farm["expr"], farm["key"]),
+                                     affinity=farm["key"][1])
+            self._add_job_row(merge)
+
+    # ---------- Raced integration ----------
+    def _race_finished(self, job):
+        race = job.tag[1]
+        heading = f"Integral wrt x (raced)  [{race.expr}]"
+        if job.status == "cancelled" and not race.done:
+            # cancelling any strategy stops the whole race; no win or loss to record
+            race.done = True
+            for other in race.jobs:
+                self.race_pool.cancel(other)
+            self._append_output(f"[Cancelled: {heading}]\n")
+        elif race.finished(job, self.race_pool):
+            if race.winner is not None:
+                RESULT_CACHE.put(race.key, race.format())
+            self._append_output(race.format(), heading=heading)
+        elif job is race.classifier:
+            for j in race.jobs:         # the strategies, started in the order that suits the pattern
+                self._add_job_row(j)
+        # the losers cancelled above are only collected by a later poll; their rows go now
+        for j in [race.classifier] + race.jobs if race.done else [job]:
+            row = self.job_rows.pop(j.id, None)
+            if row is not None:
+                row[0].destroy()
+
+    # ---------- Background jobs ----------
+    def _run_job(self, operation, args, heading, error_label):
+        """Compute in the worker pool; the result is appended when the job finishes."""
+        expr = args[0]
+        key = make_key(operation, expr, args[1:])
+        start = time.perf_counter()
+        found, res = RESULT_CACHE.get(key)
+        if found:
+            self._append_output(res, heading=f"{heading}  [{expr}]")
+            PROFILER.record({"op": f"gui.{operation}", "total": time.perf_counter() - start,
+                             "stages": {"cache": time.perf_counter() - start}, "size": len(res), "error": False})
+            return
+        job = self._speculative.pop(key, None)
+        if job is not None and not job.done:
+            # already being precomputed: adopt that job instead of starting again
+            job.tag = (heading, error_label, expr, key)
+            self.pool.promote(job, timeout=self.timeouts.get(operation))
+            self._add_job_row(job)
+            self._ensure_polling()
+            return
+        job = self.pool.submit("profiling:run_operation", (self.capture_var.get(), operation) + tuple(args),
+                               timeout=self.timeouts.get(operation),
+                               tag=(heading, error_label, expr, key), affinity=key[1])
+        self._add_job_row(job)
+        self._ensure_polling()
+
+    def _ensure_polling(self, busy=True):
+        if busy and not self._busy:
+            self._busy = True
+            self.progress.start(12)
+        if not self._polling:
+            self._polling = True
+            self.master.after(POLL_MS, self._poll_jobs)
+
+    @staticmethod
+    def _job_text(job) -> str:
+        if job.tag[0] == "race":
+            _, race, strategy = job.tag
+            return f"Integral wrt x (raced: {strategy or 'classifying'})  [{race.expr}]"
+        heading, _, expr, _ = job.tag
+        return f"{heading}  [{expr}]"
+
+    def _add_job_row(self, job):
+        c = self.colors[self.theme]
+        row = tk.Frame(self.jobs_frame, bg=c["bg"])
+        label = tk.Label(row, text=self._job_text(job), anchor="w", bg=c["bg"], fg=c["fg"], font=("Arial", 7))
+        label.pack(side="left", fill="x", expand=True)
+        btn = tk.Button(row, text="Cancel", font=("Arial", 6), bg=c["button_bg"], fg=c["fg"],
+                        command=lambda: self._cancel_job(job))
+        btn.pack(side="right")
+        row.pack(fill="x")
+        self.job_rows[job.id] = (row, label)
+
+    def _pools(self) -> list:
+        return [self.pool] if self.race_pool is None else [self.pool, self.race_pool]
+
+    def _cancel_job(self, job):
+        (self.race_pool if job.tag[0] == "race" else self.pool).cancel(job)
+        self._poll_jobs(reschedule=False)
+
+    def cancel_all_jobs(self):
+        for pool in self._pools():
+            pool.cancel_all()
+        self._poll_jobs(reschedule=False)
+
+    def _poll_jobs(self, reschedule=True):
+        for job in [j for pool in self._pools() for j in pool.poll()]:
+            if job.tag[0] == "plot":
+                self._plot_finished(job)
+            elif job.tag[0] == "speculate":
+                self._speculation_finished(job)
+            elif job.tag[0] == "roots":
+                self._roots_part_finished(job)
+            elif job.tag[0] == "race":
+                self._race_finished(job)
+            elif job.tag[0] == "workers":
+                self._broadcast_finished(job)
+            else:
+                self._job_finished(job)
+        jobs = [j for pool in self._pools() for j in pool.running() + pool.pending()]
+        for job in jobs:
+            if job.id not in self.job_rows:
+                continue                    # plot, speculative and farmed root jobs have no row
+            state = f"{job.elapsed:.1f}s" if job.status == "running" else "queued"
+            self.job_rows[job.id][1].config(text=f"{self._job_text(job)}  ({state})")
+        # speculative jobs are invisible: they neither show as running nor spin the progress bar
+        active = sum(1 for j in jobs if not j.background)
+        self.status_label.config(text=f"{active} job(s) running" if active else "Ready")
+        if not active and self._busy:
+            self._busy = False
+            self.progress.stop()
+        if not reschedule:
+            return
+        if any(pool.active() for pool in self._pools()):
+            self.master.after(POLL_MS, self._poll_jobs)
+        else:
+            self._polling = False
+
+    def _job_finished(self, job):
+        heading, error_label, expr, key = job.tag
+        row, _ = self.job_rows.pop(job.id)
+        row.destroy()
+        PROFILER.merge(job.extras.get("profile"))
+        start = time.perf_counter()
+        if job.status == "done":
+            RESULT_CACHE.put(key, job.result)
+            self._append_output(job.result, heading=f"{heading}  [{expr}]")
+        elif job.status == "cancelled":
+            self._append_output(f"[Cancelled: {heading}  [{expr}]]\n")
+        else:
+            messagebox.showerror(f"Error ({error_label})", f"{expr}\n\n{job.error}")
+        display = time.perf_counter() - start
+        # click-to-result latency as the user saw it
+        PROFILER.record({"op": f"gui.{key[0]}", "total": job.started - job.submitted + job.elapsed + display,
+                         "stages": {"queue": job.started - job.submitted, "worker": job.elapsed, "display": display},
+                         "size": len(job.result) if isinstance(job.result, str) else 0,
+                         "error": job.status != "done"})
+
+    def set_timeouts(self):
+        current = ", ".join(f"{op}={sec:g}" for op, sec in self.timeouts.items())
+        txt = simpledialog.askstring("Timeouts", "Per-operation timeouts in seconds (operation=seconds, ...):",
+                                     initialvalue=current, parent=self.master)
+        if txt is None:
+            return
         try:
-            res = compute_limit(expr, point)
-            self._append_output(f"Limit as x→{point}:\n{res}\n")
-        except Exception as e:
-            messagebox.showerror("Error (limit)", str(e))
+            for item in filter(None, (p.strip() for p in txt.split(","))):
+                op, sec = (v.strip() for v in item.split("=", 1))
+                if op not in self.timeouts:
+                    raise ValueError(f"Unknown operation: {op}")
+                self.timeouts[op] = float(sec)
+        except ValueError as e:
+            messagebox.showerror("Timeouts", str(e))
 
     # ---------- Utility ----------
     def open_expression_from_file(self):
@@ -373,13 +955,13 @@ class CalculatorGUI:
             return
         try:
             with open(fn, 'w', encoding='utf-8') as f:
-                f.write(self.output_area.get("1.0", tk.END))
+                self.history.write(f)
             messagebox.showinfo("Saved", f"Output saved to: {fn}")
         except Exception as e:
             messagebox.showerror("Save error", str(e))
 
     def copy_output(self):
-        txt = self.output_area.get("1.0", tk.END).strip()
+        txt = "".join(self.history.iter_text()).strip()
         if not txt:
             return
         self.master.clipboard_clear()
@@ -396,12 +978,38 @@ class CalculatorGUI:
             self.entry_expr.insert(0, txt)
 
     def clear_output(self):
+        self.history.clear()
+        self._shown.clear()
         self.output_area.delete("1.0", tk.END)
 
-    def _append_output(self, text: str):
-        self.output_area.insert(tk.END, text + "\n")
+    def _append_output(self, text: str, heading=None):
+        """Record text in the history and show it; results get a heading line."""
+        entry = self.history.append(text, heading)
+        shown, hidden = self.history.preview(entry)
+        tag = f"entry{entry.id}"
+        if hidden:
+            self.output_area.insert(tk.END, shown.rstrip("\n") + "\n", (tag,))
+            self.output_area.insert(tk.END, f"[{hidden} more characters - click to show all]\n\n", (tag, "more"))
+        else:
+            self.output_area.insert(tk.END, shown, (tag,))
+        self._shown.append(entry.id)
+        # keep only a window of entries in the widget; the history keeps the rest
+        while self._shown and (len(self._shown) > OUTPUT_WINDOW or self.history.get(self._shown[0]) is None):
+            old = f"entry{self._shown.popleft()}"
+            ranges = self.output_area.tag_ranges(old)
+            if ranges:
+                self.output_area.delete(ranges[0], ranges[-1])
         self.output_area.see(tk.END)
 
+    def _expand_entry(self, event=None):
+        tag = next((t for t in self.output_area.tag_names("current") if t.startswith("entry")), None)
+        entry = tag and self.history.get(int(tag[len("entry"):]))
+        if not entry:
+            return
+        ranges = self.output_area.tag_ranges(tag)
+        self.output_area.delete(ranges[0], ranges[-1])
+        self.output_area.insert(ranges[0], entry.render(), (tag,))
+
     def toggle_theme(self):
         # Cycle themes: dark -> light -> mature ->        
         if self.theme == "dark":
@@ -412,6 +1020,123 @@ class CalculatorGUI:
             self.theme = "dark"
         self._apply_theme()
 
+    def show_cache_stats(self):
+        # every worker keeps its own cache; the dialog opens once all of them have answered
+        self._broadcast("cache:RESULT_CACHE.stats", done=self._show_cache_stats)
+
+    def _show_cache_stats(self, jobs):
+        lines = []
+        for name, st in [("This window", RESULT_CACHE.stats())] + [
+                (f"Worker {i}", job.result) for i, job in enumerate(jobs, 1) if job.status == "done"]:
+            lookups = st["hits"] + st["misses"]
+            rate = f"{100 * st['hits'] / lookups:.0f}%" if lookups else "n/a"
+            lines.append(f"{name}: {st['entries']} / {st['max_entries']} entries, "
+                         f"{st['chars']} / {st['max_chars']} chars\n"
+                         f"  Hits: {st['hits']}   Misses: {st['misses']}   Hit rate: {rate}   "
+                         f"Evictions: {st['evictions']}")
+        messagebox.showinfo("Cache Statistics", "\n".join(lines) + f"\n\n{self._store_summary()}")
+
+    def _store_summary(self) -> str:
+        if store.RESULT_STORE is None:
+            return "Persistent cache: off"
+        try:
+            st = store.RESULT_STORE.stats()
+            return f"Persistent cache: {st['entries']} / {st['max_entries']} entries\n{st['path']}"
+        except Exception as e:
+            return f"Persistent cache error: {e}"
+
+    def toggle_persistent_cache(self):
+        try:
+            if self.persist_var.get():
+                st = store.enable_store()
+                setting = st.path
+                self._append_output(f"[Persistent cache on: {st.path}]\n")
+            else:
+                store.disable_store()
+                setting = "0"
+                self._append_output("[Persistent cache off]\n")
+        except Exception as e:
+            self.persist_var.set(False)
+            messagebox.showerror("Persistent cache error", str(e))
+            return
+        # workers started from now on read the variable; the running ones are told directly
+        os.environ["CCALC_RESULT_STORE"] = setting
+        self._broadcast("store:apply_setting", (setting,))
+
+    def clear_cache(self):
+        RESULT_CACHE.clear()
+        if store.RESULT_STORE is not None:
+            store.RESULT_STORE.clear()
+        self._broadcast("cache:RESULT_CACHE.clear")
+        self._append_output("[Result cache cleared]\n")
+
+    def _broadcast(self, target, args=(), done=None):
+        """Run target in every worker; done(jobs) is called once they have all finished."""
+        group = {"jobs": [], "done": done}
+        group["jobs"] = self.pool.broadcast(target, args, tag=("workers", group))
+        self._ensure_polling(busy=False)
+
+    def _broadcast_finished(self, job):
+        group = job.tag[1]
+        if group["done"] is not None and all(j.done for j in group["jobs"]):
+            done, group["done"] = group["done"], None     # several may finish in one poll
+            done(group["jobs"])
+
+    def show_strategy_wins(self):
+        c = self.colors[self.theme]
+        win = tk.Toplevel(self.master)
+        win.title("Integration Strategy Wins")
+        win.config(bg=c["bg"])
+        text = scrolledtext.ScrolledText(win, width=64, height=20, font=("Courier", 8),
+                                         bg=c["output_bg"], fg=c["fg"])
+        text.pack(padx=8, pady=8, fill="both", expand=True)
+        text.insert(tk.END, portfolio.WIN_STATS.format_table())
+        text.config(state="disabled")
+
+    def show_perf_stats(self):
+        c = self.colors[self.theme]
+        win = tk.Toplevel(self.master)
+        win.title("Performance Statistics")
+        win.config(bg=c["bg"])
+        text = scrolledtext.ScrolledText(win, width=110, height=24, font=("Courier", 8),
+                                         bg=c["output_bg"], fg=c["fg"])
+        text.pack(padx=8, pady=8, fill="both", expand=True)
+
+        def refresh():
+            text.delete("1.0", tk.END)
+            text.insert(tk.END, PROFILER.format_table())
+
+        def export(kind):
+            fn = filedialog.asksaveasfilename(parent=win, title=f"Export statistics ({kind.upper()})",
+                                              defaultextension=f".{kind}", filetypes=[(kind.upper(), f"*.{kind}")])
+            if not fn:
+                return
+            try:
+                PROFILER.export_json(fn) if kind == "json" else PROFILER.export_csv(fn)
+            except Exception as e:
+                messagebox.showerror("Export error", str(e), parent=win)
+
+        def save_profile():
+            if PROFILER.slowest is None:
+                messagebox.showinfo("No profile", "Enable View > Capture cProfile of Slowest Call and run an operation first.", parent=win)
+                return
+            fn = filedialog.asksaveasfilename(parent=win, title="Save slowest call profile", defaultextension=".prof",
+                                              filetypes=[("pstats files", "*.prof")])
+            if fn:
+                PROFILER.dump_slowest(fn)
+
+        def reset():
+            PROFILER.reset()
+            refresh()
+
+        bar = tk.Frame(win, bg=c["bg"])
+        bar.pack(pady=(0, 8))
+        for label, cmd in (("Refresh", refresh), ("Export JSON...", lambda: export("json")),
+                           ("Export CSV...", lambda: export("csv")), ("Save Slowest Profile...", save_profile),
+                           ("Reset", reset)):
+            tk.Button(bar, text=label, command=cmd, bg=c["button_bg"], fg=c["fg"], font=("Arial", 7)).pack(side="left", padx=3)
+        refresh()
+
     def show_about(self):
         messagebox.showinfo("About", "C-Calculator\nTkinter + SymPy\nKeypad-enabled GUI\n(©Hodo Charles 2025)\nDedicated to AFIT(Mathematics Dept) \n & C-learn Team")
 
@@ -420,20 +1145,50 @@ class CalculatorGUI:
             "How to use:\n"
             "• Type or click buttons to enter expression(equation).\n"
             "• Use 'x' for variable, sqrt() for roots.\n"
-            "•example of expression is\n x**3-3*x-6 which is the same as \n x^3-3*x-6\n"
+            "•example of expression is\n x**3-3*x-6 which is the same as \n x^3-3*x-6 or x^3-3x-6\n"
             "• trig functions should have \na closing bracket cos(x)\n"
                "• Use oo (small leter o)\nfor infinity in limits.\n"
             "• Click Tools button or menu for operations.\n"
             "• Newton-Raphson requires initial guess.\n"
+            "• Systems: x^2 + y^2 = 4; x*y = 1\n(Tools > Solve System).\n"
+            "• Real Roots in Interval lists every root\nin lo, hi without an initial guess.\n"
+            "• Integrate (race strategies) runs each\nintegration method in its own worker and\n"
+            "keeps the first result that differentiates\nback to the entry.\n"
+            "• Plot (Ctrl+P): drag to pan, wheel to zoom,\ndouble-click to set the initial guess.\n"
+            "• Derivatives at Point, Halley and Plot f'/f''\nuse automatic differentiation.\n"
             "• Toggle theme with Ctrl+T."
         )
         messagebox.showinfo("Docs / How to use", help_text)
 
+# ---------- Startup timing ----------
+def report_startup(root, app):
+    """--startup-timing: print import, first-window and first-compute latency, then exit."""
+    root.update()
+    t_window = time.perf_counter()
+    job = app.pool.submit("compute:run_operation", ("simplify", "x + x"))
+    while not job.done:
+        app.pool.wait(0.05)
+        root.update()
+    t_compute = time.perf_counter()
+    print(f"imports:        {(_T_IMPORTED - _T0) * 1000:8.1f} ms")
+    print(f"window shown:   {(t_window - _T0) * 1000:8.1f} ms")
+    print(f"first compute:  {(t_compute - _T0) * 1000:8.1f} ms  ({job.status}: {job.result or job.error})")
+    root.destroy()
+
 # ---------- Run ----------
 def main():
     root = tk.Tk()
     app = CalculatorGUI(root)
-    root.mainloop()
+    try:
+        if "--startup-timing" in sys.argv[1:]:
+            report_startup(root, app)
+        else:
+            root.mainloop()
+    finally:
+        for pool in app._pools():
+            pool.shutdown()
+
+_T_IMPORTED = time.perf_counter()
 
 if __name__ == "__main__":
     main()
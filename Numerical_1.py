@@ -1,26 +1,47 @@
-import guidelines as gd
-import sympy as sp
-import limit
-from sympy import symbols, simplify,sympify
-from sympy.core.sympify import SympifyError
+import time
+_T0 = time.perf_counter()
+import importlib
+import sys
+import threading
 from rich import print
 from rich.align import Align
 
+# SymPy (and everything built on it) is most of the startup time, so it is
+# imported by a background thread while the first prompt is on screen. The
+# functions import what they need themselves; if the preload is still running
+# that import simply waits for it.
+HEAVY_MODULES = ("sympy", "newton", "simplify_budget", "session", "limit", "guidelines")
 
-x, y = symbols('x y')  # Define globally so all functions can use
+def _preload():
+	for name in HEAVY_MODULES:
+		importlib.import_module(name)
+
+SIMPLIFY_BUDGET = 2.0  # seconds allowed for option 2 (Algebraic Simplification)
+NEWTON_STEPS = 50      # default maximum iterations for option 4 (NRM)
 
 #A function to simplify an arithmetic expression
-def simplify_eqn(expr):
+# (with a budget in seconds, cheap passes run first and the best form found in time is shown)
+def simplify_eqn(expr, budget=None):
+	from sympy.core.sympify import SympifyError
+	import session
+	import simplify_budget
 	try:
 		
 		# Example: Define the expression you want to simplify
 		
 		
 		# Simplify the expression
-		simplified_expr = simplify(expr)
+		entry = session.expression(str(expr))
+		if budget is None:
+			simplified_expr = entry.simplified
+		else:
+			result = simplify_budget.tiered_simplify(entry.expr, budget)
+			simplified_expr = result.expr
 		# Output result
 		print("\nOriginal Expression:", expr)
 		print(f"✅Simplified Expression:{ simplified_expr}\n")
+		if budget is not None:
+			print(simplify_budget.format_passes(result), "\n")
 		return simplified_expr
 	
 	except (SympifyError, ValueError,Exception):
@@ -31,15 +52,14 @@ def simplify_eqn(expr):
 		
 #function for the derivative
 def differentiate(function):
+    import sympy as sp
+    import session
     try:
-	 # Define the symbols also knom as  variable
-	       x = sp.symbols('x')
-	       
-	       
-	       # Convert the string to an expression
-	       f = sp.sympify(function)
-	       # Differentiate the function
-	       derivative = sp.diff(f, x)
+	       # Convert the string to an expression (parsed once per entry)
+	       entry = session.expression(function)
+	       f = entry.expr
+	       # Differentiate the function (also reused by NRM)
+	       derivative = entry.derivative
 	       # Display the result of the derivative
 	       print(f"✅The derivative of {f} with respect to x is: {derivative}\n")
 	       return derivative
@@ -48,37 +68,47 @@ def differentiate(function):
         return None
         
         
-# Newton-Raphson method (1 iteration)
+# Newton-Raphson method: the map x - f/f' is built once, then
+# iterated as a compiled function; the steps are shown as one table at the end
 def Raphson(function_eqn):
+    import math
+    import newton
+    import session
+    from rich import box
+    from rich.table import Table
     try:
-        n=1 #this represents the number of iterations
-        
         root = float(input("Enter initial root: "))
+        steps = input(f"Maximum number of iterations [{NEWTON_STEPS}]: ").strip()
+        max_iter = int(steps) if steps else NEWTON_STEPS
+        if max_iter < 1:
+            raise ValueError("the number of iterations must be at least 1")
 
-        function = sympify(function_eqn)
-       
-       #func_prime refers to the first derivative
-        func_prime = differentiate(function_eqn)       
-        if func_prime is None:
-            return
-        for i in range(1,4):
-            
-            f_val = function.subs(x, root)
-            f_prime_val = func_prime.subs(x, root)
-            if f_prime_val == 0:
-                print("Derivative is zero. Equation ended .\n")
-                return
-                # Newton-Raphson formula: x(n+1) = xn - f(xn)/f'(xn)
-            new_root_expr = x - function / func_prime
-            simplified = simplify_eqn(new_root_expr)
-            new_root = root - f_val / f_prime_val
-            print(f"➡️==> f({root}) = {f_val}")
-            print(f"➡️==> f'({root}) = {f_prime_val}")
-            print("="*60)
-            print(f"✅NEW ROOT after {n} iteration: {new_root}\n")
-            print("="*60)
-            root=new_root
-            n+=1 #increament the iteration by 1
+        entry = session.expression(function_eqn)
+        # the derivative is computed once per entry and shared with the Newton map below
+        print(f"✅The derivative of {entry.expr} with respect to x is: {entry.derivative}\n")
+        # Newton-Raphson formula: x(n+1) = xn - f(xn)/f'(xn)
+        print(f"Newton map: x - f(x)/f'(x) = {entry.newton_map}\n")
+        f, fp = entry.compiled
+        rows = newton.newton_trace(entry.compiled_map, f, fp, root, max_iter=max_iter)
+
+        table = Table(title="Newton-Raphson iterations", box=box.SIMPLE_HEAD)
+        for name in newton.TRACE_COLUMNS:
+            table.add_column(name, justify="right", overflow="fold")    # wrap digits rather than hide them
+        for r in rows:
+            table.add_row(str(r.n), f"{r.x:.15g}", f"{r.f:.6g}", f"{r.fprime:.6g}", f"{r.step:.6g}",
+                          f"{r.error:.3g}", "" if math.isnan(r.order) else f"{r.order:.3f}")
+        print(table)
+        status = newton.trace_status(rows)
+        if status == newton.TRACE_CONVERGED:
+            new_root = rows[-1].x + rows[-1].step
+            print(f"✅Converged to {new_root} after {len(rows)} iterations (|f| = {abs(f(new_root)):.3g})\n")
+        else:
+            print(f"[bold red]No convergence after {len(rows)} iterations: {status}[/bold red]\n")
+
+        path = input("Save the table as CSV (file name, or Enter to skip): ").strip()
+        if path:
+            newton.write_trace_csv(rows, path)
+            print(f"Saved {len(rows)} rows to {path}\n")
 
     except Exception as e:
         print("NRM Error:", str(e))
@@ -86,10 +116,12 @@ def Raphson(function_eqn):
 	        
 #Function for operations to carry out
 def menu(option):
+    import guidelines as gd
+    import limit
     if option == 1:
         gd.instructions()
     elif option == 2:
-        simplify_eqn(function)
+        simplify_eqn(function, SIMPLIFY_BUDGET)
     elif option == 3:
         differentiate(function)
     elif option == 4:
@@ -102,11 +134,24 @@ def menu(option):
 				
 
 
+threading.Thread(target=_preload, daemon=True).start()
+
 # a loop that keeps running in ordee to ask for the user's request'
 calc_title=Align.center("[bold magenta]=====WELCOME TO C-CALC====[/bold magenta]\n")
 print(calc_title)
 advise="[bold red]Please, read the imstructions before using this calculator in order to understand how to use it efficiently. To use the instruction manual, type any number and press enter, select option 1\n[/bold red]"
 print(advise)
+if "--startup-timing" in sys.argv[1:]:
+	# report how long until the prompt, the preload and a first computation, then exit
+	t_prompt = time.perf_counter()
+	import newton
+	t_loaded = time.perf_counter()
+	newton.newton_solve(newton.x**2 - 2, 1)
+	t_compute = time.perf_counter()
+	print(f"first prompt:   {(t_prompt - _T0) * 1000:8.1f} ms")
+	print(f"math loaded:    {(t_loaded - _T0) * 1000:8.1f} ms")
+	print(f"first compute:  {(t_compute - _T0) * 1000:8.1f} ms")
+	sys.exit(0)
 while True:
 			print("To quit the program, type [bold red]exit[/bold red]\nEnter function in terms of x (2*x**3) : ", end=" ")
 			function = input()
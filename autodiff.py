@@ -0,0 +1,265 @@
+"""
+autodiff.py
+Forward-mode automatic differentiation: f, f', ..., f^(k) at a point or over
+a NumPy array of points, without building a symbolic derivative
+
+The parsed expression is compiled once into a tape of truncated Taylor
+series operations (shared subexpressions are evaluated once). Evaluating the
+tape to order k costs O(k^2) per tape step, so the cost grows with the size
+of the expression rather than with the size of its derivatives, which swell
+for nested compositions and higher orders.
+"""
+
+import math
+from functools import lru_cache
+
+import numpy as np
+import sympy as sp
+
+x = sp.symbols('x')
+
+MAX_ORDER = 50
+
+
+# ---------- Taylor arithmetic ----------
+# A series is a list of k + 1 Taylor coefficients (floats or arrays): f^(j)(x0) = j! * c[j].
+def _const(value, n):
+    return [value] + [0.0] * (n - 1)
+
+
+def _add(terms):
+    return [sum(cs) for cs in zip(*terms)]
+
+
+def _scale(a, factor):
+    return [factor * c for c in a]
+
+
+def _mul(a, b):
+    return [sum(a[i] * b[k - i] for i in range(k + 1)) for k in range(len(a))]
+
+
+def _div(a, b):
+    c = []
+    for k in range(len(a)):
+        c.append((a[k] - sum(b[i] * c[k - i] for i in range(1, k + 1))) / b[0])
+    return c
+
+
+def _reciprocal(a):
+    return _div(_const(1.0, len(a)), a)
+
+
+def _integral(a, g, u0):
+    # u with u' = a' * g and u(x0) = u0
+    u = [u0]
+    for k in range(1, len(a)):
+        u.append(sum(i * a[i] * g[k - i] for i in range(1, k + 1)) / k)
+    return u
+
+
+def _exp(a):
+    e = [np.exp(a[0])]
+    for k in range(1, len(a)):
+        e.append(sum(i * a[i] * e[k - i] for i in range(1, k + 1)) / k)
+    return e
+
+
+def _log(a):
+    return _integral(a, _reciprocal(a), np.log(a[0]))
+
+
+def _sincos(a, hyperbolic=False):
+    s, c = [np.sinh(a[0]) if hyperbolic else np.sin(a[0])], [np.cosh(a[0]) if hyperbolic else np.cos(a[0])]
+    sign = 1 if hyperbolic else -1
+    for k in range(1, len(a)):
+        s.append(sum(i * a[i] * c[k - i] for i in range(1, k + 1)) / k)
+        c.append(sign * sum(i * a[i] * s[k - i] for i in range(1, k + 1)) / k)
+    return s, c
+
+
+def _int_power(a, p: int):
+    if p < 0:
+        return _reciprocal(_int_power(a, -p))
+    result, base = _const(1.0, len(a)), a
+    while p:
+        if p & 1:
+            result = _mul(result, base)
+        p >>= 1
+        if p:
+            base = _mul(base, base)
+    return result
+
+
+def _power(a, r: float):
+    """a ** r for a constant exponent (integers by multiplication, so a(x0) = 0 is fine)."""
+    if float(r).is_integer() and abs(r) <= 1024:
+        return _int_power(a, int(r))
+    p = [np.power(a[0], r)]
+    for k in range(1, len(a)):
+        p.append(sum(((r + 1) * i - k) * a[i] * p[k - i] for i in range(1, k + 1)) / (k * a[0]))
+    return p
+
+
+def _square_plus(a, sign, const):
+    # const + sign * a^2
+    sq = _scale(_mul(a, a), sign)
+    sq[0] = sq[0] + const
+    return sq
+
+
+# name -> Taylor series of the function applied to series a
+def _tan(a):
+    s, c = _sincos(a)
+    return _div(s, c)
+
+
+def _cot(a):
+    s, c = _sincos(a)
+    return _div(c, s)
+
+
+def _tanh(a):
+    s, c = _sincos(a, True)
+    return _div(s, c)
+
+
+FUNCTIONS = {
+    sp.exp: _exp,
+    sp.log: _log,
+    sp.sin: lambda a: _sincos(a)[0],
+    sp.cos: lambda a: _sincos(a)[1],
+    sp.tan: _tan,
+    sp.cot: _cot,
+    sp.sec: lambda a: _reciprocal(_sincos(a)[1]),
+    sp.csc: lambda a: _reciprocal(_sincos(a)[0]),
+    sp.sinh: lambda a: _sincos(a, True)[0],
+    sp.cosh: lambda a: _sincos(a, True)[1],
+    sp.tanh: _tanh,
+    sp.asin: lambda a: _integral(a, _power(_square_plus(a, -1, 1.0), -0.5), np.arcsin(a[0])),
+    sp.acos: lambda a: _integral(a, _scale(_power(_square_plus(a, -1, 1.0), -0.5), -1), np.arccos(a[0])),
+    sp.atan: lambda a: _integral(a, _reciprocal(_square_plus(a, 1, 1.0)), np.arctan(a[0])),
+    sp.asinh: lambda a: _integral(a, _power(_square_plus(a, 1, 1.0), -0.5), np.arcsinh(a[0])),
+    sp.acosh: lambda a: _integral(a, _power(_square_plus(a, 1, -1.0), -0.5), np.arccosh(a[0])),
+    sp.atanh: lambda a: _integral(a, _reciprocal(_square_plus(a, -1, 1.0)), np.arctanh(a[0])),
+    sp.Abs: lambda a: _scale(a, np.sign(a[0])),
+}
+
+
+# ---------- Compilation ----------
+def _real_constant(node) -> float:
+    value = complex(node)
+    if value.imag:
+        raise ValueError(f"Automatic differentiation needs real constants, got {node}.")
+    return value.real
+
+
+class Tape:
+    """An expression in one variable as a list of Taylor operations, built once."""
+
+    def __init__(self, expr, var=x):
+        self.var = var
+        self.steps = []         # (function, argument slots); slot i holds the result of step i
+        self._slots = {}
+        self._emit(sp.sympify(expr))
+
+    def __len__(self):
+        return len(self.steps)
+
+    def _push(self, node, fn, args=()):
+        self.steps.append((fn, tuple(args)))
+        self._slots[node] = len(self.steps) - 1
+        return self._slots[node]
+
+    def _emit(self, node) -> int:
+        if node in self._slots:
+            return self._slots[node]
+        if node == self.var:
+            return self._push(node, lambda n, xs: [xs, 1.0] + [0.0] * (n - 2) if n > 1 else [xs])
+        if not node.free_symbols:
+            return self._push(node, lambda n, xs, c=_real_constant(node): _const(c, n))
+        if node.free_symbols - {self.var}:
+            names = ", ".join(sorted(s.name for s in node.free_symbols - {self.var}))
+            raise ValueError(f"Only expressions in {self.var} can be differentiated numerically (found {names}).")
+        if node.is_Add:
+            const = sum(_real_constant(t) for t in node.args if not t.free_symbols)
+            slots = [self._emit(t) for t in node.args if t.free_symbols]
+            return self._push(node, lambda n, xs, *terms, c=const: _add(terms + (_const(c, n),)), slots)
+        if node.is_Mul:
+            coeff, rest = node.as_coeff_Mul()
+            factors = [self._emit(f) for f in sp.Mul.make_args(rest)]
+
+            def product(n, xs, *fs, c=float(coeff)):
+                out = fs[0]
+                for f in fs[1:]:
+                    out = _mul(out, f)
+                return _scale(out, c) if c != 1 else out
+            return self._push(node, product, factors)
+        if node.is_Pow:
+            base, exp = node.args
+            if not exp.free_symbols:
+                return self._push(node, lambda n, xs, a, r=_real_constant(exp): _power(a, r), [self._emit(base)])
+            # a^b = exp(b log a)
+            return self._push(node, lambda n, xs, a, b: _exp(_mul(b, _log(a))),
+                              [self._emit(base), self._emit(exp)])
+        fn = FUNCTIONS.get(node.func)
+        if fn is None or len(node.args) != 1:
+            raise ValueError(f"{node.func.__name__} is not supported by automatic differentiation.")
+        return self._push(node, lambda n, xs, a, fn=fn: fn(a), [self._emit(node.args[0])])
+
+    def coefficients(self, x0, order: int):
+        """Taylor coefficients c[0..order] of f around x0 (a float or an array of points)."""
+        if not 0 <= order <= MAX_ORDER:
+            raise ValueError(f"Order must be between 0 and {MAX_ORDER}.")
+        xs = np.asarray(x0, dtype=float)
+        values = []
+        with np.errstate(all="ignore"):
+            for fn, args in self.steps:
+                values.append(fn(order + 1, xs, *(values[i] for i in args)))
+        return np.array([np.broadcast_to(c, xs.shape) for c in values[-1]], dtype=float)
+
+    def __call__(self, x0, order=1):
+        """f, f', ..., f^(order) at x0 as an array of shape (order + 1, *shape of x0)."""
+        c = self.coefficients(x0, order)
+        factorials = np.array([float(math.factorial(k)) for k in range(order + 1)])
+        return c * factorials.reshape((-1,) + (1,) * (c.ndim - 1))
+
+
+@lru_cache(maxsize=128)
+def compile_taylor(expr, var=x) -> Tape:
+    return Tape(expr, var)
+
+
+# ---------- Callables for the root finders ----------
+def newton_pair(tape: Tape):
+    """(f, f') float callables for newton.newton_iterate that share one pass per point.
+
+    Newton evaluates f at each new iterate and f' at the same point next, so
+    f computes both and f' reuses the value.
+    """
+    last = [None, 0.0, 0.0]
+
+    def f(x0):
+        v = tape(float(x0), 1)
+        last[:] = [x0, float(v[0]), float(v[1])]
+        return last[1]
+
+    def fp(x0):
+        if last[0] != x0:
+            f(x0)
+        return last[2]
+    return f, fp
+
+
+def derivatives_function(tape: Tape, order=2):
+    """x0 -> (f, f', ..., f^(order)) as floats, e.g. for Halley's method."""
+    return lambda x0: tuple(float(v) for v in tape(float(x0), order))
+
+
+# ---------- Output ----------
+def _label(k: int) -> str:
+    return "f" + ("'" * k if k <= 3 else f"^({k})")
+
+
+def format_derivatives(point, values) -> str:
+    return "\n".join(f"{_label(k)}({point}) = {v:.15g}" for k, v in enumerate(values))
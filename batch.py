@@ -0,0 +1,154 @@
+"""
+batch.py
+Headless batch mode: stream expressions through a worker process pool
+
+Each input line is either JSON, e.g.
+    {"op": "limit", "expr": "sin(x)/x", "args": ["0"], "id": "q17"}
+    {"op": "definite_integral", "expr": "exp(-x**2)", "args": ["-oo", "oo"]}
+    {"op": "system_newton", "expr": "x^2 + y^2 = 4; x*y = 1", "args": ["1, 0.5"]}
+or tab separated "op<TAB>expr[<TAB>arg...]" (just "expr[<TAB>arg...]" with --op).
+Results are written as one JSON object per line. Only a bounded window of
+items is in flight, so memory use does not grow with the input size.
+
+    python batch.py submissions.txt --op integrate -j 4 -t 30 > results.jsonl
+"""
+
+import argparse
+import json
+import sys
+import time
+from collections import deque
+
+from workers import WorkerPool, DONE, TIMEOUT
+
+# mirrors compute.OPERATIONS, so argument checking needs no SymPy import here
+OPERATIONS = ("simplify", "quick_simplify", "differentiate", "integrate", "definite_integral", "factor",
+              "newton", "halley", "derivatives_at", "newton_digits", "newton_multistart", "solve", "real_roots",
+              "system_newton", "system_multistart", "limit")
+
+
+def parse_line(line: str, default_op=None) -> dict:
+    """Turn one input line into {"op", "expr", "args"[, "id"]}; raises ValueError."""
+    text = line.strip()
+    if text.startswith("{"):
+        try:
+            item = json.loads(text)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON: {e}")
+        item.setdefault("op", default_op)
+        item.setdefault("args", [])
+    else:
+        fields = text.split("\t")
+        if default_op is None:
+            if len(fields) < 2:
+                raise ValueError("Expected 'op<TAB>expr[<TAB>arg...]'.")
+            item = {"op": fields[0].strip(), "expr": fields[1], "args": fields[2:]}
+        else:
+            item = {"op": default_op, "expr": fields[0], "args": fields[1:]}
+    if item.get("op") not in OPERATIONS:
+        raise ValueError(f"Unknown operation: {item.get('op')!r}")
+    if not isinstance(item.get("expr"), str) or not item["expr"].strip():
+        raise ValueError("Missing expression.")
+    if not isinstance(item["args"], list):
+        item["args"] = [item["args"]]
+    return item
+
+
+def _record(seq, item, status, value=None, seconds=0.0) -> dict:
+    rec = {"line": seq}
+    if item is not None:
+        if "id" in item:
+            rec["id"] = item["id"]
+        rec.update(op=item["op"], expr=item["expr"])
+    rec["status"] = status
+    rec["result" if status == "ok" else "error"] = value
+    rec["seconds"] = round(seconds, 6)
+    return rec
+
+
+def iter_batch(lines, workers=None, timeout=None, ordered=True, default_op=None, pool=None):
+    """Yield one result dict per non-blank, non-comment input line.
+
+    ordered=False yields results as they finish instead of in input order.
+    """
+    own_pool = pool is None
+    pool = pool or WorkerPool(workers, preload=("compute",))
+    window = 2 * pool.size
+    source = enumerate(lines, 1)
+    buffered = {}        # seq -> finished record not yet yielded
+    order = deque()      # seqs in input order, still to be yielded (ordered mode)
+    in_flight = 0
+    exhausted = False
+    try:
+        while True:
+            # top up the window
+            while not exhausted and in_flight + len(buffered) < window:
+                try:
+                    seq, line = next(source)
+                except StopIteration:
+                    exhausted = True
+                    break
+                if not line.strip() or line.lstrip().startswith("#"):
+                    continue
+                if ordered:
+                    order.append(seq)
+                try:
+                    item = parse_line(line, default_op)
+                except ValueError as e:
+                    buffered[seq] = _record(seq, None, "error", str(e))
+                    continue
+                pool.submit("compute:run_operation", [item["op"], item["expr"]] + list(item["args"]),
+                            timeout=timeout, tag=(seq, item), affinity=item["expr"])
+                in_flight += 1
+            if exhausted and not in_flight and not buffered:
+                return
+            if in_flight:
+                for job in pool.wait(0.5):
+                    in_flight -= 1
+                    seq, item = job.tag
+                    status = "ok" if job.status == DONE else ("timeout" if job.status == TIMEOUT else "error")
+                    buffered[seq] = _record(seq, item, status, job.result if job.status == DONE else job.error,
+                                            job.elapsed)
+            # emit
+            if ordered:
+                while order and order[0] in buffered:
+                    yield buffered.pop(order.popleft())
+            else:
+                for seq in list(buffered):
+                    yield buffered.pop(seq)
+    finally:
+        if own_pool:
+            pool.shutdown()
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Run calculator operations over a file of expressions.")
+    ap.add_argument("input", nargs="?", default="-", help="input file (default: stdin)")
+    ap.add_argument("-o", "--output", default="-", help="JSONL output file (default: stdout)")
+    ap.add_argument("-j", "--workers", type=int, default=None, help="worker processes")
+    ap.add_argument("-t", "--timeout", type=float, default=60.0, help="per-item timeout in seconds (0 = none)")
+    ap.add_argument("--op", choices=OPERATIONS, default=None, help="operation for plain 'expr' lines")
+    ap.add_argument("--unordered", action="store_true", help="write results as they finish")
+    args = ap.parse_args(argv)
+
+    src = sys.stdin if args.input == "-" else open(args.input, "r", encoding="utf-8")
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    counts = {}
+    start = time.perf_counter()
+    try:
+        for rec in iter_batch(src, args.workers, args.timeout or None, not args.unordered, args.op):
+            out.write(json.dumps(rec, ensure_ascii=False) + "\n")
+            out.flush()
+            counts[rec["status"]] = counts.get(rec["status"], 0) + 1
+    finally:
+        if src is not sys.stdin:
+            src.close()
+        if out is not sys.stdout:
+            out.close()
+    summary = ", ".join(f"{n} {status}" for status, n in sorted(counts.items())) or "no items"
+    print(f"batch: {summary} in {time.perf_counter() - start:.2f}s", file=sys.stderr)
+    return 0 if counts.get("ok", 0) == sum(counts.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
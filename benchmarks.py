@@ -0,0 +1,278 @@
+"""
+benchmarks.py
+Timing and memory benchmarks for the compute_* functions and the CLI helpers
+
+Runs headless (Tk is never imported). Each case is timed with SymPy's cache,
+the compiled-function caches and the session table cleared, so repeats
+measure real work rather than cache hits.
+
+Regressions are judged on the fastest run, the one least disturbed by other
+load, against the baseline scaled by the median speed ratio of all cases (the
+machine, or its load, rather than the code); a case that looks slower is
+re-run with more repeats before it is reported.
+
+    python benchmarks.py --save bench_baseline.json      # record a baseline
+    python benchmarks.py --compare bench_baseline.json   # exit 1 on regression
+    python benchmarks.py --tier small -k integrate       # a subset
+"""
+
+import argparse
+import contextlib
+import gc
+import inspect
+import io
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+import sympy as sp
+from sympy.core.cache import clear_cache
+
+import autodiff
+import calc_parser
+import compute
+import limit
+import newton
+import polyfast
+import session
+import systems
+
+# (name, tier, function, args)
+CORPUS = [
+    ("simplify/trig-identity", "small", "simplify", ("sin(x)**2 + cos(x)**2",)),
+    ("differentiate/cubic", "small", "differentiate", ("x**3 - 3*x - 6",)),
+    ("integrate/x-sin", "small", "integrate", ("x*sin(x)",)),
+    ("definite_integral/gaussian", "small", "definite_integral", ("exp(-x**2)", "-oo", "oo")),
+    ("factor/difference-of-squares", "small", "factor", ("x**2 - 1",)),
+    ("newton/cubic", "small", "newton", ("x**3 - 3*x - 6", "2")),
+    ("solve/quadratic", "small", "solve", ("x**2 - 4",)),
+    ("limit/sinc", "small", "limit", ("sin(x)/x", "0")),
+    ("func_limit/removable", "small", "func_limit", ("(x**2 - 1)/(x - 1)", "1")),
+    ("parse/cubic", "small", "parse", ("x^3 - 3x - 6",)),
+    ("sympify/cubic", "small", "sympify", ("x**3 - 3*x - 6",)),
+    ("plot/tan", "small", "plot", ("tan(x)", -10, 10, 800)),
+
+    ("simplify/trig-rational", "medium", "simplify",
+     ("(sin(x)**4 - cos(x)**4)/(sin(x)**2 - cos(x)**2) + ((x**3 - 1)/(x - 1))**2",)),
+    ("differentiate/nested", "medium", "differentiate", ("sin(cos(tan(x**5)))**7",)),
+    ("integrate/rational-quartic", "medium", "integrate", ("1/(x**4 + 1)",)),
+    ("definite_integral/oscillatory", "medium", "definite_integral", ("sin(1/x)", "0.01", "1")),
+    ("factor/cyclotomic-60", "medium", "factor", ("x**60 - 1",)),
+    ("newton/transcendental", "medium", "newton", ("cos(x) - x/10", "1")),
+    ("derivatives_at/nested-order-4", "medium", "derivatives_at", ("sin(cos(tan(x**5)))**7", "0.7", 4)),
+    ("halley/transcendental", "medium", "halley", ("cos(x) - x/10", "1")),
+    ("newton_digits/transcendental-1000", "medium", "newton_digits", ("cos(x) - x/10", "1", 1000)),
+    ("solve/biquadratic", "medium", "solve", ("x**4 - 10*x**2 + 1",)),
+    ("real_roots/transcendental", "medium", "real_roots", ("cos(x) - x/10", "-20", "20")),
+    ("real_roots/sturm-degree-30", "medium", "real_roots", ("x**30 - 3*x**7 + x - 1/7", "-2", "2")),
+    ("system_newton/circle-hyperbola", "medium", "system_newton", ("x^2 + y^2 = 4; x*y = 1", "1, 0.5")),
+    ("limit/tan-minus-sin", "medium", "limit", ("(tan(x) - sin(x))/x**3", "0")),
+    ("func_limit/at-infinity", "medium", "func_limit", ("(3*x**2 + 1)/(x**2 - 5)", "oo")),
+    ("parse/trig-rational", "medium", "parse",
+     ("(sin(x)**4 - cos(x)**4)/(sin(x)**2 - cos(x)**2) + ((x**3 - 1)/(x - 1))**2",)),
+    ("sympify/trig-rational", "medium", "sympify",
+     ("(sin(x)**4 - cos(x)**4)/(sin(x)**2 - cos(x)**2) + ((x**3 - 1)/(x - 1))**2",)),
+
+    ("simplify/binomial-difference", "pathological", "simplify", ("((x + 1)**10 - (x - 1)**10)/x",)),
+    ("differentiate/degree-200", "pathological", "differentiate",
+     (" + ".join(f"{k}*x**{k}" for k in range(1, 201)),)),
+    ("integrate/x2-exp-sin", "pathological", "integrate", ("x**2*exp(x)*sin(x)",)),
+    ("factor/degree-120", "pathological", "factor", ("x**120 - 1",)),
+    ("newton/multistart-10000", "pathological", "newton_multistart", ("cos(x) - x/10", "-20", "20", "10000")),
+    ("derivatives_at/nested-order-40", "pathological", "derivatives_at", ("sin(cos(tan(x**5)))**7", "0.7", 40)),
+    ("newton_digits/transcendental-10000", "pathological", "newton_digits", ("cos(x) - x/10", "1", 10000)),
+    ("solve/quintic", "pathological", "solve", ("x**5 - x + 1",)),
+    ("solve/transcendental-fallback", "pathological", "solve", ("cos(x) = x/10",)),
+    ("real_roots/sin-20000", "pathological", "real_roots", ("sin(x)", "-10000", "10000")),
+    ("system_multistart/symmetric-3x3-2000", "pathological", "system_multistart",
+     ("x + y + z = 6; x*y*z = 6; x^2 + y^2 + z^2 = 14", "-5", "5", "2000")),
+    ("limit/power-at-infinity", "pathological", "limit", ("x**(1/x)", "oo")),
+    ("func_limit/exp-at-infinity", "pathological", "func_limit", ("(1 + 1/x)**x", "oo")),
+    ("parse/degree-200", "pathological", "parse", (" + ".join(f"{k}*x**{k}" for k in range(1, 201)),)),
+    ("sympify/degree-200", "pathological", "sympify", (" + ".join(f"{k}*x**{k}" for k in range(1, 201)),)),
+    ("plot/dense-million", "pathological", "plot", ("sin(x)*exp(-x**2/50) + tan(x)/100", -100, 100, 800, True)),
+]
+
+
+def _function(name):
+    if name == "func_limit":
+        def run(expr_str, tend):
+            with contextlib.redirect_stdout(io.StringIO()):
+                return limit.func_limit(expr_str, tend)
+        return run
+    if name == "parse":
+        return calc_parser.parse
+    if name == "sympify":      # reference for the parse/* cases
+        return sp.sympify
+    if name == "plot":
+        return inspect.unwrap(compute.plot_points)
+    # bypass the result cache and profiler: we want the cost of the computation itself
+    return inspect.unwrap(compute.OPERATIONS[name])
+
+
+def _percentile(samples, q):
+    ordered = sorted(samples)
+    k = (len(ordered) - 1) * q
+    lo, hi = int(k), min(int(k) + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+def clear_caches():
+    clear_cache()
+    newton.compile_newton.cache_clear()
+    newton.compile_newton_array.cache_clear()
+    newton.compile_newton_mp.cache_clear()
+    autodiff.compile_taylor.cache_clear()
+    systems.compile_system.cache_clear()
+    polyfast.as_poly.cache_clear()
+    polyfast.as_rational.cache_clear()
+    session.SESSION.clear()
+    calc_parser.clear_cache()
+
+
+def run_case(fn, args, repeat):
+    fn(*args)       # warm-up: first-call imports and lazy initialisation
+    samples = []
+    for _ in range(repeat):
+        clear_caches()
+        gc.collect()
+        gc.disable()            # as timeit does: a collection would land in a random sample
+        try:
+            start = time.perf_counter()
+            fn(*args)
+            samples.append(time.perf_counter() - start)
+        finally:
+            gc.enable()
+    clear_caches()
+    tracemalloc.start()
+    fn(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "median": statistics.median(samples),
+        "p90": _percentile(samples, 0.9),
+        "min": min(samples),
+        "max": max(samples),
+        "repeat": repeat,
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+def run_suite(tiers=None, pattern=None, repeat=15, out=sys.stderr) -> dict:
+    results = {}
+    for name, tier, op, args in CORPUS:
+        if (tiers and tier not in tiers) or (pattern and pattern not in name):
+            continue
+        n = max(3, repeat // 3) if tier == "pathological" else repeat
+        res = run_case(_function(op), args, n)
+        res["tier"] = tier
+        results[name] = res
+        print(f"{name:<36}{res['median'] * 1000:10.2f} ms  p90 {res['p90'] * 1000:9.2f} ms"
+              f"  peak {res['peak_kib']:9.1f} KiB", file=out)
+    return {
+        "meta": {"python": platform.python_version(), "sympy": sp.__version__,
+                 "machine": platform.machine(), "created": time.strftime("%Y-%m-%d %H:%M:%S")},
+        "results": results,
+    }
+
+
+MIN_CASES_TO_SCALE = 5     # fewer shared cases compare unscaled
+
+
+def _speed_ratio(current: dict, baseline: dict) -> float:
+    # a regression in a few cases leaves the median alone; one that slows every case alike is not caught
+    base = baseline.get("results", {})
+    ratios = [cur["min"] / base[name]["min"] for name, cur in current["results"].items()
+              if name in base and base[name]["min"] > 0]
+    return statistics.median(ratios) if len(ratios) >= MIN_CASES_TO_SCALE else 1.0
+
+
+def slower_cases(current: dict, baseline: dict, threshold=0.25, min_delta=0.002) -> list:
+    """Names of the cases whose fastest run is more than `threshold` (relative) and
+    `min_delta` seconds (absolute) slower than the baseline's, after scaling the
+    baseline by the median speed ratio of the two runs."""
+    ratio = _speed_ratio(current, baseline)
+    names = []
+    for name, cur in current["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if base is None:
+            continue
+        expected = base["min"] * ratio
+        if cur["min"] - expected > min_delta and cur["min"] > expected * (1 + threshold):
+            names.append(name)
+    return names
+
+
+def compare(current: dict, baseline: dict, threshold=0.25, min_delta=0.002, memory_threshold=0.5) -> list:
+    """Return human-readable regressions of current against baseline.
+
+    A case regresses when it is among slower_cases(), or its peak memory grew
+    by more than `memory_threshold`.
+    """
+    ratio = _speed_ratio(current, baseline)
+    slower = set(slower_cases(current, baseline, threshold, min_delta))
+    problems = []
+    for name, cur in current["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if base is None:
+            continue
+        if name in slower:
+            expected = base["min"] * ratio
+            problems.append(f"{name}: fastest run {expected * 1000:.2f} -> {cur['min'] * 1000:.2f} ms "
+                            f"(+{100 * (cur['min'] - expected) / expected:.0f}%, baseline scaled by {ratio:.2f})")
+        if base["peak_kib"] > 64 and cur["peak_kib"] > base["peak_kib"] * (1 + memory_threshold):
+            problems.append(f"{name}: peak memory {base['peak_kib']:.0f} -> {cur['peak_kib']:.0f} KiB")
+    return problems
+
+
+def confirm(current: dict, names, repeat: int, out=sys.stderr):
+    """Re-time the named cases with more repeats and keep the faster of the two runs."""
+    cases = {name: (op, args) for name, _, op, args in CORPUS}
+    for name in names:
+        op, args = cases[name]
+        res = run_case(_function(op), args, repeat)
+        old = current["results"][name]
+        if res["min"] < old["min"]:
+            res["tier"] = old["tier"]
+            current["results"][name] = res
+        print(f"re-run {name:<29}{current['results'][name]['min'] * 1000:10.2f} ms fastest", file=out)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmark the calculator's compute functions.")
+    ap.add_argument("--tier", action="append", choices=("small", "medium", "pathological"),
+                    help="only run these tiers (repeatable)")
+    ap.add_argument("-k", dest="pattern", help="only run cases whose name contains this text")
+    ap.add_argument("-r", "--repeat", type=int, default=15, help="timed runs per case")
+    ap.add_argument("--save", metavar="FILE", help="write results as a JSON baseline")
+    ap.add_argument("--compare", metavar="FILE", help="fail if slower than this baseline")
+    ap.add_argument("--threshold", type=float, default=0.25, help="allowed relative slowdown (default 0.25)")
+    ap.add_argument("--min-delta", type=float, default=0.002,
+                    help="seconds a case must lose before it can count as slower (default 0.002)")
+    args = ap.parse_args(argv)
+
+    current = run_suite(args.tier, args.pattern, args.repeat)
+    assert "tkinter" not in sys.modules
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2)
+        print(f"baseline written to {args.save}", file=sys.stderr)
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        # one noisy run is not a regression: suspects are timed again, three times as often
+        confirm(current, slower_cases(current, baseline, args.threshold, args.min_delta), 3 * args.repeat)
+        problems = compare(current, baseline, args.threshold, args.min_delta)
+        for p in problems:
+            print(f"REGRESSION {p}", file=sys.stderr)
+        if problems:
+            return 1
+        print("no regressions", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
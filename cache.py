@@ -0,0 +1,124 @@
+"""
+cache.py
+Bounded in-memory LRU cache for compute_* results
+"""
+
+import re
+import threading
+from collections import OrderedDict
+from functools import wraps
+
+import store
+
+
+# whitespace that separates tokens: "x y" is x*y but "xy" one symbol, "2 .5" is 2*0.5, "* *" is not "**"
+_SPACE = re.compile(r"\s+")
+
+
+def _space(m) -> str:
+    text, i, j = m.string, m.start(), m.end()
+    if 0 < i and j < len(text):
+        a, b = text[i - 1], text[j]
+        if (a.isalnum() or a in "_.") and (b.isalnum() or b in "_.") or a == b == "*":
+            return " "
+    return ""
+
+
+def normalize_expr(expr_str: str) -> str:
+    # "x**2 + 1" and "x**2+1" are the same request; whitespace is dropped only where the
+    # parser's tokens stay the same without it
+    return _SPACE.sub(_space, str(expr_str).strip())
+
+
+def make_key(operation: str, expr_str: str, args=(), kwargs=None) -> tuple:
+    extra = tuple(normalize_expr(a) if isinstance(a, str) else a for a in args)
+    if kwargs:
+        extra += tuple(sorted(kwargs.items()))
+    return (operation, normalize_expr(expr_str), extra)
+
+
+class ResultCache:
+    def __init__(self, max_entries=256, max_chars=4_000_000):
+        self.max_entries = max_entries
+        self.max_chars = max_chars      # total length of cached result strings
+        self._data = OrderedDict()
+        self._chars = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """Return (found, value); a hit marks the entry most recently used."""
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return True, self._data[key]
+            self.misses += 1
+            return False, None
+
+    def put(self, key, value):
+        size = len(value) if isinstance(value, str) else 0
+        if size > self.max_chars:
+            return
+        with self._lock:
+            if key in self._data:
+                old = self._data.pop(key)
+                self._chars -= len(old) if isinstance(old, str) else 0
+            self._data[key] = value
+            self._chars += size
+            while len(self._data) > self.max_entries or self._chars > self.max_chars:
+                _, old = self._data.popitem(last=False)
+                self._chars -= len(old) if isinstance(old, str) else 0
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._chars = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._data),
+                "max_entries": self.max_entries,
+                "chars": self._chars,
+                "max_chars": self.max_chars,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+RESULT_CACHE = ResultCache()
+
+
+def cached(operation: str, cache=None, persist=False):
+    """Decorator: memoize a compute_* function under (operation, expression, args).
+
+    With persist=True results are also kept in store.RESULT_STORE when enabled.
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(expr_str, *args, **kwargs):
+            memory = cache if cache is not None else RESULT_CACHE
+            key = make_key(operation, expr_str, args, kwargs)
+            found, value = memory.get(key)
+            if found:
+                return value
+            disk = store.RESULT_STORE if persist else None
+            if disk is not None:
+                disk_key = store.store_key(operation, expr_str, args, kwargs)
+                found, value = disk.get(disk_key)
+                if found:
+                    memory.put(key, value)
+                    return value
+            value = fn(expr_str, *args, **kwargs)
+            memory.put(key, value)
+            if disk is not None:
+                disk.put(disk_key, value)
+            return value
+        wrapper.operation = operation
+        return wrapper
+    return decorator
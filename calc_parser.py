@@ -0,0 +1,298 @@
+"""
+calc_parser.py
+Parser for the calculator's input grammar; builds SymPy objects directly
+(no eval), reports errors with positions and caches parsed subtrees
+
+    numbers     2   2.5   .5   1e-3
+    names       x, y, pi (or π), E, I, oo; any other name is a Symbol
+    operators   + - * / ^ ** and postfix !, with implicit multiplication:
+                2x   3(x+1)   (x+1)(x-1)   x sin(x)   2pi
+    functions   sin cos tan sec cosec/csc cot, inverses (asin or arcsin, ...),
+                hyperbolics, ln/log, exp, sqrt, cbrt, abs, ... (see FUNCTIONS)
+"""
+
+import re
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+
+import sympy as sp
+
+FUNCTIONS = {
+    "sin": sp.sin, "cos": sp.cos, "tan": sp.tan, "cot": sp.cot, "sec": sp.sec, "csc": sp.csc, "cosec": sp.csc,
+    "asin": sp.asin, "acos": sp.acos, "atan": sp.atan, "acot": sp.acot, "asec": sp.asec, "acsc": sp.acsc,
+    "arcsin": sp.asin, "arccos": sp.acos, "arctan": sp.atan, "atan2": sp.atan2,
+    "sinh": sp.sinh, "cosh": sp.cosh, "tanh": sp.tanh, "coth": sp.coth,
+    "asinh": sp.asinh, "acosh": sp.acosh, "atanh": sp.atanh,
+    "exp": sp.exp, "log": sp.log, "ln": sp.log, "sqrt": sp.sqrt, "cbrt": sp.cbrt, "root": sp.root,
+    "abs": sp.Abs, "Abs": sp.Abs, "sign": sp.sign, "floor": sp.floor, "ceiling": sp.ceiling,
+    "factorial": sp.factorial, "gamma": sp.gamma, "erf": sp.erf, "re": sp.re, "im": sp.im,
+    "Max": sp.Max, "Min": sp.Min,
+}
+CONSTANTS = {"pi": sp.pi, "π": sp.pi, "E": sp.E, "I": sp.I, "oo": sp.oo}
+
+MAX_POWER_BITS = 100_000      # larger integer powers are kept unevaluated (2^10^10 would never finish)
+MAX_FACTORIAL = 10_000
+SUBTREE_CACHE_SIZE = 4096
+MIN_CACHED_TOKENS = 4         # shorter groups are cheaper to parse than to look up
+
+_TOKEN = re.compile(r"""
+    (?P<ws>\s+)
+  | (?P<num>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+  | (?P<name>[^\W\d]\w*)
+  | (?P<op>\*\*|[-+*/^()!,])
+""", re.VERBOSE)
+
+
+class ParseError(ValueError):
+    def __init__(self, message: str, pos: int, text: str):
+        super().__init__(f"{message} at position {pos + 1}")
+        self.message = message
+        self.pos = pos
+        self.text = text
+
+    def caret(self) -> str:
+        """The input with a ^ under the offending character."""
+        return f"{self.text}\n{' ' * self.pos}^"
+
+
+def tokenize(text: str) -> list:
+    """[(kind, text, position), ...] with kind one of "num", "name", "op"."""
+    tokens, pos = [], 0
+    while pos < len(text):
+        m = _TOKEN.match(text, pos)
+        if m is None:
+            raise ParseError(f"Unexpected character {text[pos]!r}", pos, text)
+        if m.lastgroup != "ws":
+            tokens.append((m.lastgroup, m.group(), pos))
+        pos = m.end()
+    return tokens
+
+
+# ---------- Subtree cache ----------
+class _SubtreeCache:
+    # bracketed groups and function calls, keyed by their tokens ("sin ( x ** 2 )")
+    def __init__(self, max_entries=SUBTREE_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+
+    def get(self, key):
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+                self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+SUBTREES = _SubtreeCache()
+
+
+# ---------- Parser ----------
+class _Parser:
+    # recursive descent, one method per precedence level:
+    #   sum -> product -> unary -> power -> postfix -> atom
+    def __init__(self, text: str):
+        self.text = text
+        self.tokens = tokenize(text)
+        self.i = 0
+        self.closing = self._match_brackets()
+
+    def _match_brackets(self) -> dict:
+        closing, stack = {}, []
+        for i, (kind, tok, pos) in enumerate(self.tokens):
+            if tok == "(":
+                stack.append(i)
+            elif tok == ")":
+                if not stack:
+                    raise ParseError("Unmatched ')'", pos, self.text)
+                closing[stack.pop()] = i
+        if stack:
+            raise ParseError("Unclosed '('", self.tokens[stack[-1]][2], self.text)
+        return closing
+
+    def error(self, message, i=None):
+        i = self.i if i is None else i
+        pos = self.tokens[i][2] if i < len(self.tokens) else len(self.text)
+        return ParseError(message, pos, self.text)
+
+    def peek(self):
+        return self.tokens[self.i][1] if self.i < len(self.tokens) else None
+
+    def parse(self):
+        if not self.tokens:
+            raise ParseError("Empty expression", 0, self.text)
+        expr = self.sum()
+        if self.i < len(self.tokens):
+            raise self.error(f"Unexpected {self.tokens[self.i][1]!r}")
+        return expr
+
+    def sum(self):
+        # collected and added in one go: chaining a + b + c re-sorts the Add every step
+        terms = [self.product()]
+        while self.peek() in ("+", "-"):
+            op = self.tokens[self.i][1]
+            self.i += 1
+            term = self.product()
+            terms.append(term if op == "+" else -term)
+        return sp.Add(*terms) if len(terms) > 1 else terms[0]
+
+    def product(self):
+        factors = [self.unary()]
+        while self.i < len(self.tokens):
+            kind, tok, _ = self.tokens[self.i]
+            if tok in ("*", "/"):
+                self.i += 1
+                factor = self.unary()
+                factors.append(factor if tok == "*" else sp.Pow(factor, -1))
+            elif kind == "name" or tok == "(":
+                factors.append(self.unary())        # implicit multiplication
+            elif kind == "num":
+                raise self.error("Missing operator before number")
+            else:
+                break
+        return sp.Mul(*factors) if len(factors) > 1 else factors[0]
+
+    def unary(self):
+        tok = self.peek()
+        if tok in ("-", "+"):
+            self.i += 1
+            operand = self.unary()
+            return -operand if tok == "-" else operand
+        return self.power()
+
+    def power(self):
+        base = self.postfix()
+        if self.peek() in ("^", "**"):
+            self.i += 1
+            exponent = self.unary()         # right associative; allows 2^-x
+            return _pow(base, exponent)
+        return base
+
+    def postfix(self):
+        value = self.atom()
+        while self.peek() == "!":
+            self.i += 1
+            big = value.is_Integer and value > MAX_FACTORIAL
+            value = sp.factorial(value, evaluate=not big)
+        return value
+
+    def atom(self):
+        if self.i >= len(self.tokens):
+            raise self.error("Unexpected end of expression")
+        kind, tok, pos = self.tokens[self.i]
+        if kind == "num":
+            self.i += 1
+            return _number(tok, pos, self.text)
+        if kind == "name":
+            if self.peek_at(self.i + 1) == "(":
+                if tok in FUNCTIONS:
+                    return self.call(tok)
+                if len(tok) > 1 and tok not in CONSTANTS:
+                    raise self.error(f"Unknown function {tok!r}")   # a(x+1) is still a*(x + 1)
+            self.i += 1
+            if tok in FUNCTIONS:
+                raise self.error(f"Expected '(' after {tok}")
+            return CONSTANTS[tok] if tok in CONSTANTS else sp.Symbol(tok)
+        if tok == "(":
+            return self.group()
+        raise self.error(f"Unexpected {tok!r}")
+
+    def peek_at(self, i):
+        return self.tokens[i][1] if i < len(self.tokens) else None
+
+    def _cached(self, start, end, build):
+        # tokens start..end (inclusive) form one subtree
+        if end - start + 1 < MIN_CACHED_TOKENS:
+            return build()
+        key = " ".join(t[1] for t in self.tokens[start:end + 1])
+        value = SUBTREES.get(key)
+        if value is None:
+            value = build()
+            SUBTREES.put(key, value)
+        self.i = end + 1
+        return value
+
+    def group(self):
+        start, end = self.i, self.closing[self.i]
+
+        def build():
+            self.i = start + 1
+            if self.i == end:
+                raise self.error("Empty parentheses")
+            inner = self.sum()
+            if self.i != end:
+                raise self.error(f"Unexpected {self.tokens[self.i][1]!r}")
+            self.i = end + 1
+            return inner
+        return self._cached(start, end, build)
+
+    def call(self, name):
+        start, end = self.i, self.closing[self.i + 1]
+
+        def build():
+            self.i = start + 2
+            args = []
+            while self.i < end:
+                args.append(self.sum())
+                if self.i < end:
+                    if self.peek() != ",":
+                        raise self.error(f"Unexpected {self.tokens[self.i][1]!r}")
+                    self.i += 1
+                    if self.i == end:
+                        raise self.error("Missing argument")
+            if not args:
+                raise self.error(f"{name}() needs an argument", start)
+            self.i = end + 1
+            try:
+                return FUNCTIONS[name](*args)
+            except (TypeError, ValueError) as e:
+                raise ParseError(f"Bad arguments to {name}: {e}", self.tokens[start][2], self.text)
+        return self._cached(start, end, build)
+
+
+def _number(tok, pos, text):
+    try:
+        if any(c in tok for c in ".eE"):
+            return sp.Float(tok)
+        return sp.Integer(tok)
+    except ValueError:
+        raise ParseError("Number too long", pos, text)
+
+
+def _pow(base, exponent):
+    if base.is_Integer and exponent.is_Integer and abs(base) > 1:
+        if abs(int(exponent)) * int(abs(base)).bit_length() > MAX_POWER_BITS:
+            return sp.Pow(base, exponent, evaluate=False)
+    return sp.Pow(base, exponent)
+
+
+# ---------- Public API ----------
+@lru_cache(maxsize=256)
+def _parse(text: str):
+    try:
+        return _Parser(text).parse()
+    except RecursionError:
+        raise ParseError("Expression nested too deeply", 0, text)
+
+
+def parse(text: str):
+    """Parse calculator input into a SymPy expression; raises ParseError."""
+    return _parse(str(text).strip())
+
+
+def clear_cache():
+    _parse.cache_clear()
+    SUBTREES.clear()
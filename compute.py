@@ -0,0 +1,264 @@
+"""
+compute.py
+SymPy computation functions behind the calculator (no Tk import, safe for worker processes)
+"""
+
+import math
+
+import sympy as sp
+import autodiff
+import limit
+import newton
+import polyfast
+import quadrature
+import roots
+import sampling
+import simplify_budget
+import systems
+from cache import cached
+from profiling import profiled, stage
+from session import expression, parse
+
+# ---------- SymPy symbols ----------
+x, y = sp.symbols('x y')
+
+SOLVE_BUDGET = 10.0            # seconds for sp.solve before falling back to numeric roots
+SOLVE_RANGE = ("-100", "100")  # where the fallback looks for real roots
+
+# ---------- Rendering (parsing lives in session.py; both are timed as profiling stages) ----------
+def render(result) -> str:
+    with stage("render"):
+        return str(result)
+
+# ---------- COMPUTATION FUNCTIONS ----------
+@profiled("simplify")
+@cached("simplify", persist=True)
+def compute_simplify(expr_str: str) -> str:
+    return render(expression(expr_str).simplified)
+
+@profiled("quick_simplify")
+@cached("quick_simplify")
+def compute_quick_simplify(expr_str: str, budget=2.0) -> str:
+    res = simplify_budget.tiered_simplify(expression(expr_str).expr, float(budget))
+    return f"{render(res.expr)}\n{simplify_budget.format_passes(res)}"
+
+@profiled("differentiate")
+@cached("differentiate")
+def compute_differentiate(expr_str: str) -> str:
+    return render(expression(expr_str).derivative)
+
+@profiled("integrate")
+@cached("integrate", persist=True)
+def compute_integrate(expr_str: str) -> str:
+    expr = expression(expr_str).expr
+    result = polyfast.poly_integrate(expr, x)
+    return render(sp.integrate(expr, x) if result is None else result)
+
+@profiled("definite_integral")
+@cached("definite_integral", persist=True)
+def compute_definite_integral(expr_str: str, lower, upper, exact=False) -> str:
+    """Numeric value by adaptive quadrature; the exact value as well when it is cheap
+    (polynomials) or asked for."""
+    e = expression(expr_str)
+    if not e.expr.free_symbols <= {x}:
+        raise ValueError("The integrand may only depend on x.")
+    a, b = parse(str(lower)), parse(str(upper))
+    if not (a.is_extended_real and b.is_extended_real):
+        raise ValueError("Bounds must be real numbers, oo or -oo.")
+    exact = str(exact).strip().lower() in ("1", "true", "yes", "exact")
+    lines, error = [], None
+    try:
+        lines.append(quadrature.format_result(quadrature.integrate(e.vectorized, float(a), float(b))))
+    except ValueError as err:
+        if not exact:
+            raise
+        error = err
+    value = None
+    if exact:
+        value = sp.integrate(e.expr, (x, a, b))
+    elif e.poly is not None and a.is_finite and b.is_finite:
+        antiderivative = e.poly.integrate()
+        value = antiderivative.eval(b) - antiderivative.eval(a)
+    if value is not None:
+        lines.append(f"exact: {render(value)}")
+    if error is not None:
+        lines.append(f"(numeric quadrature failed: {error})")
+    return "\n".join(lines)
+
+@profiled("factor")
+@cached("factor", persist=True)
+def compute_factor(expr_str: str) -> str:
+    expr = expression(expr_str).expr
+    result = polyfast.poly_factor(expr, x)
+    return render(sp.factor(expr) if result is None else result)
+
+@profiled("newton")
+@cached("newton")
+def compute_newton_raphson(expr_str: str, init_guess, tol=1e-12, max_iter=50) -> str:
+    f, fp = expression(expr_str).compiled
+    res = newton.newton_iterate(f, fp, newton.to_float(init_guess), tol=tol, max_iter=max_iter)
+    return newton.format_result(res)
+
+@profiled("halley")
+@cached("halley")
+def compute_halley(expr_str: str, init_guess, tol=1e-12, max_iter=50) -> str:
+    """Halley's method with f' and f'' from automatic differentiation."""
+    e = expression(expr_str)
+    derivs = autodiff.derivatives_function(e.taylor, 2)
+    res = newton.halley_iterate(derivs, newton.to_float(init_guess), tol=tol, max_iter=max_iter)
+    return newton.format_result(res)
+
+@profiled("derivatives_at")
+@cached("derivatives_at")
+def compute_derivatives_at(expr_str: str, point, order=2) -> str:
+    """f, f', ..., f^(order) at a point by Taylor arithmetic (no symbolic derivative is built)."""
+    e = expression(expr_str)
+    with stage("taylor"):
+        values = e.taylor(newton.to_float(point), int(order))
+    return autodiff.format_derivatives(point, values)
+
+@profiled("newton_digits")
+@cached("newton_digits", persist=True)
+def compute_newton_digits(expr_str: str, init_guess, digits=100) -> str:
+    """Newton root to `digits` significant digits: a float solve, then mpmath refinement."""
+    e = expression(expr_str)
+    f, fp = e.compiled
+    start = newton.newton_iterate(f, fp, newton.to_float(init_guess))
+    if not start.converged:
+        raise ValueError(f"Newton-Raphson did not converge from {init_guess}: {newton.format_result(start)}")
+    with stage("refine"):
+        res = newton.refine_root(*e.compiled_mp, start.root, digits)
+    return newton.format_precise(res)
+
+@profiled("newton_multistart")
+@cached("newton_multistart")
+def compute_newton_multistart(expr_str: str, start, stop, count=1000) -> str:
+    e = expression(expr_str)
+    guesses = newton.guess_grid(start, stop, count)
+    res = newton.newton_multistart(e.expr, guesses, bounds=(guesses.min(), guesses.max()), fprime=e.derivative)
+    return newton.format_multistart(res)
+
+@profiled("system_newton")
+@cached("system_newton")
+def compute_system_newton(expr_str: str, start) -> str:
+    """Damped Newton for 'eq1; eq2; ...' from one starting point ("1, 0.5")."""
+    eqs, variables = systems.parse_system(expr_str)
+    res = systems.newton_system(eqs, variables, systems.parse_point(start, len(variables)))
+    return systems.format_system(res)
+
+@profiled("system_multistart")
+@cached("system_multistart")
+def compute_system_multistart(expr_str: str, lo, hi, count=200) -> str:
+    eqs, variables = systems.parse_system(expr_str)
+    res = systems.newton_system(eqs, variables, systems.start_box(lo, hi, len(variables), count))
+    return systems.format_multistart(res)
+
+@profiled("solve")
+@cached("solve", persist=True)
+def compute_solve(expr_str: str) -> str:
+    if '=' in expr_str:
+        left, right = expr_str.split('=', 1)
+        lhs, rhs = expression(left).expr, expression(right).expr
+        expr, eq = lhs - rhs, sp.Eq(lhs, rhs)
+    else:
+        expr = expression(expr_str).expr
+        eq = sp.Eq(expr, 0)
+    sols = polyfast.poly_solve(expr, x)
+    if sols is None:
+        # killed at the deadline, so an abandoned solve does not compete with later jobs in this worker
+        sols, failure = simplify_budget.run_with_deadline(lambda e: sp.solve(e, x), eq, SOLVE_BUDGET)
+        if failure is not None:
+            # transcendental equations: sp.solve hangs or gives up; list the real roots numerically
+            if expr.free_symbols - {x}:
+                raise ValueError(f"The symbolic solver {'timed out' if failure == 'timed out' else 'failed'}; "
+                                 "numeric root finding needs an equation in x alone.")
+            lo, hi = SOLVE_RANGE
+            with stage("real_roots"):
+                res = _real_roots(expr_str, lo, hi)
+            reason = f"timed out after {SOLVE_BUDGET:g} s" if failure == "timed out" else "found no closed form"
+            return f"sp.solve {reason}; real roots found numerically:\n{roots.format_roots(res, lo, hi)}"
+    return render(sols)
+
+def _zero_form(expr_str: str) -> str:
+    # 'lhs = rhs' as the text of lhs - rhs, so it gets its own session entry
+    if "=" not in expr_str:
+        return expr_str
+    left, right = expr_str.split("=", 1)
+    return f"({left}) - ({right})"
+
+def _real_roots(expr_str: str, lo, hi) -> roots.RootsResult:
+    e = expression(_zero_form(expr_str))
+    if e.expr.free_symbols - {x}:
+        raise ValueError("Real roots need an equation in x alone.")
+    if not e.expr.free_symbols:
+        raise ValueError("The expression does not depend on x.")
+    a, b = newton.to_float(lo), newton.to_float(hi)
+    if not (math.isfinite(a) and math.isfinite(b) and a < b):
+        raise ValueError("Enter a finite interval lo, hi with lo < hi.")
+    if e.poly is not None and e.poly.degree() <= roots.STURM_DEGREE:
+        with stage("sturm"):
+            return roots.sturm_roots(e.poly, a, b)
+    with stage("scan"):
+        return roots.scan_roots(e.expr, e.derivative, e.compiled[0], e.vectorized, a, b)
+
+@profiled("real_roots")
+@cached("real_roots", persist=True)
+def compute_real_roots(expr_str: str, lo, hi) -> str:
+    """Every real root in [lo, hi], each isolated (Sturm sequences for polynomials)."""
+    return roots.format_roots(_real_roots(expr_str, lo, hi), lo, hi)
+
+@profiled("limit")
+@cached("limit", persist=True)
+def compute_limit(expr_str: str, point_str: str) -> str:
+    pt = parse(point_str)
+    value, _ = limit.fast_limit(expression(expr_str).expr, pt)
+    return render(value)
+
+# Not a cached operation: the expression's SampleCache keeps the points instead
+@profiled("plot")
+def plot_points(expr_str: str, lo: float, hi: float, width: int, dense=False, order=0):
+    """(xs, ys, (ylo, yhi)) for drawing [lo, hi] at `width` pixels; NaN breaks the line.
+
+    dense evaluates about a million points across the view instead of a few per pixel;
+    order > 0 plots that derivative, evaluated by automatic differentiation.
+    """
+    e = expression(expr_str)
+    if e.expr.free_symbols - {x}:
+        raise ValueError("Only expressions in x can be plotted.")
+    oversample = max(sampling.OVERSAMPLE, sampling.DENSE_POINTS // max(int(width), 1)) if dense else sampling.OVERSAMPLE
+    with stage("sample"):
+        samples = e.derivative_samples(int(order)) if order else e.samples
+        xs, ys, yrange = samples.view(lo, hi, width, oversample=oversample)
+    return xs.tolist(), ys.tolist(), yrange
+
+# Not cached operations: the GUI farms the pieces of a wide range out to several workers
+@profiled("real_roots_part")
+def real_roots_part(expr_str: str, lo, hi):
+    return roots.as_plain(_real_roots(expr_str, lo, hi))
+
+def merge_real_roots(expr_str: str, lo, hi, parts) -> str:
+    return roots.format_roots(roots.merge(parts), lo, hi)
+
+# Operation name -> function, for callers that dispatch by name (worker pool, batch mode)
+OPERATIONS = {
+    "simplify": compute_simplify,
+    "quick_simplify": compute_quick_simplify,
+    "differentiate": compute_differentiate,
+    "integrate": compute_integrate,
+    "definite_integral": compute_definite_integral,
+    "factor": compute_factor,
+    "newton": compute_newton_raphson,
+    "halley": compute_halley,
+    "derivatives_at": compute_derivatives_at,
+    "newton_digits": compute_newton_digits,
+    "newton_multistart": compute_newton_multistart,
+    "solve": compute_solve,
+    "real_roots": compute_real_roots,
+    "system_newton": compute_system_newton,
+    "system_multistart": compute_system_multistart,
+    "limit": compute_limit,
+}
+
+
+def run_operation(operation: str, *args):
+    return OPERATIONS[operation](*args)
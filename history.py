@@ -0,0 +1,84 @@
+"""
+history.py
+Output history for the GUI: a capped ring buffer of result entries kept
+outside the Tk text widget, which only shows a window of recent entries
+(long results truncated until expanded)
+"""
+
+import itertools
+import threading
+import time
+from collections import deque
+
+
+class Entry:
+    _ids = itertools.count(1)
+
+    def __init__(self, text: str, heading=None):
+        self.id = next(Entry._ids)
+        self.heading = heading      # e.g. "Derivative wrt x  [x**2]"; None for status notes
+        self.text = text
+        self.time = time.time()
+
+    def render(self, limit=None) -> str:
+        text = self.text
+        if limit is not None and len(text) > limit:
+            text = text[:limit] + " ..."
+        if self.heading is None:
+            return text + "\n"
+        return f"{self.heading}:\n{text}\n\n"
+
+    def __len__(self):
+        return len(self.text) + len(self.heading or "")
+
+
+class OutputHistory:
+    def __init__(self, max_entries=500, max_chars=5_000_000, preview_chars=4000):
+        self.max_entries = max_entries
+        self.max_chars = max_chars          # total text kept; the newest entry is always kept
+        self.preview_chars = preview_chars  # longer results are shown truncated
+        self._entries = deque()
+        self._chars = 0
+        self._lock = threading.Lock()
+        self.dropped = 0
+
+    def append(self, text: str, heading=None) -> Entry:
+        entry = Entry(text, heading)
+        with self._lock:
+            self._entries.append(entry)
+            self._chars += len(entry)
+            while len(self._entries) > 1 and (len(self._entries) > self.max_entries or self._chars > self.max_chars):
+                self._chars -= len(self._entries.popleft())
+                self.dropped += 1
+        return entry
+
+    def get(self, entry_id: int):
+        with self._lock:
+            return next((e for e in self._entries if e.id == entry_id), None)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._chars = 0
+            self.dropped = 0
+
+    def preview(self, entry: Entry) -> tuple:
+        """(text to display, number of characters left out)."""
+        hidden = max(0, len(entry.text) - self.preview_chars)
+        return entry.render(self.preview_chars), hidden
+
+    def iter_text(self):
+        """Yield the rendered entries oldest first (for saving or copying)."""
+        with self._lock:
+            entries = list(self._entries)
+        if self.dropped:
+            yield f"[{self.dropped} earlier entries dropped from history]\n"
+        for e in entries:
+            yield e.render()
+
+    def write(self, f):
+        for chunk in self.iter_text():
+            f.write(chunk)
@@ -1,21 +1,179 @@
-from sympy import symbols, simplify, factor, sympify, limit, oo
+from sympy import (symbols, factor, sympify, limit, oo, nan, zoo, cancel, fraction,
+                   nsimplify, lambdify, count_ops, degree, LC, pi, E, N, AccumBounds,
+                   Function, exp, log, sin, cos, tan, cot, sec, csc, asin, acos, atan,
+                   sinh, cosh, tanh, Abs)
+import mpmath
+
+import calc_parser
+import session
 
 
 x = symbols('x')
 
-def func_limit(expr_str):
-    try:
-        expr = sympify(expr_str)       # Turn text into math
-        expr = simplify(expr)          # Simplify it
-        print("➡️==> Simplified expression:", expr)
+# ---------- Fast limit engine ----------
+# Cheap strategies are tried in order; sympy.limit (Gruntz) only runs when
+# they all fail or a numeric probe disagrees with their answer.
+
+# functions that are continuous wherever they evaluate to a finite value
+CONTINUOUS = (exp, log, sin, cos, tan, cot, sec, csc, asin, acos, atan, sinh, cosh, tanh, Abs)
+PROBE_DPS = 40
+EXTRAPOLATION_DPS = 60
+
+
+def _finite(value) -> bool:
+    return bool(value.is_number and value.is_finite and not value.has(nan, zoo, oo, -oo, AccumBounds))
+
+
+def _to_mp(value, dps):
+    # a SymPy number as an mpf, or an mpc when it is not real (sqrt(-1), log(-1), (-8)**(1/3))
+    re, im = N(value, dps).as_real_imag()
+    if im == 0:
+        return mpmath.mpmathify(str(re))
+    return mpmath.mpc(mpmath.mpmathify(str(re)), mpmath.mpmathify(str(im)))
+
+
+def _probe_agrees(f, pt, value) -> bool:
+    # evaluate just above the point (the side sympy.limit uses) and compare
+    with mpmath.workdps(PROBE_DPS):
+        try:
+            target = _to_mp(value, PROBE_DPS)
+            base = _to_mp(pt, PROBE_DPS)
+            for k in (16, 24):
+                y = f(base + mpmath.mpf(10) ** -k)
+                if abs(y - target) > 1e-6 * (1 + abs(target)):
+                    return False
+        except Exception:
+            return False
+    return True
+
+
+def _by_substitution(expr, pt, f):
+    if pt.is_infinite:
+        return None
+    if any(not isinstance(fn, CONTINUOUS) for fn in expr.atoms(Function)):
+        return None
+    value = expr.subs(x, pt)
+    if not _finite(value) or not _probe_agrees(f, pt, value):
+        return None
+    return value
 
-        factored = factor(expr)        # Factorize it
-        print("➡️==> Factored Expression:", factored)
 
-        tend = sympify(input("x tends to: "))#so that i can use infinity 
+def _by_rational(expr, pt):
+    if not expr.is_rational_function(x):
+        return None
+    num, den = fraction(cancel(expr))
+    if pt.is_infinite:
+        dn, dd = degree(num, x), degree(den, x)
+        if dn < dd:
+            return 0
+        ratio = LC(num, x) / LC(den, x)
+        if dn == dd:
+            return ratio
+        sign = 1 if pt == oo or (dn - dd) % 2 == 0 else -1
+        if (sign * ratio).is_positive:
+            return oo
+        if (sign * ratio).is_negative:
+            return -oo
+        return None
+    d = den.subs(x, pt)
+    if d.is_zero is not False:
+        return None
+    value = num.subs(x, pt) / d
+    return value if _finite(value) else None
+
+
+def _recognize(c, tol):
+    # turn a numeric estimate into a simple exact constant, or None
+    if abs(c) < tol:
+        return sympify(0)
+    if abs(c) > 1e12:
+        return None
+    candidate = nsimplify(sympify(mpmath.nstr(c, 25)), [pi, E], tolerance=tol)
+    if candidate.is_Rational and candidate.q > 10**4:
+        return None
+    if count_ops(candidate) > 6 or candidate.has(oo, zoo, nan):
+        return None
+    with mpmath.workdps(PROBE_DPS):
+        if abs(mpmath.mpmathify(str(N(candidate, PROBE_DPS))) - c) > tol * (1 + abs(c)):
+            return None
+    return candidate
+
+
+def _by_extrapolation(pt, f):
+    # f at x = pt + h (or x = 1/h at infinity) for h = 1e-8, 1e-10, ..., then one
+    # Richardson step assuming an O(h) error; the estimates must settle down
+    with mpmath.workdps(EXTRAPOLATION_DPS):
+        try:
+            if pt.is_infinite:
+                sign = 1 if pt == oo else -1
+                points = [sign * mpmath.mpf(10) ** k for k in (8, 10, 12, 14)]
+            else:
+                base = _to_mp(pt, EXTRAPOLATION_DPS)
+                points = [base + mpmath.mpf(10) ** -k for k in (8, 10, 12, 14)]
+            values = [f(t) for t in points]
+        except Exception:
+            return None
+        if any(isinstance(v, mpmath.mpc) and abs(v.imag) > 1e-20 for v in values):
+            return None
+        values = [mpmath.re(v) for v in values]
+        if not all(mpmath.isfinite(v) for v in values):
+            return None
+        estimates = [b + (b - a) / 99 for a, b in zip(values, values[1:])]
+        scale = 1 + abs(estimates[-1])
+        gaps = [abs(b - a) for a, b in zip(estimates, estimates[1:])]
+        if gaps[-1] > 1e-12 * scale or gaps[-1] > gaps[0] + 1e-30:
+            return None
+        return _recognize(estimates[-1], 1e-10)
+
+
+def fast_limit(expr, pt):
+    """Limit of expr as x -> pt (from above); returns (value, strategy name)."""
+    expr, pt = sympify(expr), sympify(pt)
+    if x not in expr.free_symbols:
+        return expr, "constant"
+    f = None
+    if expr.free_symbols == {x} and pt.is_number:
+        try:
+            f = lambdify(x, expr, "mpmath")
+        except Exception:
+            pass
+    if f is not None:
+        value = _by_substitution(expr, pt, f)
+        if value is not None:
+            return value, "substitution"
+    value = _by_rational(expr, pt)
+    if value is not None:
+        return sympify(value), "rational"
+    if f is not None:
+        value = _by_extrapolation(pt, f)
+        if value is not None:
+            return value, "numeric extrapolation"
+    return limit(expr, x, pt), "gruntz"
+
+
+def func_limit(expr_str, tend=None, show_forms=None):
+    try:
+        entry = session.expression(expr_str)
+        expr = entry.expr              # Turn text into math (parsed once per entry)
+        interactive = tend is None
+        if tend is None:
+            tend = input("x tends to: ")
+        tend = calc_parser.parse(tend)#so that i can use infinity 
+        result, strategy = fast_limit(expr, tend)
         print("="*60)
-        print(f"✅LIMIT as x tends to {tend} is:", limit(expr, x, tend))
+        print(f"✅LIMIT as x tends to {tend} is:", result)
         print("="*60)
+
+        # the simplified/factored display is extra work, so only on request
+        if show_forms is None:
+            show_forms = interactive and input("Show simplified and factored forms? (y/N): ").strip().lower().startswith("y")
+        if show_forms:
+            expr = entry.simplified        # Simplify it
+            print("➡️==> Simplified expression:", expr)
+
+            factored = factor(expr)        # Factorize it
+            print("➡️==> Factored Expression:", factored)
+        return result
     except Exception as e:
             print("limit Error check equation: ", str(e))
 
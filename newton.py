@@ -0,0 +1,392 @@
+"""
+newton.py
+Compiled Newton-Raphson engine (SymPy is only used to build f and f')
+"""
+
+import builtins
+import csv
+import math
+from functools import lru_cache
+from typing import NamedTuple
+
+import mpmath
+import numpy as np
+import sympy as sp
+
+import calc_parser
+
+x = sp.symbols('x')
+_real_var = sp.Symbol('x', real=True)
+
+
+class NewtonResult(NamedTuple):
+    root: float
+    iterations: int
+    residual: float
+    converged: bool
+
+
+# ---------- Compilation ----------
+def float_callable(expr, var=x):
+    """expr as a float function: math-module code, mpmath where math lacks a function, evalf otherwise."""
+    for module in ("math", "mpmath"):
+        try:
+            fn = sp.lambdify(var, expr, module)
+        except Exception:       # no printer for some node, e.g. an unevaluated Derivative
+            continue
+        if set(fn.__code__.co_names) <= fn.__globals__.keys() | vars(builtins).keys():
+            return fn if module == "math" else (lambda t: float(fn(t)))
+    # complex and unevaluated values raise TypeError, which the iterations treat as leaving the domain
+    return lambda t: float(expr.evalf(subs={var: t}))
+
+
+def _central_difference(f):
+    def fp(t):
+        h = 6e-6 * (1 + abs(t))        # about the cube root of the float epsilon
+        return (f(t + h) - f(t - h)) / (2 * h)
+    return fp
+
+
+@lru_cache(maxsize=128)
+def compile_newton(func, var=x, fprime=None):
+    """Return (f, f') as plain Python float callables, built once per expression.
+
+    f' is a central difference when SymPy leaves the derivative unevaluated (Abs, floor).
+    """
+    if fprime is None:
+        fprime = sp.diff(func, var)
+    f = float_callable(func, var)
+    if fprime.has(sp.Derivative):
+        fprime = sp.diff(func.subs(var, _real_var), _real_var).subs(_real_var, var)
+    fp = _central_difference(f) if fprime.has(sp.Derivative) else float_callable(fprime, var)
+    return f, fp
+
+
+def to_float(value) -> float:
+    if isinstance(value, (int, float)):
+        return float(value)
+    return float(sp.N(calc_parser.parse(value) if isinstance(value, str) else value))
+
+
+# ---------- Iteration ----------
+def newton_iterate(f, fp, x0: float, tol=1e-12, ftol=1e-14, max_iter=50, on_step=None) -> NewtonResult:
+    """Newton-Raphson from x0; leaving the real domain of f (log of a negative number,
+    a complex power) ends the iteration as not converged."""
+    root, fval, i = x0, math.nan, 0
+    try:
+        fval = float(f(root))
+        for i in range(1, max_iter + 1):
+            fprime_val = float(fp(root))
+            if fprime_val == 0:
+                raise ZeroDivisionError("Derivative became zero during Newton-Raphson.")
+            step = fval / fprime_val
+            new_root = root - step
+            if on_step is not None:
+                on_step(i, root, fval, fprime_val, new_root)
+            root = new_root
+            fval = float(f(root))
+            if not math.isfinite(root) or not math.isfinite(fval):
+                return NewtonResult(root, i, abs(fval), False)
+            if abs(step) <= tol * (1 + abs(root)) or abs(fval) <= ftol:
+                return NewtonResult(root, i, abs(fval), True)
+    except (ValueError, TypeError, OverflowError):
+        return NewtonResult(root, i, math.nan, False)
+    return NewtonResult(root, max_iter, abs(fval), False)
+
+
+def newton_solve(func, init_guess, tol=1e-12, ftol=1e-14, max_iter=50, var=x, on_step=None,
+                 fprime=None) -> NewtonResult:
+    f, fp = compile_newton(func, var, fprime)
+    return newton_iterate(f, fp, to_float(init_guess), tol, ftol, max_iter, on_step)
+
+
+def halley_iterate(derivs, x0: float, tol=1e-12, ftol=1e-14, max_iter=50) -> NewtonResult:
+    """Halley's method (cubic convergence); derivs(x) returns (f, f', f'') at x.
+
+    A small step only counts as convergence when the Newton step f/f' is small
+    too: where f' = 0 the Halley step vanishes without f being near zero.
+    """
+    root, fval, i = x0, math.nan, 0
+    try:
+        fval, d1, d2 = derivs(root)
+        if not math.isfinite(fval):         # outside the domain already (Taylor arithmetic gives NaN)
+            return NewtonResult(root, 0, math.nan, False)
+        for i in range(1, max_iter + 1):
+            if d1 == 0 and fval != 0:
+                raise ZeroDivisionError("Derivative became zero during Halley's method.")
+            denom = 2 * d1 * d1 - fval * d2
+            if denom == 0:
+                raise ZeroDivisionError("Halley step became undefined (2f'^2 = f f'').")
+            step = 2 * fval * d1 / denom
+            root -= step
+            fval, d1, d2 = derivs(root)
+            if not math.isfinite(root) or not math.isfinite(fval):
+                return NewtonResult(root, i, abs(fval), False)
+            small = tol * (1 + abs(root))
+            if abs(fval) <= ftol or (abs(step) <= small and abs(fval) <= small * abs(d1)):
+                return NewtonResult(root, i, abs(fval), True)
+    except (ValueError, TypeError, OverflowError):
+        return NewtonResult(root, i, math.nan, False)
+    return NewtonResult(root, max_iter, abs(fval), False)
+
+
+def format_result(res: NewtonResult) -> str:
+    status = "converged" if res.converged else "NOT converged"
+    return f"{res.root:.12g}  ({status} after {res.iterations} iterations, |f(root)| = {res.residual:.3g})"
+
+
+# ---------- Iteration trace ----------
+class TraceRow(NamedTuple):
+    n: int
+    x: float            # iterate x_n
+    f: float            # f(x_n)
+    fprime: float       # f'(x_n)
+    step: float         # x_(n+1) - x_n
+    error: float        # |x_(n+1) - x_n|, the usual estimate of the error in x_n
+    order: float        # estimated convergence order (nan until three steps exist)
+
+
+@lru_cache(maxsize=128)
+def compile_map(newton_map, var=x):
+    """The Newton map g(x) = x - f(x)/f'(x) as a float callable."""
+    return float_callable(newton_map, var)
+
+
+def newton_trace(g, f, fp, x0: float, max_iter=50, tol=1e-12) -> list:
+    """Iterate x_(n+1) = g(x_n) and record one TraceRow per step.
+
+    Stops after max_iter steps, once the step is below tol, or when the
+    iterate leaves the real domain or meets f' = 0 (the last row then has a
+    nan step; see trace_status).
+    """
+    rows, root = [], float(x0)
+    for n in range(max_iter):
+        try:
+            fval, fprime_val = float(f(root)), float(fp(root))
+            if fprime_val == 0:
+                rows.append(TraceRow(n, root, fval, 0.0, math.nan, math.nan, math.nan))
+                break
+            new_root = float(g(root))       # TypeError for complex values
+        except (ValueError, TypeError, OverflowError, ZeroDivisionError):
+            rows.append(TraceRow(n, root, math.nan, math.nan, math.nan, math.nan, math.nan))
+            break
+        step = new_root - root
+        error = abs(step)
+        order = math.nan
+        # below a few ulps the steps are rounding noise, not convergence
+        if len(rows) >= 2 and 8 * math.ulp(new_root) < error < rows[-1].error < rows[-2].error:
+            order = math.log(error / rows[-1].error) / math.log(rows[-1].error / rows[-2].error)
+        rows.append(TraceRow(n, root, fval, fprime_val, step, error, order))
+        if not math.isfinite(new_root) or error <= tol * (1 + abs(new_root)):
+            break
+        root = new_root
+    return rows
+
+
+TRACE_COLUMNS = ("n", "x_n", "f(x_n)", "f'(x_n)", "step", "error", "order")
+TRACE_CONVERGED, TRACE_ZERO_DERIVATIVE, TRACE_DOMAIN, TRACE_DIVERGED, TRACE_LIMIT = (
+    "converged", "derivative became zero", "left the real domain", "diverged", "iteration limit")
+
+
+def trace_status(rows, tol=1e-12) -> str:
+    """Why newton_trace stopped, read from its last row."""
+    if not rows:
+        return TRACE_LIMIT
+    last = rows[-1]
+    if math.isnan(last.step):
+        return TRACE_ZERO_DERIVATIVE if last.fprime == 0 else TRACE_DOMAIN
+    new_root = last.x + last.step
+    if not math.isfinite(new_root):
+        return TRACE_DIVERGED
+    return TRACE_CONVERGED if last.error <= tol * (1 + abs(new_root)) else TRACE_LIMIT
+
+
+def write_trace_csv(rows, path: str):
+    with open(path, "w", newline="", encoding="utf-8") as fh:
+        w = csv.writer(fh)
+        w.writerow(TRACE_COLUMNS)
+        for r in rows:
+            w.writerow([r.n, repr(r.x), repr(r.f), repr(r.fprime), repr(r.step), repr(r.error),
+                        "" if math.isnan(r.order) else f"{r.order:.4f}"])
+
+
+# ---------- Vectorized multi-start ----------
+class MultiStartResult(NamedTuple):
+    roots: list        # distinct roots, ascending
+    hits: list         # number of starting points that converged to each root
+    converged: int
+    diverged: int
+
+
+@lru_cache(maxsize=128)
+def compile_newton_array(func, var=x, fprime=None):
+    """Return (f, f') as NumPy callables that broadcast over arrays."""
+    if fprime is None:
+        fprime = sp.diff(func, var)
+    f = sp.lambdify(var, func, "numpy")
+    fp = sp.lambdify(var, fprime, "numpy")
+    return f, fp
+
+
+def _as_array(fn, xs):
+    # lambdify returns a scalar for constant expressions
+    return np.broadcast_to(np.asarray(fn(xs), dtype=float), xs.shape)
+
+
+def cluster_roots(roots, tol=1e-8):
+    roots = np.sort(np.asarray(roots, dtype=float))
+    if roots.size == 0:
+        return [], []
+    gaps = np.abs(np.diff(roots)) > tol * (1 + np.abs(roots[1:]))
+    starts = np.concatenate(([0], np.nonzero(gaps)[0] + 1))
+    groups = np.split(roots, starts[1:])
+    return [float(np.median(g)) for g in groups], [int(g.size) for g in groups]
+
+
+def newton_multistart(func, guesses, tol=1e-12, max_iter=50, residual_tol=1e-8, bounds=None, var=x,
+                      fprime=None) -> MultiStartResult:
+    """Run Newton on every starting point at once and return the distinct roots.
+
+    If bounds=(lo, hi) is given, roots outside it count as not converged.
+    """
+    f, fp = compile_newton_array(func, var, fprime)
+    xs = np.array(guesses, dtype=float).ravel()
+    total = xs.size
+    done = np.zeros(0)
+    with np.errstate(all="ignore"):
+        for _ in range(max_iter):
+            if xs.size == 0:
+                break
+            fprime_val = _as_array(fp, xs)
+            step = _as_array(f, xs) / fprime_val
+            # zero-derivative and overflowing lanes are dropped instead of raising
+            alive = np.isfinite(step) & (fprime_val != 0)
+            xs, step = xs[alive], step[alive]
+            xs = xs - step
+            finished = np.abs(step) <= tol * (1 + np.abs(xs))
+            done = np.concatenate((done, xs[finished]))
+            xs = xs[~finished]
+        if done.size:
+            done = done[np.abs(_as_array(f, done)) <= residual_tol * (1 + np.abs(done))]
+    if bounds is not None:
+        done = done[(done >= bounds[0]) & (done <= bounds[1])]
+    roots, hits = cluster_roots(done, max(tol, 1e-10) * 1e3)
+    return MultiStartResult(roots, hits, int(done.size), total - int(done.size))
+
+
+def guess_grid(start, stop, count=1000):
+    return np.linspace(to_float(start), to_float(stop), int(count))
+
+
+def format_multistart(res: MultiStartResult) -> str:
+    lines = [f"{r:.12g}  (reached from {h} starts)" for r, h in zip(res.roots, res.hits)]
+    lines.append(f"{res.converged} starts converged, {res.diverged} diverged, stalled or left the range")
+    return "\n".join(lines)
+
+
+# ---------- Arbitrary precision ----------
+MAX_DIGITS = 20_000
+GUARD_BITS = 24
+
+
+class PreciseRoot(NamedTuple):
+    root: object        # mpmath.mpf at the final working precision
+    digits: int
+    precisions: list    # working precision (bits) of each Newton step
+    certified: bool     # f changes sign across root ± radius
+    radius: object
+    correction: object  # size of the last Newton step
+
+
+@lru_cache(maxsize=128)
+def compile_newton_mp(func, var=x, fprime=None):
+    """Return (f, f') as mpmath callables; they evaluate at the current mpmath precision."""
+    if fprime is None:
+        fprime = sp.diff(func, var)
+    return sp.lambdify(var, func, "mpmath"), sp.lambdify(var, fprime, "mpmath")
+
+
+def _real(value):
+    if isinstance(value, mpmath.mpc):
+        if value.imag != 0:
+            raise ValueError("f is not real near the root.")
+        return value.real
+    return mpmath.mpf(value)
+
+
+def precision_schedule(bits: int, start=48) -> list:
+    """Working precisions for Newton from a float root: each step doubles the correct bits."""
+    steps = [bits]
+    while steps[-1] > 2 * start:
+        steps.append(steps[-1] // 2 + GUARD_BITS)
+    return steps[::-1]
+
+
+def refine_root(f, fp, x0: float, digits: int, max_extra=10) -> PreciseRoot:
+    """Refine a float root of f to `digits` significant digits, doubling the precision each step.
+
+    f' only needs half the working precision (the step it scales is already
+    that small). The schedule ends with one step at the target precision; more
+    are taken only if the steps stop shrinking quadratically (multiple roots).
+    The result is certified when f changes sign between root - radius and
+    root + radius; the radius is far below the last printed digit.
+    """
+    digits = int(digits)
+    if not 1 <= digits <= MAX_DIGITS:
+        raise ValueError(f"Digits must be between 1 and {MAX_DIGITS}.")
+    bits = int(digits * math.log2(10)) + GUARD_BITS
+    root, used = mpmath.mpf(x0), []
+    schedule = precision_schedule(bits)
+    for prec in schedule + [bits] * max_extra:
+        with mpmath.workprec(max(prec // 2, 53)):
+            slope = _real(fp(root))
+        if slope == 0:
+            raise ZeroDivisionError("Derivative became zero during Newton-Raphson.")
+        with mpmath.workprec(prec):
+            step = _real(f(root)) / slope
+            root = root - step
+        used.append(prec)
+        # a step of half the target precision leaves an error of about its square
+        if len(used) >= len(schedule) and abs(step) <= abs(root) * mpmath.ldexp(1, -bits // 2 + GUARD_BITS):
+            break
+    with mpmath.workprec(bits + GUARD_BITS):
+        radius = mpmath.ldexp(1, mpmath.mag(max(abs(root), 1)) - bits + GUARD_BITS // 2)
+        lo, hi = _real(f(root - radius)), _real(f(root + radius))
+    return PreciseRoot(root, digits, used, bool(lo * hi < 0), radius, abs(step))
+
+
+def _decimal(n: int) -> str:
+    # str() refuses integers above 4300 digits; convert in halves instead
+    if n.bit_length() < 13_000:
+        return str(n)
+    k = n.bit_length() * 3 // 20          # about half the decimal digits
+    high, low = divmod(n, 10 ** k)
+    return _decimal(high) + _decimal(low).zfill(k)
+
+
+def format_digits(value, digits: int) -> str:
+    """value rounded to `digits` significant digits, for any number of digits."""
+    if value == 0:
+        return "0." + "0" * (digits - 1)
+    with mpmath.workprec(int(digits * math.log2(10)) + GUARD_BITS):
+        exp10 = int(mpmath.floor(mpmath.log10(abs(value))))
+        n = int(mpmath.nint(abs(value) * mpmath.mpf(10) ** (digits - 1 - exp10)))
+    text = _decimal(n)
+    if len(text) > digits:                 # rounded up to the next power of ten
+        text, exp10 = text[:digits], exp10 + 1
+    sign = "-" if value < 0 else ""
+    if 0 <= exp10 < digits:
+        return f"{sign}{text[:exp10 + 1]}.{text[exp10 + 1:]}".rstrip(".")
+    if -6 <= exp10 < 0:
+        return f"{sign}0.{'0' * (-exp10 - 1)}{text}"
+    return f"{sign}{text[0]}.{text[1:]}e{exp10:+d}"
+
+
+def format_precise(res: PreciseRoot) -> str:
+    bits = res.precisions[-1]
+    radius, correction = format_digits(res.radius, 3), format_digits(res.correction, 3)
+    note = (f"certified: f changes sign within ± {radius}" if res.certified
+            else f"NOT certified: no sign change within ± {radius} (multiple or non-real root?)")
+    return (f"{format_digits(res.root, res.digits)}\n"
+            f"({res.digits} digits; {len(res.precisions)} Newton steps, final precision {bits} bits, "
+            f"last correction {correction}; {note})")
@@ -0,0 +1,175 @@
+"""
+polyfast.py
+Fast paths for polynomial and rational inputs in x: differentiate, integrate,
+factor and solve on Poly coefficient arrays instead of general expression trees
+
+Each function returns None when its input is not of the supported kind, so
+callers fall back to the generic SymPy path.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+import sympy as sp
+from sympy.core.mul import _keep_coeff
+from sympy.integrals.rationaltools import ratint
+
+x = sp.symbols('x')
+
+CLOSED_FORM_DEGREE = 4     # irreducible factors up to this degree are solved exactly
+FACTOR_DEGREE = 60         # above this, factoring over QQ costs more than it gains; go numeric
+MAX_DEGREE = 1000          # above this no fast path: a dense Poly of x**10**8 would never finish
+IMAG_TOL = 1e-12           # numeric roots with |Im| below this (relative) are reported as real
+
+
+# ---------- Detection ----------
+def degree_bound(expr, var=x) -> int:
+    """Upper bound on the degree in var of expr (and of its denominator), read off the
+    expression tree without building a Poly; 0 for anything that is not a power of var."""
+    if expr == var:
+        return 1
+    if not expr.has(var):
+        return 0
+    if expr.is_Pow:
+        base, exp = expr.args
+        return degree_bound(base, var) * abs(int(exp)) if exp.is_Integer else 0
+    if expr.is_Add:
+        return max(degree_bound(a, var) for a in expr.args)
+    if expr.is_Mul:
+        return sum(degree_bound(a, var) for a in expr.args)
+    return 0
+
+
+@lru_cache(maxsize=128)
+def as_poly(expr, var=x):
+    """Return Poly(expr) when expr is a polynomial in var alone with numeric coefficients
+    and degree at most MAX_DEGREE."""
+    if not isinstance(expr, sp.Expr) or not expr.free_symbols <= {var} or degree_bound(expr, var) > MAX_DEGREE:
+        return None
+    if not expr.is_polynomial(var):
+        return None
+    try:
+        p = sp.Poly(expr, var)
+    except sp.PolynomialError:
+        return None
+    return p if p.domain.is_Numerical else None
+
+
+@lru_cache(maxsize=128)
+def as_rational(expr, var=x):
+    """Return (numerator, denominator) Polys when expr is a rational function of var."""
+    if not isinstance(expr, sp.Expr) or not expr.free_symbols <= {var} or degree_bound(expr, var) > MAX_DEGREE:
+        return None
+    if not expr.is_rational_function(var):
+        return None
+    num, den = sp.fraction(sp.together(expr))
+    p, q = as_poly(num, var), as_poly(den, var)
+    if p is None or q is None:
+        return None
+    return p, q
+
+
+def _expanded(p, expr) -> bool:
+    # only answer for inputs already written term by term, so the output keeps the
+    # form the generic path would print (sp.diff((x + 1)**50) stays factored)
+    return p.as_expr() == expr
+
+
+# ---------- Operations ----------
+def poly_diff(expr, var=x):
+    p = as_poly(expr, var)
+    if p is None or not _expanded(p, expr):
+        return None
+    return p.diff(var).as_expr()
+
+
+def _sparse_integrate(expr, var):
+    # a sum of c*x**n term by term; sp.integrate expands x**10**6 densely and never finishes
+    out = []
+    for term in sp.Add.make_args(expr):
+        c, n = term.as_coeff_exponent(var)
+        if c.has(var) or not (n.is_Integer and n >= 0):
+            return None
+        out.append(c * var ** (n + 1) / (n + 1))
+    return sp.Add(*out)
+
+
+def poly_integrate(expr, var=x):
+    p = as_poly(expr, var)
+    if p is not None:
+        return p.integrate(var).as_expr() if _expanded(p, expr) else None
+    if isinstance(expr, sp.Expr) and degree_bound(expr, var) > MAX_DEGREE:
+        return _sparse_integrate(expr, var)
+    pq = as_rational(expr, var)
+    if pq is None or pq[1].degree() < 2 or expr.has(sp.Float):
+        return None     # (a/x and friends are quicker through sp.integrate's table lookup)
+    # same algorithm sp.integrate ends up in, without its heuristics tried first
+    return ratint(expr, var)
+
+
+def _factored(p):
+    coeff, factors = p.factor_list()
+    return _keep_coeff(coeff, sp.Mul(*(f.as_expr() ** k for f, k in factors)))
+
+
+def poly_factor(expr, var=x):
+    p = as_poly(expr, var)
+    if p is not None:
+        return _factored(p) if p.domain.is_Exact else None
+    pq = as_rational(expr, var)
+    if pq is None or not pq[0].domain.is_Exact or not pq[1].domain.is_Exact:
+        return None
+    p, q = pq
+    _, p, q = p.cofactors(q)
+    return _factored(p) / _factored(q)
+
+
+def numeric_roots(p) -> list:
+    """All complex roots of p as eigenvalues of its companion matrix (np.roots)."""
+    coeffs = [complex(c) for c in p.all_coeffs()]
+    roots = []
+    for z in np.roots(coeffs):
+        if abs(z.imag) <= IMAG_TOL * max(1.0, abs(z)):
+            roots.append(sp.Float(z.real, 15))
+        else:
+            roots.append(sp.Float(z.real, 15) + sp.Float(z.imag, 15) * sp.I)
+    return roots
+
+
+def _roots(p) -> list:
+    if not p.domain.is_Exact or p.degree() > FACTOR_DEGREE:
+        return numeric_roots(p)
+    sols = []
+    for f, _ in p.factor_list()[1]:
+        if f.degree() <= CLOSED_FORM_DEGREE:
+            sols.extend(sp.roots(f, cubics=True, quartics=True, multiple=False).keys())
+        else:
+            sols.extend(numeric_roots(f))
+    return sols
+
+
+def poly_solve(expr, var=x):
+    """Roots of expr = 0: closed forms for factors up to degree 4, numeric above that.
+
+    Returns None (use sp.solve) for anything that is not a polynomial or
+    rational function, or when a closed form could not be found.
+    """
+    pq = as_rational(expr, var)
+    if pq is None:
+        return None
+    p, q = pq
+    if p.is_zero or p.degree() < 1:
+        return None
+    exact = p.domain.is_Exact and q.domain.is_Exact
+    if exact:
+        # drop the roots shared with the denominator: those are poles, not solutions
+        p = p.sqf_part()
+        p = p.quo(p.gcd(q))
+        if p.degree() < 1:
+            return []
+    sols = list(dict.fromkeys(_roots(p)))
+    if exact and len(sols) < p.degree():
+        return None     # sp.roots gave up on some factor
+    if not exact and q.degree() > 0:
+        sols = [s for s in sols if abs(complex(q.eval(s))) > IMAG_TOL]
+    return sorted(sols, key=sp.default_sort_key)
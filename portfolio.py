@@ -0,0 +1,281 @@
+"""
+portfolio.py
+Race several integration strategies in separate worker processes and keep the
+first antiderivative that differentiates back to the integrand
+
+    python portfolio.py integrands.txt -j 4 --stats wins.json
+
+sp.integrate tries its strategies one after another, so an integral that the
+rule-based integrator finishes in milliseconds can wait a minute behind the
+heuristic Risch pass. Here every strategy runs at once; the losers are killed
+as soon as one result is verified. Wins are counted per integrand pattern and
+decide which strategies start first when there are fewer workers than
+strategies. Killing a loser kills its worker, so a race wants a pool of its own.
+
+Only the worker side (pattern, attempt) imports SymPy, so the racing process
+stays light: the first job of a race classifies the integrand.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from workers import WorkerPool, DONE
+
+# default start order: cheap and specialised first, the full sp.integrate last
+STRATEGIES = ("rational", "manual", "heurisch", "meijerg", "risch", "sympy")
+VERIFIED, UNVERIFIED, NO_RESULT = "verified", "unverified", "no result"
+VERIFY_POINTS = (0.37, 0.81, 1.29, 2.17, -0.63, -1.71, 3.4)
+MIN_POINTS = 3
+PRELOAD = ("session", "sympy.integrals.manualintegrate", "sympy.integrals.heurisch",
+           "sympy.integrals.meijerint", "sympy.integrals.risch")
+
+
+# ---------- Worker side ----------
+def _strategy(name: str):
+    import sympy as sp
+    import polyfast
+    from sympy.integrals.heurisch import heurisch
+    from sympy.integrals.manualintegrate import manualintegrate
+    from sympy.integrals.meijerint import meijerint_indefinite
+    from sympy.integrals.rationaltools import ratint
+    from sympy.integrals.risch import risch_integrate
+
+    def rational(f, var):
+        F = polyfast.poly_integrate(f, var)
+        if F is None and polyfast.as_rational(f, var) is not None:
+            F = ratint(f, var)
+        return F
+
+    return {
+        "rational": rational,
+        "manual": manualintegrate,
+        "heurisch": heurisch,
+        "meijerg": meijerint_indefinite,
+        "risch": risch_integrate,
+        "sympy": lambda f, var: sp.integrate(f, var),
+    }[name]
+
+
+def verify(f, F, var) -> bool:
+    """Does F' = f?  Checked at a few points first, symbolically only if that is inconclusive.
+
+    The symbolic check is bounded by the strategy job's own timeout, which kills the worker.
+    """
+    import sympy as sp
+    residual = sp.diff(F, var) - f
+    checked = 0
+    for t in VERIFY_POINTS:
+        try:
+            r = complex(residual.evalf(30, subs={var: t}))
+            scale = abs(complex(f.evalf(30, subs={var: t})))
+        except (TypeError, ValueError, ZeroDivisionError):
+            continue                # a pole or a branch cut at this point
+        if r != r or scale != scale or scale == float("inf"):
+            continue
+        if abs(r) > 1e-9 * (1 + scale):
+            return False
+        checked += 1
+    if checked >= MIN_POINTS:
+        return True
+    return sp.simplify(residual) == 0
+
+
+def pattern(expr_str: str) -> str:
+    """Coarse shape of the parsed integrand: the functions it uses ('exp' also for a^x,
+    'power' for x^x, 'sqrt' or 'root' for fractional powers), else 'rational' or 'polynomial'."""
+    import sympy as sp
+    from session import expression
+    e = expression(expr_str)
+    names, rational = set(), False
+    for node in sp.preorder_traversal(e.expr):
+        if isinstance(node, sp.Function):
+            names.add(type(node).__name__.lower())
+        elif node.is_Pow and node.free_symbols:
+            base, exp = node.args
+            if exp.free_symbols:
+                names.add("power" if base.free_symbols else "exp")
+            elif exp.is_Rational and not exp.is_Integer:
+                names.add("sqrt" if exp.q == 2 else "root")
+            elif not exp.is_Rational:
+                names.add("power")
+            elif exp.is_negative:
+                rational = True
+    if names:
+        return "+".join(sorted(names))
+    return "rational" if rational else "polynomial"
+
+
+def attempt(strategy: str, expr_str: str):
+    """One strategy on one integrand: (status, antiderivative text, seconds spent integrating)."""
+    import sympy as sp
+    from session import expression
+    e = expression(expr_str)
+    start = time.perf_counter()
+    F = _strategy(strategy)(e.expr, e.var)
+    seconds = time.perf_counter() - start
+    if F is None or F.has(sp.Integral):
+        return NO_RESULT, "", seconds
+    return (VERIFIED if verify(e.expr, F, e.var) else UNVERIFIED), str(F), seconds
+
+
+# ---------- Win statistics ----------
+class WinStats:
+    """Per pattern and strategy: races started, races won and the time the wins took."""
+
+    def __init__(self, path=None):
+        self.path = path
+        self.data = {}          # pattern -> strategy -> {"runs", "wins", "win_s"}
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.data = json.load(f)
+
+    def record(self, pat: str, started, winner=None, seconds=0.0):
+        for name in started:
+            entry = self.data.setdefault(pat, {}).setdefault(name, {"runs": 0, "wins": 0, "win_s": 0.0})
+            entry["runs"] += 1
+            if name == winner:
+                entry["wins"] += 1
+                entry["win_s"] += seconds
+        if self.path:
+            self.save(self.path)
+
+    def order(self, pat: str) -> list:
+        """Strategies for this pattern: best win rate (then fastest wins) first, then the least tried."""
+        stats = self.data.get(pat, {})
+
+        def rank(name):
+            s = stats.get(name)
+            if not s or not s["wins"]:
+                return (0, float("inf"), s["runs"] if s else 0, STRATEGIES.index(name))
+            return (-s["wins"] / s["runs"], s["win_s"] / s["wins"], 0, STRATEGIES.index(name))
+        return sorted(STRATEGIES, key=rank)
+
+    def save(self, path: str):
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.data, f, indent=2, sort_keys=True)
+        os.replace(tmp, path)
+
+    def format_table(self) -> str:
+        if not self.data:
+            return "No integration races recorded yet."
+        lines = [f"{'pattern':<24} {'strategy':<10} {'wins/runs':>10} {'mean win':>10}"]
+        for pat in sorted(self.data):
+            for name in self.order(pat):
+                s = self.data[pat].get(name)
+                if s:
+                    mean = f"{s['win_s'] / s['wins']:.3g}s" if s["wins"] else "-"
+                    lines.append(f"{pat:<24} {name:<10} {s['wins']:>4}/{s['runs']:<5} {mean:>10}")
+        return "\n".join(lines)
+
+
+# strategy wins of this process, kept in CCALC_STRATEGY_STATS (a JSON file) when it is set
+WIN_STATS = WinStats(os.environ.get("CCALC_STRATEGY_STATS", "").strip() or None)
+
+
+# ---------- Racing ----------
+class Race:
+    """One integrand raced over a WorkerPool; feed it the pool's finished jobs."""
+
+    def __init__(self, expr_str: str, stats=None):
+        self.expr = expr_str
+        self.pattern = None     # set by the classifier job, before any strategy starts
+        self.stats = stats or WIN_STATS
+        self.classifier = None
+        self.timeout = None
+        self.jobs = []          # one per strategy
+        self.winner = None
+        self.result = None
+        self.seconds = 0.0
+        self.outcomes = {}      # strategy -> why it lost, once no strategy won
+        self.done = False
+
+    def start(self, pool, timeout=None):
+        """Classify the integrand in a worker; the strategies start once that job finishes."""
+        self.timeout = timeout
+        self.classifier = pool.submit("portfolio:pattern", (self.expr,), timeout=timeout, tag=("race", self, None))
+
+    def finished(self, job, pool) -> bool:
+        """Account for one finished job of the race; True when this decides the race."""
+        if self.done:
+            return False        # a loser killed after the win
+        if job is self.classifier:
+            if job.status != DONE:
+                self.done = True
+                self.outcomes = {"classify": job.error or job.status}
+                return True
+            self.pattern = job.result
+            for name in self.stats.order(self.pattern):
+                self.jobs.append(pool.submit("portfolio:attempt", (name, self.expr), timeout=self.timeout,
+                                             tag=("race", self, name), affinity=f"race:{name}"))
+            return False
+        name = job.tag[2]
+        if job.status == DONE and job.result[0] == VERIFIED:
+            self.winner, self.result, self.seconds = name, job.result[1], job.elapsed
+            self.done = True
+            started = [j.tag[2] for j in self.jobs if j.started is not None]
+            for other in self.jobs:
+                pool.cancel(other)
+            # rank by the strategy's own time, not by worker start-up or queueing
+            self.stats.record(self.pattern, started, name, job.result[2])
+            return True
+        if all(j.done for j in self.jobs):
+            self.done = True
+            self.outcomes = {j.tag[2]: j.result[0] if j.status == DONE else (j.error or j.status) for j in self.jobs}
+            self.stats.record(self.pattern, [j.tag[2] for j in self.jobs])
+            return True
+        return False
+
+    def format(self) -> str:
+        if self.winner is None:
+            return "\n".join(["No strategy found a verified antiderivative:"]
+                             + [f"  {name}: {why}" for name, why in self.outcomes.items()])
+        return (f"{self.result}\n(verified; {self.winner} won in {self.seconds:.3g} s, "
+                f"{len(self.jobs)} strategies raced, pattern {self.pattern})")
+
+
+def race(pool, expr_str: str, timeout=None, stats=None) -> Race:
+    """Race one integrand to completion (blocking)."""
+    r = Race(expr_str, stats)
+    r.start(pool, timeout)
+    while not r.done:
+        for job in pool.wait():
+            if job.tag and job.tag[0] == "race":
+                job.tag[1].finished(job, pool)
+    pool.poll()             # collect the cancelled losers
+    return r
+
+
+# ---------- CLI: build win statistics for a corpus ----------
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Race integration strategies over a corpus of integrands.")
+    ap.add_argument("input", nargs="?", default="-", help="one integrand per line (default: stdin)")
+    ap.add_argument("-j", "--workers", type=int, default=None, help="worker processes")
+    ap.add_argument("-t", "--timeout", type=float, default=60.0, help="seconds per strategy")
+    ap.add_argument("--stats", default=None, help="JSON file of win statistics to update")
+    args = ap.parse_args(argv)
+    stats = WinStats(args.stats)
+    src = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    pool = WorkerPool(args.workers, preload=PRELOAD)
+    try:
+        for line in src:
+            expr_str = line.strip()
+            if not expr_str or expr_str.startswith("#"):
+                continue
+            start = time.perf_counter()
+            r = race(pool, expr_str, args.timeout, stats)
+            print(json.dumps({"expr": expr_str, "pattern": r.pattern, "winner": r.winner, "result": r.result,
+                              "seconds": round(time.perf_counter() - start, 4), "losers": r.outcomes}), flush=True)
+    finally:
+        pool.shutdown()
+        if src is not sys.stdin:
+            src.close()
+    print(stats.format_table(), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
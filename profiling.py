@@ -0,0 +1,201 @@
+"""
+profiling.py
+Per-operation timing: parse / compute / render stages, result sizes and
+latency histograms, exportable as JSON or CSV, plus an opt-in cProfile dump
+of the slowest call
+
+Worker processes record into their own PROFILER; the records travel back
+with each job reply (see workers.add_reply_hook) and are merged by the GUI.
+"""
+
+import cProfile
+import csv
+import json
+import marshal
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+import workers
+
+# histogram bucket upper bounds, in seconds
+BUCKETS = (0.001, 0.01, 0.1, 1.0, 10.0, float("inf"))
+BUCKET_LABELS = ("<1ms", "<10ms", "<100ms", "<1s", "<10s", ">=10s")
+STAGES = ("parse", "compute", "render")
+
+_local = threading.local()
+
+
+class OpStats:
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.stages = {}
+        self.size_total = 0
+        self.size_max = 0
+        self.histogram = [0] * len(BUCKETS)
+
+    def add(self, rec: dict):
+        self.calls += 1
+        self.errors += bool(rec["error"])
+        self.total += rec["total"]
+        self.max = max(self.max, rec["total"])
+        for stage, seconds in rec["stages"].items():
+            self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+        self.size_total += rec["size"]
+        self.size_max = max(self.size_max, rec["size"])
+        self.histogram[next(i for i, b in enumerate(BUCKETS) if rec["total"] < b)] += 1
+
+    def as_dict(self) -> dict:
+        mean = self.total / self.calls if self.calls else 0.0
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "total_s": self.total,
+            "mean_s": mean,
+            "max_s": self.max,
+            "stage_mean_s": {s: v / self.calls for s, v in self.stages.items()},
+            "size_mean": self.size_total / self.calls if self.calls else 0,
+            "size_max": self.size_max,
+            "histogram": dict(zip(BUCKET_LABELS, self.histogram)),
+        }
+
+
+class Profiler:
+    def __init__(self):
+        self.capture_profile = False     # run calls under cProfile, keep the slowest
+        self._lock = threading.Lock()
+        self._ops = {}
+        self._outbox = []                # (in a worker) records not yet sent to the parent process
+        self.slowest = None              # (op, seconds, marshalled pstats data)
+
+    def record(self, rec: dict):
+        with self._lock:
+            self._ops.setdefault(rec["op"], OpStats()).add(rec)
+            if workers.in_worker():
+                self._outbox.append({k: v for k, v in rec.items() if k != "profile"})
+            if rec.get("profile") is not None and (self.slowest is None or rec["total"] > self.slowest[1]):
+                self.slowest = (rec["op"], rec["total"], rec["profile"])
+
+    def merge(self, payload):
+        """Add records (and the slowest profile) sent back from a worker process."""
+        if not payload:
+            return
+        records, slowest = payload
+        with self._lock:
+            for rec in records:
+                self._ops.setdefault(rec["op"], OpStats()).add(rec)
+            if slowest is not None and (self.slowest is None or slowest[1] > self.slowest[1]):
+                self.slowest = slowest
+
+    def drain(self):
+        with self._lock:
+            records, self._outbox = self._outbox, []
+            slowest, self.slowest = self.slowest, None
+        return (records, slowest) if records or slowest else None
+
+    def reset(self):
+        with self._lock:
+            self._ops.clear()
+            self._outbox.clear()
+            self.slowest = None
+
+    def summary(self) -> dict:
+        with self._lock:
+            return {op: st.as_dict() for op, st in sorted(self._ops.items())}
+
+    def export_json(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.summary(), f, indent=2)
+
+    def export_csv(self, path: str):
+        summary = self.summary()
+        stages = list(STAGES) + sorted({s for st in summary.values() for s in st["stage_mean_s"]} - set(STAGES))
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            w = csv.writer(f)
+            w.writerow(["operation", "calls", "errors", "mean_s", "max_s"]
+                       + [f"{s}_mean_s" for s in stages] + ["size_mean", "size_max"] + list(BUCKET_LABELS))
+            for op, st in summary.items():
+                w.writerow([op, st["calls"], st["errors"], f"{st['mean_s']:.6f}", f"{st['max_s']:.6f}"]
+                           + [f"{st['stage_mean_s'].get(s, 0.0):.6f}" for s in stages]
+                           + [f"{st['size_mean']:.1f}", st["size_max"]] + list(st["histogram"].values()))
+
+    def format_table(self) -> str:
+        lines = [f"{'operation':<24}{'calls':>6}{'err':>5}{'mean ms':>10}{'max ms':>10}{'size':>8}   stages (mean ms)"]
+        for op, st in self.summary().items():
+            stages = "  ".join(f"{s} {v * 1000:.1f}" for s, v in st["stage_mean_s"].items())
+            lines.append(f"{op:<24}{st['calls']:>6}{st['errors']:>5}{st['mean_s'] * 1000:>10.1f}"
+                         f"{st['max_s'] * 1000:>10.1f}{st['size_max']:>8}   {stages}")
+            lines.append(" " * 24 + "  ".join(f"{k}:{n}" for k, n in st["histogram"].items() if n))
+        if self.slowest is not None:
+            lines.append(f"\nslowest profiled call: {self.slowest[0]} ({self.slowest[1] * 1000:.1f} ms)")
+        return "\n".join(lines)
+
+    def dump_slowest(self, path: str) -> bool:
+        """Write the slowest call's profile in pstats format (open with pstats.Stats(path))."""
+        if self.slowest is None:
+            return False
+        with open(path, "wb") as f:
+            f.write(self.slowest[2])
+        return True
+
+
+PROFILER = Profiler()
+workers.add_reply_hook("profile", PROFILER.drain)
+
+
+# ---------- Instrumentation ----------
+@contextmanager
+def stage(name: str):
+    """Time a stage of the current profiled call (no-op outside one)."""
+    stages = getattr(_local, "stages", None)
+    if stages is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stages[name] = stages.get(name, 0.0) + time.perf_counter() - start
+
+
+def profiled(operation: str, profiler=None):
+    """Decorator: record total time, stage split and result size of each call."""
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            prof = profiler or PROFILER
+            outer = getattr(_local, "stages", None)
+            _local.stages = {}
+            cprof = cProfile.Profile() if prof.capture_profile and outer is None else None
+            error, result = True, None
+            start = time.perf_counter()
+            try:
+                if cprof is not None:
+                    result = cprof.runcall(fn, *args, **kwargs)
+                else:
+                    result = fn(*args, **kwargs)
+                error = False
+                return result
+            finally:
+                total = time.perf_counter() - start
+                stages, _local.stages = _local.stages, outer
+                stages["compute"] = max(0.0, total - sum(stages.values()))
+                data = None
+                if cprof is not None:
+                    cprof.create_stats()
+                    data = marshal.dumps(cprof.stats)
+                prof.record({"op": operation, "total": total, "stages": stages, "error": error,
+                             "size": len(result) if isinstance(result, str) else 0, "profile": data})
+        return wrapper
+    return decorator
+
+
+def run_operation(capture: bool, operation: str, *args):
+    """Worker entry point: compute.run_operation with cProfile capture switched on or off."""
+    import compute
+    PROFILER.capture_profile = capture
+    return compute.run_operation(operation, *args)
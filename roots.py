@@ -0,0 +1,474 @@
+"""
+roots.py
+Every real root of f(x) = 0 in an interval, each isolated in its own bracket
+
+Polynomials: Sturm sequences count the distinct roots in a subinterval
+exactly, and bisection goes on until every piece holds one root.
+
+Other functions: the range is cut into a grid of pieces and all pieces are
+handled at once with NumPy. A piece is dropped when an interval enclosure of
+f on it excludes 0. It holds exactly one root when f changes sign and an
+enclosure of f' excludes 0 (f is monotone there). Anything else is bisected.
+Isolated brackets are polished with Brent's method on the compiled f. When f
+has no enclosure (floor, gamma, ...) nothing can be excluded, so the grid is
+only scanned for sign changes and the range is reported unresolved.
+"""
+
+import math
+from typing import NamedTuple
+
+import numpy as np
+import sympy as sp
+
+import sampling
+
+x = sp.symbols('x')
+
+GRID = 1024                 # initial pieces of the range
+MIN_WIDTH = 1e-10           # relative width below which a piece is not split further
+MAX_PIECES = 1 << 20        # pieces alive at once before the rest is reported unresolved
+STURM_DEGREE = 40           # above this the exact Sturm sequence costs more than the scan
+MAX_LISTED = 1000           # roots written out by format_roots
+EPS = np.finfo(float).eps
+
+ZERO_TOL = 1e-8             # |f(r)| relative to the typical |f| for an unproven root to be kept
+
+STURM, SCAN, GRID_SCAN = "Sturm sequences", "sign scan with interval exclusion", "sign scan (no enclosure)"
+
+
+class RootsResult(NamedTuple):
+    roots: list         # (value, multiplicity or None, isolated) sorted by value
+    unresolved: list    # (lo, hi) ranges that could neither be excluded nor isolated
+    method: str
+    pieces: int         # subintervals examined
+
+
+# ---------- Interval arithmetic ----------
+# An enclosure is a pair of arrays (lo, hi), one entry per piece; NaN marks a piece where f is undefined.
+def _widen(lo, hi):
+    # outward rounding: libm results are within a few ulps
+    return lo - (np.abs(lo) * 4 * EPS + 1e-300), hi + (np.abs(hi) * 4 * EPS + 1e-300)
+
+
+def _mul(a, b):
+    (al, ah), (bl, bh) = a, b
+    products = np.stack((al * bl, al * bh, ah * bl, ah * bh))
+    products[np.isnan(products)] = 0.0          # 0 * inf
+    lo, hi = products.min(axis=0), products.max(axis=0)
+    empty = np.isnan(al) | np.isnan(bl)
+    return np.where(empty, np.nan, lo), np.where(empty, np.nan, hi)
+
+
+def _reciprocal(a):
+    lo, hi = a
+    spans_zero = (lo <= 0) & (hi >= 0)
+    return np.where(spans_zero, -np.inf, 1 / hi), np.where(spans_zero, np.inf, 1 / lo)
+
+
+def _int_power(a, n: int):
+    if n < 0:
+        return _reciprocal(_int_power(a, -n))
+    lo, hi = a
+    pl, ph = lo ** n, hi ** n
+    if n % 2:
+        return pl, ph
+    spans_zero = (lo < 0) & (hi > 0)
+    return np.where(spans_zero, 0.0, np.minimum(pl, ph)), np.maximum(pl, ph)
+
+
+def _increasing(fn, domain=(-np.inf, np.inf)):
+    # monotone increasing on its domain; pieces outside the domain are empty
+    def enclose(a):
+        lo, hi = np.maximum(a[0], domain[0]), np.minimum(a[1], domain[1])
+        empty = lo > hi
+        return np.where(empty, np.nan, fn(lo)), np.where(empty, np.nan, fn(hi))
+    return enclose
+
+
+def _real_power(a, r: float):
+    lo, hi = np.maximum(a[0], 0.0), a[1]
+    empty = hi < 0
+    pl, ph = lo ** r, hi ** r
+    if r < 0:
+        pl, ph = ph, pl
+    return np.where(empty, np.nan, pl), np.where(empty, np.nan, ph)
+
+
+def _periodic_extremes(lo, hi, at, period):
+    # does [lo, hi] contain a point at + k * period?
+    k = np.ceil((lo - at) / period - 1e-12)
+    return at + k * period <= hi + 1e-12 * (1 + np.abs(hi))
+
+
+def _sin(a):
+    lo, hi = a
+    sl, sh = np.sin(lo), np.sin(hi)
+    rl, rh = np.minimum(sl, sh), np.maximum(sl, sh)
+    rh = np.where(_periodic_extremes(lo, hi, np.pi / 2, 2 * np.pi), 1.0, rh)
+    rl = np.where(_periodic_extremes(lo, hi, -np.pi / 2, 2 * np.pi), -1.0, rl)
+    whole = ~np.isfinite(lo) | ~np.isfinite(hi) | (hi - lo >= 2 * np.pi)
+    return np.where(whole, -1.0, rl), np.where(whole, 1.0, rh)
+
+
+def _cos(a):
+    return _sin((a[0] + np.pi / 2, a[1] + np.pi / 2))
+
+
+def _tan(a):
+    lo, hi = a
+    pole = _periodic_extremes(lo, hi, np.pi / 2, np.pi) | ~np.isfinite(lo) | ~np.isfinite(hi) | (hi - lo >= np.pi)
+    return np.where(pole, -np.inf, np.tan(lo)), np.where(pole, np.inf, np.tan(hi))
+
+
+def _abs(a):
+    lo, hi = a
+    spans_zero = (lo < 0) & (hi > 0)
+    al, ah = np.abs(lo), np.abs(hi)
+    return np.where(spans_zero, 0.0, np.minimum(al, ah)), np.maximum(al, ah)
+
+
+def _cosh(a):
+    al, ah = _abs(a)
+    return np.cosh(al), np.cosh(ah)
+
+
+def _decreasing(fn, domain):
+    inc = _increasing(lambda v: -fn(v), domain)
+    return lambda a: tuple(-v for v in inc(a)[::-1])
+
+
+ENCLOSURES = {
+    sp.exp: _increasing(np.exp),
+    sp.log: _increasing(np.log, (0.0, np.inf)),
+    sp.sin: _sin,
+    sp.cos: _cos,
+    sp.tan: _tan,
+    sp.cot: lambda a: _mul(_cos(a), _reciprocal(_sin(a))),
+    sp.sec: lambda a: _reciprocal(_cos(a)),
+    sp.csc: lambda a: _reciprocal(_sin(a)),
+    sp.sinh: _increasing(np.sinh),
+    sp.cosh: _cosh,
+    sp.tanh: _increasing(np.tanh),
+    sp.asin: _increasing(np.arcsin, (-1.0, 1.0)),
+    sp.acos: _decreasing(np.arccos, (-1.0, 1.0)),
+    sp.atan: _increasing(np.arctan),
+    sp.asinh: _increasing(np.arcsinh),
+    sp.acosh: _increasing(np.arccosh, (1.0, np.inf)),
+    sp.atanh: _increasing(np.arctanh, (-1.0, 1.0)),
+    sp.Abs: _abs,
+}
+
+
+def enclose(expr, lo, hi, var=x):
+    """Enclosures (lo, hi) of expr over the pieces [lo[i], hi[i]] (the whole line when unknown)."""
+    memo = {}
+    whole = (np.full(lo.shape, -np.inf), np.full(lo.shape, np.inf))
+
+    def ev(node):
+        if node in memo:
+            return memo[node]
+        if node == var:
+            out = (lo, hi)
+        elif not node.free_symbols:
+            value = complex(node)
+            out = (np.full(lo.shape, value.real),) * 2 if not value.imag else whole
+        elif node.is_Add:
+            parts = [ev(t) for t in node.args]
+            out = (sum(p[0] for p in parts), sum(p[1] for p in parts))
+        elif node.is_Mul:
+            out = ev(node.args[0])
+            for t in node.args[1:]:
+                out = _mul(out, ev(t))
+        elif node.is_Pow:
+            base, exp = node.args
+            if exp.free_symbols:
+                out = ENCLOSURES[sp.exp](_mul(ev(exp), ENCLOSURES[sp.log](ev(base))))
+            elif exp.is_Integer:
+                out = _int_power(ev(base), int(exp))
+            else:
+                out = _real_power(ev(base), float(exp))
+        elif node.func in ENCLOSURES and len(node.args) == 1:
+            out = ENCLOSURES[node.func](ev(node.args[0]))
+        else:
+            out = whole
+        out = _widen(*out)
+        memo[node] = out
+        return out
+
+    with np.errstate(all="ignore"):
+        return ev(expr)
+
+
+def enclosable(expr, var=x) -> bool:
+    """Does enclose() bound expr anywhere, or does some node fall back to the whole line?"""
+    for node in sp.preorder_traversal(expr):
+        if node == var or node.is_Add or node.is_Mul or node.is_Pow:
+            continue
+        if not node.free_symbols:
+            try:
+                if complex(node).imag:
+                    return False
+            except TypeError:
+                return False
+        elif not (node.func in ENCLOSURES and len(node.args) == 1):
+            return False
+    return True
+
+
+# ---------- Brent ----------
+def brent(f, a: float, b: float, fa: float, fb: float, xtol=4 * EPS, max_iter=200) -> float:
+    """Root of f in [a, b] where fa and fb have opposite signs (Brent-Dekker)."""
+    if fa == 0:
+        return a
+    if fb == 0:
+        return b
+    c, fc, d = a, fa, b - a
+    e = d
+    for _ in range(max_iter):
+        if fb * fc > 0:
+            c, fc, d = a, fa, b - a
+            e = d
+        if abs(fc) < abs(fb):
+            a, b, c, fa, fb, fc = b, c, b, fb, fc, fb
+        tol = 2 * EPS * abs(b) + xtol / 2
+        m = (c - b) / 2
+        if abs(m) <= tol or fb == 0:
+            return b
+        if abs(e) >= tol and abs(fa) > abs(fb):
+            s = fb / fa
+            if a == c:                      # secant
+                p, q = 2 * m * s, 1 - s
+            else:                           # inverse quadratic interpolation
+                q, r = fa / fc, fb / fc
+                p = s * (2 * m * q * (q - r) - (b - a) * (r - 1))
+                q = (q - 1) * (r - 1) * (s - 1)
+            if p > 0:
+                q = -q
+            p = abs(p)
+            if 2 * p < min(3 * m * q - abs(tol * q), abs(e * q)):
+                e, d = d, p / q
+            else:
+                d = e = m
+        else:
+            d = e = m
+        a, fa = b, fb
+        b += d if abs(d) > tol else math.copysign(tol, m)
+        fb = f(b)
+        if fb != fb:                        # NaN: fall back to bisection of the bracket
+            b, fb = a, fa
+            d = e = m
+    return b
+
+
+def _safe(f):
+    def call(v):
+        try:
+            return float(f(v))
+        except (ValueError, ZeroDivisionError, OverflowError, TypeError):
+            return math.nan
+    return call
+
+
+# ---------- Polynomials: Sturm sequences ----------
+def _variations(seq, point) -> int:
+    signs = [s for s in (sp.sign(p.eval(point)) for p in seq) if s != 0]
+    return sum(1 for s, t in zip(signs, signs[1:]) if s != t)
+
+
+def _horner(coeffs):
+    def f(v):
+        acc = 0.0
+        for c in coeffs:
+            acc = acc * v + c
+        return acc
+    return f
+
+
+def sturm_roots(poly, lo, hi) -> RootsResult:
+    """Distinct real roots of a Poly in [lo, hi], isolated exactly by Sturm sequences."""
+    poly = poly.set_domain(sp.QQ)
+    lo, hi = sp.Rational(lo), sp.Rational(hi)
+    factors = [(f, m) for f, m in poly.sqf_list()[1] if f.degree() > 0]
+    seq = sp.sturm(poly.sqf_part())
+    roots, pieces = [], 1
+    if poly.eval(lo) == 0:
+        roots.append((lo, None))
+    stack = [(lo, hi, _variations(seq, lo), _variations(seq, hi))]
+    while stack:
+        a, b, va, vb = stack.pop()
+        count = va - vb                     # distinct roots in (a, b]
+        if count == 0:
+            continue
+        if count == 1 and poly.eval(a) != 0:
+            roots.append((a, b))
+            continue
+        mid = (a + b) / 2
+        vm = _variations(seq, mid)
+        stack += [(a, mid, va, vm), (mid, b, vm, vb)]
+        pieces += 2
+    found = []
+    for a, b in roots:
+        if b is None or poly.eval(b) == 0:  # an exact rational root
+            r = a if b is None else b
+            found.append((float(r), next(m for f, m in factors if f.eval(r) == 0), True))
+            continue
+        # the one square-free factor that changes sign on (a, b) holds the root
+        f, m = next((f, m) for f, m in factors if sp.sign(f.eval(a)) != sp.sign(f.eval(b)))
+        g = _horner([float(c) for c in f.all_coeffs()])
+        fa, fb = g(float(a)), g(float(b))
+        if fa * fb < 0:
+            value = brent(g, float(a), float(b), fa, fb)
+        else:                               # float signs disagree with exact ones: bisect exactly
+            while b - a > abs(b) * 2 * EPS + 1e-300:
+                mid = (a + b) / 2
+                a, b = (a, mid) if sp.sign(f.eval(a)) != sp.sign(f.eval(mid)) else (mid, b)
+            value = float((a + b) / 2)
+        found.append((value, m, True))
+    return RootsResult(sorted(found), [], STURM, pieces)
+
+
+# ---------- General functions: scan, exclude, bisect ----------
+def scan_roots(expr, derivative, f, fv, lo: float, hi: float, var=x, grid=GRID) -> RootsResult:
+    """Real roots of expr in [lo, hi]; f is a float callable and fv its NumPy version."""
+    f = _safe(f)
+    edges = np.linspace(lo, hi, grid + 1)
+    values = sampling.evaluate(fv, edges)
+    finite = np.abs(values[np.isfinite(values)])
+    # a bracket around a jump or a pole also changes sign: its midpoint must come close to 0
+    ftol = ZERO_TOL * (1 + (np.median(finite) if finite.size else 0.0))
+    if not enclosable(expr, var):
+        return _grid_scan(f, edges, values, ftol)
+    a, b, fa, fb = edges[:-1], edges[1:], values[:-1], values[1:]
+    zeros = list(edges[values == 0])
+    brackets, narrow, pieces = [], [], grid
+    while a.size:
+        mid = (a + b) / 2
+        fm = sampling.evaluate(fv, mid)
+        zeros += list(mid[fm == 0])
+        # natural enclosure, tightened by the mean value form f(m) + f'(I) (I - m)
+        fl, fh = enclose(expr, a, b, var)
+        dl, dh = enclose(derivative, a, b, var)
+        slope = np.maximum(np.abs(dl), np.abs(dh)) * (b - a) / 2
+        slack = 8 * EPS * (1 + np.abs(fm))
+        with np.errstate(invalid="ignore"):
+            mvl, mvh = fm - slope - slack, fm + slope + slack
+            fl = np.where(np.isfinite(mvl), np.maximum(fl, mvl), fl)
+            fh = np.where(np.isfinite(mvh), np.minimum(fh, mvh), fh)
+            excluded = (fl > 0) | (fh < 0) | np.isnan(fl)
+            sign = fa * fb < 0
+            monotone = (dl > 0) | (dh < 0)
+        # a bounded enclosure also rules out a pole, where f' > 0 and a sign change mean nothing
+        isolated = ~excluded & sign & monotone & np.isfinite(fl) & np.isfinite(fh)
+        brackets += zip(a[isolated], b[isolated], fa[isolated], fb[isolated])
+        # a monotone piece without a sign change has no root inside
+        split = ~excluded & ~isolated & ~(monotone & ~sign)
+        small = split & ((b - a) <= MIN_WIDTH * (1 + np.abs(a)))
+        narrow.append((a[small], b[small], fa[small], fb[small], fm[small]))
+        split &= ~small
+        if 2 * split.sum() > MAX_PIECES:
+            narrow.append((a[split], b[split], fa[split], fb[split], np.full(split.sum(), np.nan)))
+            break
+        a, b, fa, fb, mid, fm = a[split], b[split], fa[split], fb[split], mid[split], fm[split]
+        a, b = np.concatenate((a, mid)), np.concatenate((mid, b))
+        fa, fb = np.concatenate((fa, fm)), np.concatenate((fm, fb))
+        pieces += a.size
+    # a float zero proves a simple root only with a sign change around it and f' bounded away from 0
+    zeros = np.array(sorted(set(zeros)), dtype=float)
+    delta = MIN_WIDTH * (1 + np.abs(zeros))
+    dl, dh = enclose(derivative, zeros - delta, zeros + delta, var)
+    crossing = sampling.evaluate(fv, zeros - delta) * sampling.evaluate(fv, zeros + delta) < 0
+    proven = crossing & ((dl > 0) | (dh < 0))
+    roots = [(float(z), None, True) for z in zeros[proven]]
+    candidates = list(zeros[~proven])       # f reaches 0 here, but the root may be multiple
+    for pa, pb, pfa, pfb in brackets:
+        roots.append((brent(f, float(pa), float(pb), float(pfa), float(pfb)), None, True))
+    unresolved = []
+    for na, nb, nfa, nfb, nfm in narrow:
+        for pa, pb, pfa, pfb, pfm in zip(na, nb, nfa, nfb, nfm):
+            if pfa * pfb < 0:               # a root, a cluster of roots, or a pole
+                r = brent(f, float(pa), float(pb), float(pfa), float(pfb))
+                if abs(f(r)) <= ftol:
+                    candidates.append(r)
+            elif abs(pfm) <= 1e-10:         # touches zero without crossing
+                candidates.append(float((pa + pb) / 2))
+            elif np.isnan(pfm):
+                unresolved.append((float(pa), float(pb)))
+    roots += [(c, None, False) for c in _cluster(candidates)]
+    return RootsResult(_dedupe(roots), _join(unresolved), SCAN, pieces)
+
+
+def _grid_scan(f, edges, values, ftol) -> RootsResult:
+    # without an enclosure no piece can be excluded: bisecting would only run into MAX_PIECES
+    candidates = list(edges[values == 0])
+    fa, fb = values[:-1], values[1:]
+    for i in np.flatnonzero(fa * fb < 0):
+        r = brent(f, float(edges[i]), float(edges[i + 1]), float(fa[i]), float(fb[i]))
+        if abs(f(r)) <= ftol:
+            candidates.append(r)
+    roots = [(c, None, False) for c in _cluster(candidates)]
+    return RootsResult(roots, [(float(edges[0]), float(edges[-1]))], GRID_SCAN, edges.size - 1)
+
+
+def _dedupe(roots, tol=1e-9):
+    out = []
+    for r in sorted(roots, key=lambda t: t[0]):
+        if out and abs(r[0] - out[-1][0]) <= tol * (1 + abs(r[0])):
+            value, mult, isolated = out[-1]
+            if r[2] and not isolated:       # keep the value that comes with a proof
+                value = r[0]
+            out[-1] = (value, mult or r[1], isolated or r[2])
+        else:
+            out.append(r)
+    return out
+
+
+def _cluster(points, tol=1e-7):
+    # centre of each group of nearby points: a multiple root is only located to about sqrt(eps)
+    groups = []
+    for p in sorted(points):
+        if groups and p - groups[-1][1] <= tol * (1 + abs(p)):
+            groups[-1][1] = p
+        else:
+            groups.append([p, p])
+    return [(lo + hi) / 2 for lo, hi in groups]
+
+
+def _join(ranges):
+    out = []
+    for a, b in sorted(ranges):
+        if out and a <= out[-1][1]:
+            out[-1] = (out[-1][0], max(b, out[-1][1]))
+        else:
+            out.append((a, b))
+    return out
+
+
+def merge(parts) -> RootsResult:
+    """One result from the results of adjacent subranges (e.g. farmed out to workers)."""
+    parts = [RootsResult(*p) for p in parts]
+    methods = sorted({p.method for p in parts})
+    return RootsResult(_dedupe([r for p in parts for r in p.roots]), _join([u for p in parts for u in p.unresolved]),
+                       " and ".join(methods), sum(p.pieces for p in parts))
+
+
+def as_plain(res: RootsResult) -> tuple:
+    """The result as builtin types only, so it unpickles where this module is not imported."""
+    return ([(float(v), m, bool(i)) for v, m, i in res.roots], [(float(a), float(b)) for a, b in res.unresolved],
+            res.method, int(res.pieces))
+
+
+# ---------- Output ----------
+def format_roots(res: RootsResult, lo, hi) -> str:
+    lines = []
+    for value, mult, isolated in res.roots[:MAX_LISTED]:
+        note = f"  (multiplicity {mult})" if mult and mult > 1 else ""
+        if not isolated:
+            note += "  (not proven simple)"
+        lines.append(f"x = {value:.15g}{note}")
+    if len(res.roots) > MAX_LISTED:
+        lines.append(f"... and {len(res.roots) - MAX_LISTED} more")
+    lines.append(f"{len(res.roots)} real root(s) in [{lo}, {hi}]  ({res.method}, {res.pieces} subintervals)")
+    if res.unresolved:
+        ranges = ", ".join(f"[{a:.6g}, {b:.6g}]" for a, b in res.unresolved[:20])
+        lines.append(f"not resolved (roots may hide here): {ranges}")
+    return "\n".join(lines)
@@ -0,0 +1,169 @@
+"""
+sampling.py
+Vectorized function sampling for plotting: one NumPy pass over the view,
+adaptive refinement at sharp bends and jumps, breaks at poles and
+non-finite values, and min/max downsampling to the pixel width
+
+A SampleCache keeps the points already computed for an expression, so
+panning and zooming only evaluate the parts of the new view not yet
+covered at the required density.
+"""
+
+import threading
+
+import numpy as np
+
+OVERSAMPLE = 4             # base samples per pixel column
+REFINE_DEPTH = 6           # bisection rounds at bends and jumps
+MAX_POINTS = 2_000_000     # cached points kept per expression
+DENSE_POINTS = 1_000_000   # points per view for dense sampling
+
+
+def evaluate(f, xs):
+    """f over xs as a float array; complex, infinite and failed values become NaN."""
+    with np.errstate(all="ignore"):
+        ys = np.asarray(f(xs))
+    if np.iscomplexobj(ys):
+        ys = np.where(np.abs(ys.imag) <= 1e-12 * (1 + np.abs(ys.real)), ys.real, np.nan)
+    ys = np.array(np.broadcast_to(ys, xs.shape), dtype=float)
+    ys[~np.isfinite(ys)] = np.nan
+    return ys
+
+
+def robust_range(ys):
+    """(lo, hi) covering the bulk of the finite values, ignoring the spikes near poles."""
+    finite = ys[np.isfinite(ys)]
+    if finite.size == 0:
+        return -1.0, 1.0
+    lo, hi = np.percentile(finite, (2, 98)) if finite.size > 50 else (finite.min(), finite.max())
+    if hi - lo < 1e-12 * max(1.0, abs(hi)):
+        lo, hi = lo - 1, hi + 1
+    pad = (hi - lo) * 0.1
+    return float(lo - pad), float(hi + pad)
+
+
+def _gap_fill(xs, lo, hi, step):
+    # uniform points inside every gap of xs (plus the view edges) wider than step
+    edges = np.concatenate(([lo], xs[(xs > lo) & (xs < hi)], [hi]))
+    gaps = np.diff(edges)
+    counts = np.where(gaps > 1.5 * step, np.ceil(gaps / step).astype(int) - 1, 0)
+    if not counts.any():
+        return np.empty(0)
+    starts = np.repeat(edges[:-1], counts)
+    spacing = np.repeat(gaps / (counts + 1), counts)
+    rank = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts) + 1
+    fill = starts + rank * spacing
+    if lo not in xs:
+        fill = np.concatenate(([lo], fill))
+    if hi not in xs:
+        fill = np.concatenate((fill, [hi]))
+    return fill
+
+
+def _needs_refining(xs, ys, yspan, min_step):
+    # segments i..i+1 that bend sharply, jump, or border a NaN, and are still wide enough
+    wide = np.diff(xs) > min_step
+    finite = np.isfinite(ys)
+    border = finite[:-1] != finite[1:]
+    dy = np.abs(np.diff(ys))
+    jump = dy > 0.05 * yspan
+    bend = np.zeros_like(jump)
+    if ys.size > 2:
+        second = np.abs(ys[2:] - 2 * ys[1:-1] + ys[:-2]) > 0.01 * yspan
+        bend[:-1] |= second
+        bend[1:] |= second
+    return wide & (border | jump | bend)
+
+
+def _merge(xs, ys, new_x, new_y):
+    # new_x is sorted and disjoint from xs, so a linear insert keeps the arrays sorted
+    at = np.searchsorted(xs, new_x)
+    return np.insert(xs, at, new_x), np.insert(ys, at, new_y)
+
+
+def downsample(xs, ys, lo, hi, width):
+    """Per pixel column (split at NaNs) keep first, min, max and last; NaN marks a break in the line."""
+    if xs.size <= 4 * width:
+        return xs, ys
+    cols = np.clip(((xs - lo) / (hi - lo) * width).astype(int), 0, width - 1)
+    nan = np.isnan(ys)
+    # a run of NaNs is a group of its own, so min and max are never joined across a pole
+    starts = np.flatnonzero(np.concatenate(([True], (cols[1:] != cols[:-1]) | (nan[1:] != nan[:-1]))))
+    ends = np.concatenate((starts[1:], [xs.size])) - 1
+    ymin = np.minimum.reduceat(np.where(nan, np.inf, ys), starts)
+    ymax = np.maximum.reduceat(np.where(nan, -np.inf, ys), starts)
+    broken = np.add.reduceat(nan.astype(int), starts) > 0
+    ymin[~np.isfinite(ymin)] = np.nan
+    ymax[~np.isfinite(ymax)] = np.nan
+    xmid = (xs[starts] + xs[ends]) / 2
+    # 5 slots per column: first, min, max, last, (NaN if the column had a break)
+    out_x = np.column_stack((xs[starts], xmid, xmid, xs[ends], xs[ends]))
+    out_y = np.column_stack((ys[starts], ymin, ymax, ys[ends], np.where(broken, np.nan, ys[ends])))
+    return out_x.ravel(), out_y.ravel()
+
+
+def mark_poles(xs, ys, yspan, min_step):
+    """Insert NaN between neighbours that still jump by more than yspan after refining."""
+    jump = np.abs(np.diff(ys)) > yspan
+    jump &= np.diff(xs) <= 2 * min_step
+    jump &= np.sign(ys[:-1]) != np.sign(ys[1:])
+    if not jump.any():
+        return xs, ys
+    at = np.flatnonzero(jump) + 1
+    return np.insert(xs, at, (xs[at - 1] + xs[at]) / 2), np.insert(ys, at, np.nan)
+
+
+class SampleCache:
+    def __init__(self, f, max_points=MAX_POINTS):
+        self.f = f
+        self.max_points = max_points
+        self.xs = np.empty(0)
+        self.ys = np.empty(0)
+        self.evaluations = 0
+        self._lock = threading.Lock()
+
+    def _eval(self, xs):
+        self.evaluations += xs.size
+        return evaluate(self.f, xs)
+
+    def view(self, lo, hi, width, yspan=None, oversample=OVERSAMPLE):
+        """Points for drawing [lo, hi] at `width` pixels: (xs, ys, (ylo, yhi))."""
+        lo, hi, width = float(lo), float(hi), max(int(width), 2)
+        step = (hi - lo) / (width * oversample)
+        # refinement resolves features down to a fixed fraction of a pixel; denser views skip it
+        min_step = (hi - lo) / (width * OVERSAMPLE * 2 ** REFINE_DEPTH)
+        with self._lock:
+            new_x = _gap_fill(self.xs, lo, hi, step)
+            if new_x.size:
+                self.xs, self.ys = _merge(self.xs, self.ys, new_x, self._eval(new_x))
+            inside = (self.xs >= lo) & (self.xs <= hi)
+            vx, vy = self.xs[inside], self.ys[inside]
+            yrange = robust_range(vy)
+            span = yspan or (yrange[1] - yrange[0])
+            added_x, added_y = [], []
+            for _ in range(REFINE_DEPTH if step > min_step else 0):
+                seg = _needs_refining(vx, vy, span, min_step)
+                if not seg.any():
+                    break
+                mids = (vx[:-1][seg] + vx[1:][seg]) / 2
+                mid_y = self._eval(mids)
+                vx, vy = _merge(vx, vy, mids, mid_y)
+                added_x.append(mids)
+                added_y.append(mid_y)
+            if added_x:
+                # one insert into the cache for all rounds
+                new_x, new_y = np.concatenate(added_x), np.concatenate(added_y)
+                order = np.argsort(new_x)
+                self.xs, self.ys = _merge(self.xs, self.ys, new_x[order], new_y[order])
+            self._trim(lo, hi)
+        vx, vy = mark_poles(vx, vy, span, min_step)
+        dx, dy = downsample(vx, vy, lo, hi, width)
+        return dx, dy, yrange
+
+    def _trim(self, lo, hi):
+        # drop the cached points farthest from the current view
+        if self.xs.size <= self.max_points:
+            return
+        centre = (lo + hi) / 2
+        keep = np.sort(np.argsort(np.abs(self.xs - centre), kind="stable")[:self.max_points])
+        self.xs, self.ys = self.xs[keep], self.ys[keep]
@@ -0,0 +1,281 @@
+"""
+service.py
+Local HTTP compute service: many clients share one warm worker pool
+
+    python service.py --port 8765 -j 4
+    curl -s localhost:8765/compute -d '{"op": "differentiate", "expr": "x^3 - 3x - 6"}'
+
+    POST /compute   {"op", "expr", "args": [...], "timeout": seconds}  -> {"status", "result" | "error", ...}
+    GET  /metrics   request counts, latency percentiles, throughput, per-operation stats
+    GET  /health    GET /operations
+
+Identical requests already in flight share one job, results are kept in
+the result cache, and when more than --max-queue jobs are waiting new work
+is refused with 503 instead of queueing without bound. Only the standard
+library is used; --unix PATH serves on a Unix socket instead of TCP.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections import deque
+from urllib.parse import urlsplit
+
+from batch import OPERATIONS
+from cache import RESULT_CACHE, make_key, normalize_expr
+from profiling import PROFILER
+from workers import WorkerPool, DONE, TIMEOUT
+
+POLL_S = 0.005              # pool polling interval while jobs are running
+MAX_BODY = 64 * 1024
+LATENCY_WINDOW = 2000       # recent requests kept for the latency percentiles
+THROUGHPUT_WINDOW = 60.0    # seconds
+
+
+class Overloaded(Exception):
+    pass
+
+
+class JobFailed(Exception):
+    def __init__(self, message, timed_out=False):
+        super().__init__(message)
+        self.timed_out = timed_out
+
+
+class Metrics:
+    def __init__(self):
+        self.started = time.monotonic()
+        self.counts = dict.fromkeys(("requests", "ok", "errors", "timeouts", "rejected",
+                                     "cache_hits", "deduplicated", "jobs"), 0)
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.completions = deque()      # finish times inside the throughput window
+
+    def count(self, name: str):
+        self.counts[name] += 1
+
+    def finished(self, seconds: float):
+        now = time.monotonic()
+        self.latencies.append(seconds)
+        self.completions.append(now)
+        while self.completions and self.completions[0] < now - THROUGHPUT_WINDOW:
+            self.completions.popleft()
+
+    def as_dict(self) -> dict:
+        now = time.monotonic()
+        ordered = sorted(self.latencies)
+
+        def pct(q):
+            return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 3) if ordered else None
+        window = min(THROUGHPUT_WINDOW, now - self.started) or 1.0
+        recent = sum(1 for t in self.completions if t >= now - THROUGHPUT_WINDOW)
+        return {
+            "uptime_s": round(now - self.started, 3),
+            **self.counts,
+            "throughput_per_s": round(recent / window, 3),
+            "latency_ms": {"p50": pct(0.5), "p90": pct(0.9), "p99": pct(0.99),
+                           "max": round(ordered[-1] * 1000, 3) if ordered else None},
+        }
+
+
+class ComputeService:
+    def __init__(self, workers=None, max_queue=64, timeout=60.0, max_timeout=600.0):
+        self.pool = WorkerPool(workers, preload=("compute",))
+        self.max_queue = max_queue
+        self.timeout = timeout              # default per request, and the limit of a shared job
+        self.max_timeout = max_timeout
+        self.metrics = Metrics()
+        self._inflight = {}                 # cache key -> (job, future) shared by identical requests
+        self._futures = {}                  # job id -> future
+        self._wake = None
+        self._poller = None
+
+    def start(self):
+        self.pool.start()
+        self._wake = asyncio.Event()
+        self._poller = asyncio.get_running_loop().create_task(self._poll())
+
+    async def stop(self):
+        if self._poller is not None:
+            self._poller.cancel()
+        self.pool.shutdown()
+
+    async def _poll(self):
+        # the pool is only touched from the event loop thread, so it needs no locking
+        while True:
+            if not self.pool.active():
+                self._wake.clear()
+                await self._wake.wait()
+            for job in self.pool.poll():
+                self._job_done(job)
+            await asyncio.sleep(POLL_S)
+
+    def _job_done(self, job):
+        PROFILER.merge(job.extras.get("profile"))
+        future = self._futures.pop(job.id)
+        self._inflight.pop(job.tag, None)
+        if job.status == DONE:
+            RESULT_CACHE.put(job.tag, job.result)
+            future.set_result(job.result)
+        else:
+            future.set_exception(JobFailed(job.error or job.status, timed_out=job.status == TIMEOUT))
+        future.exception()      # retrieved even when every waiter has given up
+
+    async def compute(self, op: str, expr: str, args=(), timeout=None):
+        """Result string of one operation; raises Overloaded, JobFailed or asyncio.TimeoutError."""
+        if op not in OPERATIONS:
+            raise ValueError(f"Unknown operation: {op!r}")
+        if not isinstance(expr, str) or not expr.strip():
+            raise ValueError("Missing expression.")
+        key = make_key(op, expr, tuple(args))
+        found, value = RESULT_CACHE.get(key)
+        if found:
+            self.metrics.count("cache_hits")
+            return value
+        timeout = min(timeout or self.timeout, self.max_timeout)
+        if key in self._inflight:
+            job, future = self._inflight[key]
+            job.timeout = max(job.timeout, timeout)     # the job runs as long as its most patient waiter
+            self.metrics.count("deduplicated")
+        else:
+            if self.pool.active() >= self.max_queue:
+                raise Overloaded(f"{self.pool.active()} jobs queued or running; try again later.")
+            job = self.pool.submit("profiling:run_operation", (False, op, expr) + tuple(args),
+                                   timeout=timeout, tag=key, affinity=normalize_expr(expr))
+            future = asyncio.get_running_loop().create_future()
+            self._inflight[key] = (job, future)
+            self._futures[job.id] = future
+            self.metrics.count("jobs")
+            self._wake.set()
+        # a waiter that gives up does not cancel the job other requests may share
+        return await asyncio.wait_for(asyncio.shield(future), timeout)
+
+    # ---------- HTTP ----------
+    async def handle_request(self, method: str, path: str, body: bytes):
+        route = urlsplit(path).path
+        if route == "/health" and method == "GET":
+            return 200, {"status": "ok", "workers": self.pool.size}
+        if route == "/operations" and method == "GET":
+            return 200, {"operations": list(OPERATIONS)}
+        if route == "/metrics" and method == "GET":
+            return 200, {**self.metrics.as_dict(), "queued": len(self.pool.pending()),
+                         "running": len(self.pool.running()), "workers": self.pool.size,
+                         "operations": PROFILER.summary()}
+        if route != "/compute":
+            return 404, {"status": "error", "error": f"No route {route}"}
+        if method != "POST":
+            return 405, {"status": "error", "error": "Use POST"}
+        self.metrics.count("requests")
+        start = time.monotonic()
+        try:
+            req = json.loads(body or b"{}")
+            args = req.get("args", [])
+            if not isinstance(args, list):
+                args = [args]
+            timeout = req.get("timeout")
+            result = await self.compute(req.get("op"), req.get("expr"), args,
+                                        float(timeout) if timeout is not None else None)
+        except (ValueError, TypeError, AttributeError) as e:    # bad JSON or fields
+            self.metrics.count("errors")
+            return 400, {"status": "error", "error": str(e)}
+        except Overloaded as e:
+            self.metrics.count("rejected")
+            return 503, {"status": "rejected", "error": str(e)}
+        except (asyncio.TimeoutError, JobFailed) as e:
+            timed_out = isinstance(e, asyncio.TimeoutError) or e.timed_out
+            self.metrics.count("timeouts" if timed_out else "errors")
+            self.metrics.finished(time.monotonic() - start)
+            if timed_out:
+                return 504, {"status": "timeout", "error": str(e) or "Timed out."}
+            return 422, {"status": "error", "error": str(e)}
+        seconds = time.monotonic() - start
+        self.metrics.count("ok")
+        self.metrics.finished(seconds)
+        return 200, {"status": "ok", "result": result, "seconds": round(seconds, 6)}
+
+    async def serve_connection(self, reader, writer):
+        """HTTP/1.1 with keep-alive; one request at a time per connection."""
+        try:
+            while True:
+                line = await reader.readline()
+                if not line.strip():
+                    break
+                try:
+                    method, path, version = line.decode("latin-1").split()
+                except ValueError:
+                    await _respond(writer, 400, {"status": "error", "error": "Bad request line"}, False)
+                    break
+                headers = {}
+                while True:
+                    h = await reader.readline()
+                    if h in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = h.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                length = int(headers.get("content-length", 0) or 0)
+                if length > MAX_BODY:
+                    await _respond(writer, 413, {"status": "error", "error": "Request too large"}, False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+                status, payload = await self.handle_request(method.upper(), path, body)
+                await _respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large",
+            422: "Unprocessable Entity", 503: "Service Unavailable", 504: "Gateway Timeout"}
+
+
+async def _respond(writer, status: int, payload: dict, keep_alive: bool):
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    head = [f"HTTP/1.1 {status} {_REASONS.get(status, '')}", "Content-Type: application/json; charset=utf-8",
+            f"Content-Length: {len(body)}", f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+    if status == 503:
+        head.append("Retry-After: 1")
+    writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+    await writer.drain()
+
+
+async def serve(host="127.0.0.1", port=8765, unix=None, **options):
+    service = ComputeService(**options)
+    service.start()
+    if unix:
+        server = await asyncio.start_unix_server(service.serve_connection, unix)
+    else:
+        server = await asyncio.start_server(service.serve_connection, host, port)
+    where = unix or ", ".join(f"{s.getsockname()[0]}:{s.getsockname()[1]}" for s in server.sockets)
+    print(f"service: listening on {where} with {service.pool.size} workers", file=sys.stderr)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.stop()
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Serve the calculator's operations over HTTP.")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--unix", default=None, help="serve on this Unix socket path instead of TCP")
+    ap.add_argument("-j", "--workers", type=int, default=None, help="worker processes")
+    ap.add_argument("--max-queue", type=int, default=64, help="jobs queued or running before requests are refused")
+    ap.add_argument("-t", "--timeout", type=float, default=60.0, help="default per-request timeout in seconds")
+    ap.add_argument("--max-timeout", type=float, default=600.0, help="largest timeout a request may ask for")
+    args = ap.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.unix, workers=args.workers, max_queue=args.max_queue,
+                          timeout=args.timeout, max_timeout=args.max_timeout))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,168 @@
+"""
+session.py
+Parse-once expression objects shared by every operation on the same entry
+
+expression("x**3 - 3*x - 6") returns the same Expression for the same text
+(whitespace ignored) while it stays in the session table. The parsed tree is
+built once; the derivative, compiled callables, simplified form, Poly
+representation and plot samples are computed on first use and kept.
+"""
+
+import threading
+from collections import OrderedDict
+from functools import cached_property
+
+import numpy as np
+import sympy as sp
+
+import autodiff
+import calc_parser
+import newton
+import polyfast
+import sampling
+from cache import normalize_expr
+from profiling import stage
+
+x = sp.symbols('x')
+
+
+def parse(expr_str: str):
+    with stage("parse"):
+        return calc_parser.parse(expr_str)
+
+
+class Expression:
+    def __init__(self, text: str, var=x):
+        self.text = text
+        self.var = var
+        self.expr = parse(text)
+        self._derivative_samples = {}
+
+    def __repr__(self):
+        return f"Expression({self.text!r})"
+
+    @cached_property
+    def poly(self):
+        """Poly in var, or None if the entry is not a polynomial with numeric coefficients."""
+        return polyfast.as_poly(self.expr, self.var)
+
+    @cached_property
+    def rational(self):
+        """(numerator, denominator) Polys, or None if the entry is not a rational function."""
+        return polyfast.as_rational(self.expr, self.var)
+
+    @cached_property
+    def derivative(self):
+        d = polyfast.poly_diff(self.expr, self.var)
+        return sp.diff(self.expr, self.var) if d is None else d
+
+    @cached_property
+    def simplified(self):
+        return sp.simplify(self.expr)
+
+    @cached_property
+    def compiled(self):
+        """(f, f') as float callables for Newton iteration."""
+        return newton.compile_newton(self.expr, self.var, self.derivative)
+
+    @cached_property
+    def vectorized(self):
+        """f as a NumPy callable (may return a scalar for constant expressions).
+
+        NumPy has no ufunc for some functions (gamma, zeta, ...): lambdify's code then
+        raises TypeError on arrays, and f is evaluated point by point with mpmath instead.
+        """
+        return _array_callable(sp.lambdify(self.var, self.expr, "numpy"),
+                               sp.lambdify(self.var, self.expr, "mpmath"))
+
+    @cached_property
+    def compiled_array(self):
+        """(f, f') as NumPy callables for vectorized evaluation."""
+        return newton.compile_newton_array(self.expr, self.var, self.derivative)
+
+    @cached_property
+    def taylor(self):
+        """f as a Taylor-arithmetic tape: derivatives of any order without symbolic differentiation."""
+        return autodiff.compile_taylor(self.expr, self.var)
+
+    @cached_property
+    def compiled_mp(self):
+        """(f, f') as mpmath callables for high-precision refinement."""
+        return newton.compile_newton_mp(self.expr, self.var, self.derivative)
+
+    @cached_property
+    def newton_map(self):
+        """x - f/f' as built; not simplified, since that can stall the interactive session."""
+        return self.var - self.expr / self.derivative
+
+    @cached_property
+    def compiled_map(self):
+        """The Newton map as a float callable."""
+        return newton.compile_map(self.newton_map, self.var)
+
+    @cached_property
+    def samples(self):
+        """Plot samples computed so far, reused when the view pans or zooms."""
+        return sampling.SampleCache(self.vectorized)
+
+    def derivative_samples(self, order: int):
+        """Plot samples of the order-th derivative, evaluated by automatic differentiation."""
+        if order not in self._derivative_samples:
+            self._derivative_samples[order] = sampling.SampleCache(lambda xs: self.taylor(xs, order)[order])
+        return self._derivative_samples[order]
+
+
+def _array_callable(f_np, f_mp):
+    pointwise = False
+
+    def value(t):
+        try:
+            return complex(f_mp(float(t)))
+        except (ValueError, TypeError, ZeroDivisionError, OverflowError):     # poles, unevaluated values
+            return complex("nan")
+
+    def f(xs):
+        nonlocal pointwise
+        if not pointwise:
+            try:
+                return f_np(xs)
+            except TypeError:
+                pointwise = True
+        return np.vectorize(value, otypes=[complex])(xs)
+    return f
+
+
+class Session:
+    def __init__(self, max_entries=64):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, text: str, var=x) -> Expression:
+        """The Expression for this entry text, parsed on first request."""
+        key = (normalize_expr(text), var)
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                return self._data[key]
+        e = Expression(text, var)      # parse errors propagate and nothing is stored
+        with self._lock:
+            e = self._data.setdefault(key, e)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+        return e
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+SESSION = Session()
+
+
+def expression(text: str, var=x) -> Expression:
+    return SESSION.get(text, var)
@@ -0,0 +1,165 @@
+"""
+simplify_budget.py
+Time-budgeted simplify: cheap rewrite passes first, full sp.simplify last,
+returning the smallest form (by count_ops) found before the budget runs out
+"""
+
+import os
+import pickle
+import select
+import signal
+import struct
+import threading
+import time
+from typing import NamedTuple
+
+import sympy as sp
+
+# cheapest first; each pass is applied to the best form found so far
+PASSES = [
+    ("cancel", sp.cancel),
+    ("together", sp.together),
+    ("expand", sp.expand),
+    ("factor_terms", sp.factor_terms),
+    ("radsimp", sp.radsimp),
+    ("powsimp", sp.powsimp),
+    ("trigsimp", sp.trigsimp),
+    ("factor", sp.factor),
+    ("simplify", sp.simplify),
+]
+
+
+class PassReport(NamedTuple):
+    name: str
+    seconds: float
+    status: str         # "improved", "no gain", "error" or "timed out"
+    ops: int            # count_ops of the pass result (-1 if none)
+
+
+class SimplifyResult(NamedTuple):
+    expr: object
+    passes: list
+    budget_exhausted: bool
+
+
+# ---------- Deadline enforcement ----------
+def _read_frames(fd, buf: bytearray, out: list):
+    chunk = os.read(fd, 1 << 16)
+    buf += chunk
+    while len(buf) >= 4:
+        size = struct.unpack("!I", buf[:4])[0]
+        if len(buf) < 4 + size:
+            break
+        out.append(pickle.loads(bytes(buf[4:4 + size])))
+        del buf[:4 + size]
+    return bool(chunk)
+
+
+def run_streaming(work, seconds):
+    """Run work(send) until it returns or the deadline passes: (messages sent, timed_out).
+
+    work runs in a forked child that is killed at the deadline, so overrunning
+    SymPy code stops using the CPU; each send(obj) reaches the caller pickled.
+    Where os.fork is missing (Windows) work runs in a daemon thread instead,
+    which is only abandoned at the deadline and finishes in the background.
+    """
+    if not hasattr(os, "fork"):
+        return _stream_in_thread(work, seconds)
+    deadline = time.monotonic() + seconds
+    r, w = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        try:
+            os.close(r)
+
+            def send(obj):
+                data = pickle.dumps(obj)
+                view = memoryview(struct.pack("!I", len(data)) + data)
+                while view:
+                    view = view[os.write(w, view):]
+            work(send)
+        finally:
+            os._exit(0)
+    os.close(w)
+    messages, buf = [], bytearray()
+    try:
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not select.select([r], [], [], remaining)[0]:
+                return messages, True
+            if not _read_frames(r, buf, messages):
+                return messages, False
+    finally:
+        os.close(r)
+        os.kill(pid, signal.SIGKILL)
+        os.waitpid(pid, 0)
+
+
+def _stream_in_thread(work, seconds):
+    messages = []
+    t = threading.Thread(target=work, args=(messages.append,), daemon=True)
+    t.start()
+    t.join(seconds)
+    return list(messages), t.is_alive()
+
+
+def run_with_deadline(fn, arg, seconds):
+    """(fn(arg), None), or (None, "timed out" / "error"); an overrunning call is killed."""
+    def work(send):
+        try:
+            send((True, fn(arg)))
+        except Exception:
+            send((False, None))
+
+    messages, timed_out = run_streaming(work, seconds)
+    if timed_out:
+        return None, "timed out"
+    if not messages or not messages[0][0]:
+        return None, "error"        # raised, or the child died before replying
+    return messages[0][1], None
+
+
+# ---------- Tiered simplify ----------
+def _run_passes(expr, passes, send):
+    # the whole pass sequence runs in one child; every pass reports as soon as it ends
+    best, best_ops = expr, sp.count_ops(expr)
+    for name, fn in passes:
+        start = time.perf_counter()
+        try:
+            value = fn(best)
+            ops = sp.count_ops(value)
+        except Exception:
+            send((PassReport(name, time.perf_counter() - start, "error", -1), None))
+            continue
+        seconds = time.perf_counter() - start
+        if ops < best_ops:
+            best, best_ops = value, ops
+            send((PassReport(name, seconds, "improved", ops), value))
+        else:
+            send((PassReport(name, seconds, "no gain", ops), None))
+
+
+def tiered_simplify(expr, budget=2.0, passes=None) -> SimplifyResult:
+    expr = sp.sympify(expr)
+    passes = passes or PASSES
+    start = time.perf_counter()
+    messages, timed_out = run_streaming(lambda send: _run_passes(expr, passes, send), budget)
+    best, reports = expr, []
+    for report, value in messages:
+        reports.append(report)
+        if value is not None:
+            best = value
+    # every pass may have reported just before the deadline, with only the child's exit cut off
+    timed_out = timed_out and len(reports) < len(passes)
+    if timed_out:
+        spent = sum(p.seconds for p in reports)
+        reports.append(PassReport(passes[len(reports)][0], time.perf_counter() - start - spent, "timed out", -1))
+    return SimplifyResult(best, reports, timed_out)
+
+
+def format_passes(res: SimplifyResult) -> str:
+    lines = [f"  {p.name:<13}{p.seconds * 1000:9.1f} ms  {p.status}" + (f" (ops={p.ops})" if p.ops >= 0 else "")
+             for p in res.passes]
+    if res.budget_exhausted:
+        lines.append("  (time budget reached; best form so far shown)")
+    return "\n".join(lines)
@@ -0,0 +1,142 @@
+"""
+store.py
+Optional persistent result store (SQLite) shared across sessions and processes
+
+Enable it with enable_store(), or by setting CCALC_RESULT_STORE to a file path
+(or to "1" for the default location in the user's cache directory).
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+DEFAULT_MAX_ENTRIES = 20000
+PRUNE_EVERY = 64       # writes between size checks
+
+
+def default_path() -> str:
+    if os.name == "nt":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "c_calc", "results.sqlite3")
+
+
+def canonical_expr(expr_str: str) -> str:
+    # srepr of the parsed tree, so "x*2" and "2*x" share an entry
+    import sympy as sp
+    import calc_parser
+    try:
+        sides = [sp.srepr(calc_parser.parse(part)) for part in str(expr_str).split("=")]
+    except Exception:
+        return "".join(str(expr_str).split())
+    return "=".join(sides)
+
+
+def store_key(operation: str, expr_str: str, args=(), kwargs=None) -> str:
+    import sympy as sp
+    extra = [canonical_expr(a) if isinstance(a, str) else repr(a) for a in args]
+    if kwargs:
+        extra += [f"{k}={v!r}" for k, v in sorted(kwargs.items())]
+    raw = "\x1f".join([sp.__version__, operation, canonical_expr(expr_str)] + extra)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ResultStore:
+    def __init__(self, path=None, max_entries=DEFAULT_MAX_ENTRIES):
+        self.path = path or default_path()
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._writes = 0
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        conn = self._conn()
+        with conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS results ("
+                         "key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL)")
+            conn.execute("CREATE INDEX IF NOT EXISTS results_created ON results(created)")
+        self.prune()
+
+    def _conn(self):
+        # one connection per thread and per process (never reuse one across fork)
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, key: str):
+        """Return (found, value); database errors count as a miss."""
+        try:
+            row = self._conn().execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+        except sqlite3.Error:
+            return False, None
+        return (True, row[0]) if row else (False, None)
+
+    def put(self, key: str, value: str):
+        try:
+            conn = self._conn()
+            with conn:
+                conn.execute("INSERT OR REPLACE INTO results (key, value, created) VALUES (?, ?, ?)",
+                             (key, value, time.time()))
+            self._writes += 1
+            if self._writes % PRUNE_EVERY == 0:
+                self.prune()
+        except sqlite3.Error:
+            pass
+
+    def prune(self):
+        """Delete the oldest entries beyond max_entries."""
+        try:
+            conn = self._conn()
+            with conn:
+                (count,) = conn.execute("SELECT COUNT(*) FROM results").fetchone()
+                if count > self.max_entries:
+                    conn.execute("DELETE FROM results WHERE key IN "
+                                 "(SELECT key FROM results ORDER BY created LIMIT ?)",
+                                 (count - self.max_entries,))
+        except sqlite3.Error:
+            pass
+
+    def clear(self):
+        conn = self._conn()
+        with conn:
+            conn.execute("DELETE FROM results")
+
+    def stats(self) -> dict:
+        (count,) = self._conn().execute("SELECT COUNT(*) FROM results").fetchone()
+        return {"path": self.path, "entries": count, "max_entries": self.max_entries}
+
+
+RESULT_STORE = None
+
+
+def enable_store(path=None, max_entries=DEFAULT_MAX_ENTRIES) -> ResultStore:
+    global RESULT_STORE
+    RESULT_STORE = ResultStore(path, max_entries)
+    return RESULT_STORE
+
+
+def disable_store():
+    global RESULT_STORE
+    RESULT_STORE = None
+
+
+def apply_setting(setting: str):
+    """Enable or disable the store from a CCALC_RESULT_STORE value ("" or "0" turns it off).
+
+    Worker processes read the variable when they start; the GUI also broadcasts
+    this to running workers when the user toggles the store.
+    """
+    setting = (setting or "").strip()
+    if setting and setting.lower() not in ("0", "off", "no", "false"):
+        enable_store(None if setting.lower() in ("1", "on", "yes", "true") else setting)
+    else:
+        disable_store()
+
+
+apply_setting(os.environ.get("CCALC_RESULT_STORE", ""))
@@ -0,0 +1,211 @@
+"""
+systems.py
+Damped Newton for systems of equations in several variables
+
+    x^2 + y^2 = 4; x*y = 1
+
+The residual F and Jacobian J are built symbolically once per system and
+compiled to NumPy; every starting point of a multi-start run is iterated
+at the same time, with one batched linear solve per iteration.
+"""
+
+from functools import lru_cache
+from typing import NamedTuple
+
+import numpy as np
+import sympy as sp
+
+import calc_parser
+import newton
+
+MAX_ITER = 50
+MAX_HALVINGS = 12         # backtracking steps of the line search
+SUFFICIENT_DECREASE = 1e-4
+
+CONVERGED, SINGULAR, DOMAIN, STALLED, DIVERGED, MAX_ITERATIONS = (
+    "converged", "singular Jacobian", "left the domain", "stalled", "diverged", "iteration limit")
+
+
+class SystemResult(NamedTuple):
+    variables: tuple
+    points: np.ndarray      # (starts, variables): last iterate of each start
+    status: list            # per start: one of the status strings above
+    iterations: np.ndarray
+    residual: np.ndarray    # |F| at the last iterate
+
+
+# ---------- Parsing and compilation ----------
+def parse_system(text: str):
+    """(equations as expressions equal to zero, variables sorted by name).
+
+    Equations are separated by ';' or new lines; 'lhs = rhs' means lhs - rhs.
+    """
+    eqs = []
+    for part in filter(None, (p.strip() for p in text.replace("\n", ";").split(";"))):
+        if "=" in part:
+            left, right = part.split("=", 1)
+            eqs.append(calc_parser.parse(left) - calc_parser.parse(right))
+        else:
+            eqs.append(calc_parser.parse(part))
+    if not eqs:
+        raise ValueError("Enter the equations separated by ';'.")
+    for e in eqs:
+        # I, or a constant such as (-2)**(1/3), would make F complex
+        bad = next((t for t in sp.preorder_traversal(e) if not t.free_symbols and t.is_extended_real is False), None)
+        if bad is not None:
+            raise ValueError(f"Newton for systems needs real equations, got the constant {bad}.")
+    variables = tuple(sorted(set().union(*(e.free_symbols for e in eqs)), key=lambda s: s.name))
+    if len(eqs) != len(variables):
+        names = ", ".join(v.name for v in variables)
+        raise ValueError(f"{len(eqs)} equation(s) in {len(variables)} unknown(s) ({names}); "
+                         "Newton needs as many equations as unknowns.")
+    return tuple(eqs), variables
+
+
+@lru_cache(maxsize=64)
+def compile_system(eqs: tuple, variables: tuple):
+    """(F, J) as NumPy callables of one array per variable, built once per system."""
+    jac = sp.Matrix(eqs).jacobian(variables)
+    F = sp.lambdify(variables, list(eqs), "numpy", cse=True)
+    J = sp.lambdify(variables, list(jac), "numpy", cse=True)
+    return F, J
+
+
+def _real_column(c, shape):
+    # complex values (a power of a negative number) are outside the real domain: NaN
+    c = np.asarray(c)
+    if np.iscomplexobj(c):
+        c = np.where(c.imag == 0, c.real, np.nan)
+    return np.broadcast_to(np.asarray(c, dtype=float), shape)
+
+
+def _residual(F, X):
+    # (starts, n) values of F at the rows of X
+    cols = F(*X.T)
+    return np.stack([_real_column(c, X.shape[:1]) for c in cols], axis=-1)
+
+
+def _jacobian(J, X):
+    n = X.shape[1]
+    cols = J(*X.T)
+    flat = np.stack([_real_column(c, X.shape[:1]) for c in cols], axis=-1)
+    return flat.reshape(-1, n, n)
+
+
+# ---------- Iteration ----------
+def newton_system(eqs, variables, starts, tol=1e-12, ftol=1e-14, max_iter=MAX_ITER) -> SystemResult:
+    """Damped Newton from every row of `starts` at once.
+
+    Each step solves J dx = -F and backtracks (halving) until |F| decreases
+    enough; starts that finish drop out of the batch.
+    """
+    F, J = compile_system(tuple(eqs), tuple(variables))
+    X = np.array(starts, dtype=float).reshape(-1, len(variables))
+    count = X.shape[0]
+    status = np.full(count, MAX_ITERATIONS, dtype=object)
+    iterations = np.full(count, max_iter)
+    residual = np.full(count, np.nan)
+    active = np.arange(count)
+    with np.errstate(all="ignore"):
+        Fx = _residual(F, X)
+        norm = np.linalg.norm(Fx, axis=1)
+        for it in range(1, max_iter + 1):
+            if active.size == 0:
+                break
+            x, fx, nx = X[active], Fx[active], norm[active]
+            jac = _jacobian(J, x)
+            # NaN in F or J: the start is outside the domain (sqrt or log of a negative value)
+            inside = np.all(np.isfinite(jac), axis=(1, 2)) & np.isfinite(nx)
+            ok = inside.copy()
+            # a (near) singular Jacobian ends that start instead of raising for the whole batch
+            ok[ok] = np.abs(np.linalg.det(jac[ok])) > 1e-300
+            step = np.zeros_like(x)
+            if ok.any():
+                step[ok] = np.linalg.solve(jac[ok], -fx[ok][..., None])[..., 0]
+            ok &= np.all(np.isfinite(step), axis=1)
+            # backtracking line search on |F|, all starts in step
+            t = np.where(ok, 1.0, 0.0)
+            new_x, new_f = x.copy(), fx.copy()
+            new_n = np.full(x.shape[0], np.inf)
+            todo = ok.copy()
+            for _ in range(MAX_HALVINGS):
+                if not todo.any():
+                    break
+                cand = x[todo] + t[todo, None] * step[todo]
+                fc = _residual(F, cand)
+                nc = np.linalg.norm(fc, axis=1)
+                good = np.isfinite(nc) & (nc <= (1 - SUFFICIENT_DECREASE * t[todo]) * nx[todo])
+                idx = np.flatnonzero(todo)
+                new_x[idx[good]], new_f[idx[good]], new_n[idx[good]] = cand[good], fc[good], nc[good]
+                todo[idx[good]] = False
+                t[idx[~good]] /= 2
+            moved = ok & np.isfinite(new_n)
+            X[active[moved]], Fx[active[moved]], norm[active[moved]] = new_x[moved], new_f[moved], new_n[moved]
+            size = np.linalg.norm(t[:, None] * step, axis=1)
+            scale = 1 + np.linalg.norm(X[active], axis=1)
+            done = moved & ((size <= tol * scale) | (norm[active] <= ftol))
+            ends = {CONVERGED: done, DOMAIN: ~inside, SINGULAR: inside & ~ok, STALLED: ok & ~moved}
+            finished = np.zeros(active.size, dtype=bool)
+            for name, mask in ends.items():
+                status[active[mask]] = name
+                finished |= mask
+            diverged = ~finished & ~np.all(np.isfinite(X[active]), axis=1)
+            status[active[diverged]] = DIVERGED
+            finished |= diverged
+            iterations[active[finished]] = it
+            active = active[~finished]
+        residual[:] = norm
+    # a stalled search (or a singular Jacobian) already on a root (|F| at rounding level) has converged
+    scale = 1 + np.linalg.norm(X, axis=1)
+    status[((status == STALLED) | (status == SINGULAR)) & (residual <= 1e-10 * scale)] = CONVERGED
+    return SystemResult(tuple(variables), X, list(status), iterations, residual)
+
+
+def cluster_points(points, tol=1e-8):
+    """Distinct rows of points (within tol), with how many rows fell on each."""
+    distinct, hits = np.empty((0, points.shape[1] if np.ndim(points) == 2 else 0)), []
+    for p in points:
+        near = np.flatnonzero(np.all(np.abs(distinct - p) <= tol * (1 + np.abs(p)), axis=1))
+        if near.size:
+            hits[near[0]] += 1
+        else:
+            distinct = np.vstack((distinct, p))
+            hits.append(1)
+    order = np.lexsort(distinct.T[::-1]) if len(distinct) else []
+    return [distinct[i] for i in order], [hits[i] for i in order]
+
+
+def start_box(lo, hi, dims: int, count=200, seed=0) -> np.ndarray:
+    """count starting points spread over the box [lo, hi]^dims (reproducible)."""
+    lo, hi = newton.to_float(lo), newton.to_float(hi)
+    return np.random.default_rng(seed).uniform(lo, hi, size=(int(count), dims))
+
+
+def parse_point(text: str, dims: int) -> np.ndarray:
+    values = [newton.to_float(v) for v in str(text).replace(";", ",").split(",") if v.strip()]
+    if len(values) == 1:
+        values *= dims
+    if len(values) != dims:
+        raise ValueError(f"Enter {dims} starting values separated by commas.")
+    return np.array(values)
+
+
+# ---------- Output ----------
+def _point_text(variables, p) -> str:
+    return ", ".join(f"{v} = {c:.12g}" for v, c in zip(variables, p))
+
+
+def format_system(res: SystemResult) -> str:
+    lines = []
+    for p, st, it, r in zip(res.points, res.status, res.iterations, res.residual):
+        lines.append(f"{_point_text(res.variables, p)}  ({st} after {it} iterations, |F| = {r:.3g})")
+    return "\n".join(lines)
+
+
+def format_multistart(res: SystemResult) -> str:
+    ok = np.array([s == CONVERGED for s in res.status], dtype=bool)
+    distinct, hits = cluster_points(res.points[ok], 1e-7)
+    lines = [f"{_point_text(res.variables, p)}  (reached from {h} starts)" for p, h in zip(distinct, hits)]
+    counts = {s: res.status.count(s) for s in (CONVERGED, SINGULAR, DOMAIN, STALLED, DIVERGED, MAX_ITERATIONS)}
+    lines.append(", ".join(f"{n} {s}" for s, n in counts.items() if n) + f"  ({len(res.status)} starts)")
+    return "\n".join(lines)
@@ -0,0 +1,84 @@
+import math
+
+import numpy as np
+import pytest
+import sympy as sp
+
+import autodiff
+import newton
+
+x = sp.symbols("x")
+
+
+@pytest.mark.parametrize("text", ["sin(x)*exp(x)", "log(1 + x**2)/(x + 3)", "x**x", "sqrt(x)*atan(x)", "tan(x) - cosh(x)"])
+def test_matches_symbolic_derivatives(text):
+    e = sp.sympify(text)
+    x0, order = 0.7, 5
+    values = autodiff.compile_taylor(e)(x0, order)
+    for k in range(order + 1):
+        exact = float(sp.diff(e, x, k).subs(x, x0))
+        assert abs(values[k] - exact) <= 1e-9 * (1 + abs(exact))
+
+
+def test_array_points():
+    xs = np.linspace(-1, 1, 7)
+    d = autodiff.compile_taylor(sp.sin(x))(xs, 2)
+    assert d.shape == (3, 7)
+    assert np.allclose(d[1], np.cos(xs)) and np.allclose(d[2], -np.sin(xs))
+
+
+def test_constants_and_high_order():
+    assert np.all(autodiff.compile_taylor(sp.Integer(4))(1.0, 3) == [4, 0, 0, 0])
+    d = autodiff.compile_taylor(sp.exp(2 * x))(0.0, 20)
+    assert abs(d[20] - 2.0**20) <= 1e-9 * 2.0**20
+
+
+def test_newton_pair_and_halley_derivatives():
+    tape = autodiff.compile_taylor(x**3 - 2)
+    f, fp = autodiff.newton_pair(tape)
+    assert f(2.0) == 6.0 and fp(2.0) == 12.0
+    assert autodiff.derivatives_function(tape)(1.0) == (-1.0, 3.0, 6.0)
+
+
+@pytest.mark.parametrize("e, message", [
+    (sp.sin(x) + sp.Symbol("y"), "found y"),
+    (x + sp.I, "real constants"),
+    (x**sp.I, "real constants"),
+    (sp.gamma(x), "not supported"),
+])
+def test_unsupported(e, message):
+    with pytest.raises(ValueError, match=message):
+        autodiff.Tape(e)
+
+
+def test_order_limit():
+    with pytest.raises(ValueError):
+        autodiff.compile_taylor(x)(0.0, autodiff.MAX_ORDER + 1)
+
+
+def test_format_derivatives():
+    text = autodiff.format_derivatives(1.0, [math.e, math.e])
+    assert "f'" in text
+
+
+def test_halley_converges_cubically():
+    res = newton.halley_iterate(autodiff.derivatives_function(autodiff.compile_taylor(x**3 - 2*x - 5)), 2.0)
+    assert res.converged and res.iterations <= 4
+    assert abs(res.root - 2.0945514815423265) < 1e-14
+
+
+@pytest.mark.parametrize("e, x0", [(x**3 - 3*x, 1.0), (x**2 + 1, 0.0)])
+def test_halley_zero_derivative_is_not_convergence(e, x0):
+    # the Halley step is 0 where f' = 0, although f is not
+    with pytest.raises(ZeroDivisionError):
+        newton.halley_iterate(autodiff.derivatives_function(autodiff.compile_taylor(e)), x0)
+
+
+def test_halley_outside_the_domain():
+    derivs = autodiff.derivatives_function(autodiff.compile_taylor(sp.log(x) - 1))
+    assert not newton.halley_iterate(derivs, -1.0).converged
+
+    def raises(t):
+        raise ValueError("math domain error")
+    res = newton.halley_iterate(raises, 1.0)
+    assert not res.converged and math.isnan(res.residual)
@@ -0,0 +1,38 @@
+import pytest
+
+import batch
+
+
+def test_json_line():
+    item = batch.parse_line('{"op": "limit", "expr": "sin(x)/x", "args": ["0"], "id": "q1"}')
+    assert item == {"op": "limit", "expr": "sin(x)/x", "args": ["0"], "id": "q1"}
+
+
+def test_tab_separated_lines():
+    assert batch.parse_line("newton\tx^2-2\t1") == {"op": "newton", "expr": "x^2-2", "args": ["1"]}
+    assert batch.parse_line("x^2-2\t1", default_op="newton")["args"] == ["1"]
+
+
+def test_scalar_args_become_a_list():
+    assert batch.parse_line('{"op": "newton", "expr": "x", "args": 1}')["args"] == [1]
+
+
+def test_default_op_fills_json():
+    assert batch.parse_line('{"expr": "x"}', default_op="factor")["op"] == "factor"
+
+
+@pytest.mark.parametrize("line", [
+    "{not json",
+    '{"op": "rm", "expr": "x"}',
+    '{"op": "factor", "expr": "   "}',
+    '{"op": "factor", "expr": 5}',
+    "just-one-field",
+])
+def test_rejected_lines(line):
+    with pytest.raises(ValueError):
+        batch.parse_line(line)
+
+
+def test_operations_mirror_compute():
+    import compute
+    assert set(batch.OPERATIONS) == set(compute.OPERATIONS)
@@ -0,0 +1,45 @@
+import json
+import os
+
+import benchmarks
+
+FILLER = {f"f{i}": 0.050 for i in range(5)}     # cases that did not change
+
+
+def suite(scale=1.0, **mins):
+    times = dict({name: t * scale for name, t in FILLER.items()}, **mins)
+    return {"meta": {}, "results": {name: {"min": t, "median": t, "peak_kib": 10.0, "tier": "small"}
+                                    for name, t in times.items()}}
+
+
+def test_slower_cases_use_thresholds_and_min_delta():
+    base = suite(a=0.010, b=0.0005, c=0.100)
+    cur = suite(a=0.0140, b=0.0010, c=0.110)
+    # a: +40% and 4 ms; b: +100% but only 0.5 ms; c: +10%
+    assert benchmarks.slower_cases(cur, base) == ["a"]
+    assert benchmarks.slower_cases(cur, base, min_delta=0.005) == []
+    assert benchmarks.slower_cases(cur, base, threshold=0.05, min_delta=0.0001) == ["a", "b", "c"]
+
+
+def test_baseline_is_scaled_by_the_median_speed_ratio():
+    base = suite(a=0.010)
+    assert benchmarks.slower_cases(suite(2.0, a=0.020), base) == []      # a machine half as fast
+    assert benchmarks.slower_cases(suite(0.5, a=0.010), base) == ["a"]
+    # too few shared cases to estimate the machine speed: unscaled
+    small = {"meta": {}, "results": {"a": {"min": 0.010, "peak_kib": 1.0}}}
+    assert benchmarks.slower_cases({"results": {"a": {"min": 0.020, "peak_kib": 1.0}}}, small) == ["a"]
+
+
+def test_compare_reports_memory_growth():
+    base, cur = suite(a=0.010), suite(a=0.010)
+    base["results"]["a"]["peak_kib"], cur["results"]["a"]["peak_kib"] = 100.0, 200.0
+    assert benchmarks.compare(cur, base) == ["a: peak memory 100 -> 200 KiB"]
+
+
+def test_committed_baseline_covers_the_quick_tiers():
+    path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "bench_baseline.json")
+    with open(path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    names = {name for name, tier, _, _ in benchmarks.CORPUS if tier != "pathological"}
+    assert names <= set(baseline["results"])
+    assert all(r["min"] > 0 for r in baseline["results"].values())
@@ -0,0 +1,52 @@
+from cache import ResultCache, cached, make_key
+
+
+def test_lru_eviction_keeps_recently_used():
+    c = ResultCache(max_entries=3)
+    for k in "abc":
+        c.put(k, k.upper())
+    assert c.get("a") == (True, "A")        # a becomes the most recently used
+    c.put("d", "D")
+    assert c.get("b") == (False, None)      # b was the least recently used
+    assert [c.get(k)[0] for k in "acd"] == [True, True, True]
+    st = c.stats()
+    assert st["entries"] == 3 and st["evictions"] == 1
+    assert (st["hits"], st["misses"]) == (4, 1)
+
+
+def test_eviction_by_total_size():
+    c = ResultCache(max_entries=100, max_chars=10)
+    c.put("a", "x" * 6)
+    c.put("b", "y" * 3)
+    c.put("c", "z" * 4)                     # 13 chars: a goes
+    assert not c.get("a")[0] and c.get("b")[0] and c.get("c")[0]
+    assert c.stats()["chars"] == 7
+    c.put("huge", "w" * 11)                 # larger than the whole cache: not stored, nothing evicted
+    assert not c.get("huge")[0] and c.stats()["entries"] == 2
+
+
+def test_replacing_an_entry_updates_its_size():
+    c = ResultCache(max_entries=10, max_chars=10)
+    c.put("a", "x" * 8)
+    c.put("a", "x")
+    c.put("b", "y" * 8)
+    assert c.get("a") == (True, "x") and c.stats()["chars"] == 9
+    c.clear()
+    assert c.stats()["entries"] == 0 and c.stats()["chars"] == 0
+
+
+def test_cached_decorator_memoizes_by_normalized_key():
+    calls = []
+    c = ResultCache()
+
+    @cached("double", cache=c)
+    def double(expr_str, times=2):
+        calls.append(expr_str)
+        return expr_str * times
+
+    assert double("x + 1") == "x + 1x + 1"
+    assert double("x+1") == "x + 1x + 1"    # same request up to whitespace
+    assert double("x+1", 3) == "x+1" * 3     # other arguments, other entry
+    assert calls == ["x + 1", "x+1"]
+    assert make_key("double", "x + 1") in c._data
+    assert double.operation == "double"
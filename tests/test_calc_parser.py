@@ -0,0 +1,69 @@
+import pytest
+import sympy as sp
+
+import calc_parser
+from calc_parser import ParseError, parse
+
+x, y = sp.symbols("x y")
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("x^2", x**2),
+    ("x**2", x**2),
+    ("2x", 2 * x),
+    ("2(x+1)", 2 * x + 2),
+    ("(x+1)(x-1)", (x + 1) * (x - 1)),
+    ("x y", x * y),
+    ("2pi", 2 * sp.pi),
+    ("-x^2", -x**2),
+    ("2^3^2", 2**9),
+    ("3!", 6),
+    ("ln(x)", sp.log(x)),
+    ("abs(x)", sp.Abs(x)),
+    ("cosec(x)", sp.csc(x)),
+    ("arcsin(x)", sp.asin(x)),
+    (".5 + 1e-3", sp.Float("0.501")),
+])
+def test_grammar(text, expected):
+    assert parse(text) == expected
+
+
+def test_whitespace_and_caching_do_not_change_the_result():
+    calc_parser.clear_cache()
+    first = parse("sin(x) + cos(x) + (x + 1)^2")
+    assert parse("sin(x)+cos(x)+(x+1)^2") == first
+    assert parse("sin(x) + cos(x) + (x + 1)^2") is not None
+
+
+@pytest.mark.parametrize("text, pos", [("(x", 0), ("x=1", 1), ("x +* 2", 3)])
+def test_errors_have_positions(text, pos):
+    with pytest.raises(ParseError) as info:
+        parse(text)
+    assert info.value.pos == pos
+    assert info.value.caret().splitlines()[1] == " " * pos + "^"
+
+
+def test_no_evaluation_of_names():
+    # names are symbols, never Python objects
+    assert parse("__class__").is_Symbol
+    assert parse("import os") == sp.Symbol("import") * sp.Symbol("os")
+
+
+def test_huge_powers_stay_unevaluated():
+    e = parse("2^10^10")
+    assert isinstance(e, sp.Pow) and e.exp == 10**10
+
+
+def test_whitespace_that_separates_tokens_is_part_of_the_key():
+    import cache
+    import compute
+    import session
+    assert cache.normalize_expr(" x**2 + 1 ") == cache.normalize_expr("x**2+1")
+    for a, b in [("x y", "xy"), ("2 .5", "2.5"), ("x * * 2", "x ** 2")]:
+        assert cache.normalize_expr(a) != cache.normalize_expr(b)
+    assert session.expression("x y") is not session.expression("xy")
+    # both orders, so neither answer can come from the other's cache entry
+    assert compute.compute_differentiate("x y") == "y"
+    assert compute.compute_differentiate("xy") == "0"
+    assert compute.compute_differentiate("x y") == "y"
+    assert compute.compute_factor("xx") == "xx"
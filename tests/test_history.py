@@ -0,0 +1,41 @@
+import io
+
+from history import OutputHistory
+
+
+def test_capped_by_entry_count():
+    h = OutputHistory(max_entries=3)
+    entries = [h.append(f"r{i}", f"op {i}") for i in range(5)]
+    assert len(h) == 3 and h.dropped == 2
+    assert h.get(entries[0].id) is None and h.get(entries[4].id) is entries[4]
+
+
+def test_capped_by_size_but_keeps_the_newest():
+    h = OutputHistory(max_chars=100)
+    h.append("a" * 60)
+    h.append("b" * 60)
+    assert len(h) == 1 and h.dropped == 1
+    big = h.append("c" * 500)
+    assert len(h) == 1 and h.get(big.id) is big
+
+
+def test_preview_truncates_long_results():
+    h = OutputHistory(preview_chars=10)
+    entry = h.append("x" * 25, "Simplified")
+    text, hidden = h.preview(entry)
+    assert hidden == 15
+    assert text == "Simplified:\n" + "x" * 10 + " ...\n\n"
+    assert h.preview(h.append("short"))[1] == 0
+
+
+def test_write_keeps_full_text_and_notes_dropped_entries():
+    h = OutputHistory(max_entries=2, preview_chars=3)
+    h.append("first")
+    h.append("second result", "Heading")
+    h.append("status note")
+    out = io.StringIO()
+    h.write(out)
+    assert out.getvalue() == ("[1 earlier entries dropped from history]\n"
+                              "Heading:\nsecond result\n\nstatus note\n")
+    h.clear()
+    assert len(h) == 0 and list(h.iter_text()) == []
@@ -0,0 +1,45 @@
+import pytest
+import sympy as sp
+
+import limit
+
+x = sp.symbols("x")
+
+
+@pytest.mark.parametrize("text, point, expected, strategy", [
+    ("x**2 + 1", "2", 5, "substitution"),
+    ("(x**2 - 1)/(x - 1)", "1", 2, "rational"),
+    ("(3*x**2 + x)/(x**2 - 5)", "oo", 3, "rational"),
+    ("sin(x)/x", "0", 1, "numeric extrapolation"),
+    ("(1 + 1/x)**x", "oo", sp.E, "numeric extrapolation"),
+    ("5", "0", 5, "constant"),
+])
+def test_fast_strategies(text, point, expected, strategy):
+    value, used = limit.fast_limit(sp.sympify(text), sp.sympify(point))
+    assert value == expected and used == strategy
+
+
+def test_one_sided_poles_fall_back_to_gruntz():
+    value, used = limit.fast_limit(1 / x, sp.Integer(0))
+    assert value == sp.oo and used == "gruntz"
+
+
+def test_rational_at_infinity_signs():
+    assert limit.fast_limit(x**3 / (x - 1), -sp.oo)[0] == sp.oo
+    assert limit.fast_limit(-x**3 / (x - 1), sp.oo)[0] == -sp.oo
+
+
+@pytest.mark.parametrize("text, point, expected", [
+    ("sqrt(x)", "-1", sp.I),
+    ("log(x)", "-1", sp.I * sp.pi),
+    ("log(-x)", "1", sp.I * sp.pi),
+    ("x**(1/3)", "-8", 2 * (-1)**sp.Rational(1, 3)),
+])
+def test_non_real_values(text, point, expected):
+    value, _ = limit.fast_limit(sp.sympify(text), sp.sympify(point))
+    assert value == expected
+    assert value == sp.limit(sp.sympify(text), x, sp.sympify(point))
+
+
+def test_non_real_point():
+    assert limit.fast_limit((x**2 + 1) / (x - sp.I), sp.I)[0] == 2 * sp.I
@@ -0,0 +1,141 @@
+import math
+
+import pytest
+import sympy as sp
+
+import compute
+import newton
+
+x = sp.symbols("x")
+
+
+def test_converges_on_a_cubic():
+    res = newton.newton_solve(x**3 - 2*x - 5, 2)
+    assert res.converged and abs(res.root - 2.0945514815423265) < 1e-12
+
+
+@pytest.mark.parametrize("text, x0, root", [
+    ("gamma(x) - 2", 2.5, 3.0),         # polygamma is missing from math
+    ("Abs(x) - 1", 3, 1.0),             # the derivative stays unevaluated
+    ("exp(x) - 2", 0, math.log(2)),
+])
+def test_functions_outside_the_math_module(text, x0, root):
+    res = newton.newton_solve(sp.sympify(text), x0)
+    assert res.converged and abs(res.root - root) < 1e-9
+
+
+@pytest.mark.parametrize("text, x0", [("log(x)", -1), ("x**(1/3)", 1), ("sqrt(x) + 1", 4)])
+def test_leaving_the_domain_is_not_converged(text, x0):
+    res = newton.newton_solve(sp.sympify(text), x0)
+    assert not res.converged
+    assert "NOT converged" in newton.format_result(res)
+
+
+def test_zero_derivative_still_raises():
+    with pytest.raises(ZeroDivisionError):
+        newton.newton_solve(x**2 + 1, 0)
+
+
+def test_multistart_finds_every_root():
+    res = newton.newton_multistart(x**3 - x, newton.guess_grid(-2, 2, 101))
+    assert res.roots == pytest.approx([-1.0, 0.0, 1.0], abs=1e-12)
+
+
+def test_compute_operation_reports_no_convergence():
+    assert "NOT converged" in compute.compute_newton_raphson("log(x)", "-1")
+
+
+# ---------- Iteration trace ----------
+def _trace(text, x0, **kw):
+    from session import expression
+    e = expression(text)
+    return newton.newton_trace(e.compiled_map, *e.compiled, x0, **kw)
+
+
+def test_trace_estimates_quadratic_order():
+    rows = _trace("x^3 - 2x - 5", 2.0)
+    assert newton.trace_status(rows) == newton.TRACE_CONVERGED
+    orders = [r.order for r in rows if not math.isnan(r.order)]
+    assert orders and abs(orders[-1] - 2) < 0.1
+    assert abs(rows[-1].x + rows[-1].step - 2.0945514815423265) < 1e-12
+    # a double root converges only linearly
+    orders = [r.order for r in _trace("(x - 1)^2", 3.0) if not math.isnan(r.order)]
+    assert orders and abs(orders[-1] - 1) < 0.1
+
+
+def test_trace_keeps_rows_when_the_derivative_vanishes():
+    # x^3 - 3x from 2 is fine; from 1, f' = 0 at once: the row is kept instead of an exception
+    rows = _trace("x^3 - 3x", 1.0)
+    assert len(rows) == 1 and rows[0].fprime == 0 and rows[0].f == -2.0
+    assert newton.trace_status(rows) == newton.TRACE_ZERO_DERIVATIVE
+    # rows computed before the zero derivative survive too
+    f = lambda t: t * t - 4 * t + 5
+    fp = lambda t: 2 * t - 4
+    rows = newton.newton_trace(lambda t: t - f(t) / fp(t), f, fp, 3.0)
+    assert len(rows) == 2 and rows[0].x == 3.0 and rows[1].x == 2.0
+    assert newton.trace_status(rows) == newton.TRACE_ZERO_DERIVATIVE
+
+
+def test_trace_statuses():
+    assert newton.trace_status(_trace("log(x)", -1.0)) == newton.TRACE_DOMAIN
+    assert newton.trace_status(_trace("atan(x)", 0.5, max_iter=3)) == newton.TRACE_LIMIT
+    assert newton.trace_status(_trace("x^2 + 1", 0.5, max_iter=5)) == newton.TRACE_LIMIT
+
+
+def test_write_trace_csv(tmp_path):
+    import csv
+    rows = _trace("x^2 - 2", 1.0)
+    path = tmp_path / "trace.csv"
+    newton.write_trace_csv(rows, str(path))
+    with open(path, newline="", encoding="utf-8") as fh:
+        table = list(csv.reader(fh))
+    assert tuple(table[0]) == newton.TRACE_COLUMNS and len(table) == len(rows) + 1
+    assert [float(v) for v in table[1][1:6]] == list(rows[0][1:6])     # repr round-trips exactly
+    assert table[1][6] == "" and table[-2][6] != ""
+
+
+# ---------- High precision ----------
+@pytest.mark.parametrize("text, x0, digits", [
+    ("x^3 - 2x - 5", 2.09, 60),
+    ("cos(x) - x/10", 1.43, 500),
+    ("exp(x) - 3", 1.1, 1000),
+])
+def test_refine_root_matches_mpmath_findroot(text, x0, digits):
+    import mpmath
+    func = sp.sympify(text.replace("^", "**").replace("2x", "2*x"))
+    f, fp = newton.compile_newton_mp(func)
+    start = newton.newton_solve(func, x0)
+    res = newton.refine_root(f, fp, start.root, digits)
+    assert res.certified and res.digits == digits
+    with mpmath.workdps(digits + 20):
+        expected = mpmath.findroot(f, mpmath.mpf(x0))
+        assert abs(res.root - expected) <= abs(expected) * mpmath.mpf(10) ** -(digits + 1)
+        # the printed digits are expected rounded to `digits` significant digits
+        assert newton.format_precise(res).splitlines()[0] == mpmath.nstr(expected, digits, strip_zeros=False)
+
+
+def test_refine_root_precision_doubles():
+    f, fp = newton.compile_newton_mp(x**2 - 2)
+    res = newton.refine_root(f, fp, 1.4142135623730951, 2000)
+    # each step doubles the correct bits, less the guard bits
+    assert res.precisions == sorted(res.precisions) and len(res.precisions) <= 10
+    big = [p for p in res.precisions if p > 200]
+    assert all(b >= 1.8 * a for a, b in zip(big, big[1:]))
+    assert res.precisions[-1] >= 2000 * math.log2(10)
+
+
+def test_refine_root_double_root_is_not_certified():
+    f, fp = newton.compile_newton_mp((x - 1)**2)
+    res = newton.refine_root(f, fp, 1.0000001, 30)
+    assert not res.certified
+    assert "NOT certified" in newton.format_precise(res)
+
+
+def test_format_digits():
+    import mpmath
+    assert newton.format_digits(mpmath.mpf("123.456"), 4) == "123.5"
+    assert newton.format_digits(mpmath.mpf("0.000123456"), 3) == "0.000123"
+    assert newton.format_digits(mpmath.mpf("9.9996"), 4) == "10.00"
+    assert newton.format_digits(mpmath.mpf(0), 3) == "0.00"
+    with pytest.raises(ValueError):
+        newton.refine_root(*newton.compile_newton_mp(x - 1), 1.0, 0)
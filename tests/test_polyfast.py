@@ -0,0 +1,58 @@
+import sympy as sp
+
+import polyfast
+
+x, y = sp.symbols("x y")
+
+
+def test_detection():
+    assert polyfast.as_poly(x**3 - 2*x + 1).degree() == 3
+    assert polyfast.as_poly(sp.sin(x)) is None
+    assert polyfast.as_poly(x * y) is None
+    p, q = polyfast.as_rational((x + 1) / (x**2 - 1))
+    assert (p.as_expr() / q.as_expr() - 1 / (x - 1)).equals(0)
+    assert polyfast.as_rational(sp.sqrt(x)) is None
+
+
+def test_diff_and_integrate_match_sympy():
+    e = 3*x**4 - x + 7
+    assert polyfast.poly_diff(e) == sp.diff(e, x)
+    assert sp.expand(polyfast.poly_integrate(e) - sp.integrate(e, x)) == 0
+    F = polyfast.poly_integrate(1 / (x**2 + 1))
+    assert sp.simplify(sp.diff(F, x) - 1 / (x**2 + 1)) == 0
+
+
+def test_declines_what_the_generic_path_does_better():
+    assert polyfast.poly_diff((x + 1)**3) is None        # keeps sp.diff's factored output
+    assert polyfast.poly_integrate(1 / x) is None
+    assert polyfast.poly_solve(sp.sin(x)) is None
+
+
+def test_factor():
+    assert polyfast.poly_factor(x**2 - 1) == (x - 1) * (x + 1)
+    assert sp.simplify(polyfast.poly_factor((x**2 - 1) / (x + 1)) - (x - 1)) == 0
+
+
+def test_solve_exact_and_numeric():
+    assert polyfast.poly_solve(x**2 - 2) == [-sp.sqrt(2), sp.sqrt(2)]
+    assert polyfast.poly_solve((x**2 - 1) / (x - 1)) == [-1]         # x = 1 is a hole, not a root
+    sols = polyfast.poly_solve(x**5 - x - 1)
+    assert len(sols) == 5
+    real = [s for s in sols if s.is_real]
+    assert len(real) == 1 and abs(float(real[0]) - 1.1673039782614187) < 1e-12
+
+
+def test_degree_bound():
+    assert polyfast.degree_bound(x**3 * (x + 1)**4 + 2) == 7
+    assert polyfast.degree_bound(1 / x**5) == 5
+    assert polyfast.degree_bound(sp.sin(x**9)) == 0
+
+
+def test_huge_degrees_skip_the_dense_poly():
+    # a dense Poly of x**10**8 never finishes; these must answer at once
+    huge = x**100_000_000
+    assert polyfast.as_poly(huge) is None and polyfast.as_rational(1 / huge) is None
+    assert polyfast.poly_diff(huge) is None
+    assert polyfast.poly_integrate(3 * huge - 2 * x) == 3 * x**100_000_001 / 100_000_001 - x**2
+    assert polyfast.poly_integrate(sp.sin(x) * huge) is None
+    assert polyfast.as_poly(x**polyfast.MAX_DEGREE + 1).degree() == polyfast.MAX_DEGREE
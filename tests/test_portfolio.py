@@ -0,0 +1,64 @@
+import sympy as sp
+
+import portfolio
+from workers import WorkerPool
+
+x = sp.symbols("x")
+
+
+def test_patterns():
+    assert portfolio.pattern("x*sin(x)") == "sin"
+    assert portfolio.pattern("sqrt(x)*exp(x)") == "exp+sqrt"
+    assert portfolio.pattern("x^(1/3) + 1") == "root"
+    assert portfolio.pattern("1/(x^4 + 1)") == "rational"
+    assert portfolio.pattern("x^3 + 2x") == "polynomial"
+    # from the parsed tree, not the text
+    assert portfolio.pattern("x^x") == "power"
+    assert portfolio.pattern("E**x") == "exp"
+    assert portfolio.pattern("2^x + x") == "exp"
+
+
+def test_order_follows_wins(tmp_path):
+    path = str(tmp_path / "wins.json")
+    stats = portfolio.WinStats(path)
+    assert stats.order("exp") == list(portfolio.STRATEGIES)
+    stats.record("exp", portfolio.STRATEGIES, "risch", 0.5)
+    stats.record("exp", portfolio.STRATEGIES, "manual", 0.1)
+    stats.record("exp", portfolio.STRATEGIES, "manual", 0.3)
+    order = portfolio.WinStats(path).order("exp")          # reloaded from the file
+    assert order[:2] == ["manual", "risch"]
+    assert "2/3" in stats.format_table()
+
+
+def test_verify():
+    assert portfolio.verify(sp.cos(x), sp.sin(x) + 7, x)
+    assert not portfolio.verify(sp.cos(x), sp.sin(x) + x, x)
+    assert portfolio.verify(1 / x, sp.log(x), x)            # complex values left of zero still agree
+
+
+def test_attempt_in_process():
+    status, text, _ = portfolio.attempt("manual", "x*exp(x)")
+    assert status == portfolio.VERIFIED
+    assert sp.expand(sp.sympify(text) - (x - 1) * sp.exp(x)) == 0
+    assert portfolio.attempt("rational", "sin(x)")[0] == portfolio.NO_RESULT
+
+
+def test_race_classifies_then_races(tmp_path):
+    pool = WorkerPool(2, preload=portfolio.PRELOAD)
+    try:
+        r = portfolio.race(pool, "x*exp(x)", timeout=60, stats=portfolio.WinStats(str(tmp_path / "wins.json")))
+    finally:
+        pool.shutdown()
+    assert r.pattern == "exp" and r.classifier.result == "exp"
+    assert r.winner in portfolio.STRATEGIES and "verified" in r.format()
+    assert sp.expand(sp.sympify(r.result) - (x - 1) * sp.exp(x)) == 0
+
+
+def test_race_of_an_unparsable_integrand():
+    pool = WorkerPool(1)
+    try:
+        r = portfolio.race(pool, "x +* 2", timeout=30, stats=portfolio.WinStats())
+    finally:
+        pool.shutdown()
+    assert r.done and r.winner is None and not r.jobs
+    assert "classify" in r.format()
@@ -0,0 +1,102 @@
+import csv
+import json
+import pstats
+import time
+
+import pytest
+
+from profiling import BUCKET_LABELS, Profiler, profiled, stage
+from workers import WorkerPool, DONE
+
+
+def test_stages_size_and_histogram():
+    prof = Profiler()
+
+    @profiled("op", prof)
+    def op(text):
+        with stage("parse"):
+            time.sleep(0.002)
+        with stage("render"):
+            return text * 2
+
+    assert op("ab") == "abab"
+    op("abc")
+    st = prof.summary()["op"]
+    assert st["calls"] == 2 and st["errors"] == 0
+    assert set(st["stage_mean_s"]) == {"parse", "render", "compute"}
+    assert st["stage_mean_s"]["parse"] >= 0.002
+    assert st["size_max"] == 6 and st["size_mean"] == 5
+    assert sum(st["histogram"].values()) == 2 and st["histogram"]["<1ms"] == 0
+
+
+def test_errors_are_counted():
+    prof = Profiler()
+
+    @profiled("boom", prof)
+    def boom():
+        raise ValueError("no")
+
+    with pytest.raises(ValueError):
+        boom()
+    assert prof.summary()["boom"]["errors"] == 1
+
+
+def test_nested_calls_keep_their_own_stages():
+    prof = Profiler()
+
+    @profiled("inner", prof)
+    def inner():
+        with stage("parse"):
+            return "i"
+
+    @profiled("outer", prof)
+    def outer():
+        with stage("render"):
+            pass
+        return inner() + "o"
+
+    outer()
+    summary = prof.summary()
+    assert set(summary) == {"inner", "outer"}
+    assert "parse" not in summary["outer"]["stage_mean_s"]
+
+
+def test_slowest_profile_and_exports(tmp_path):
+    prof = Profiler()
+    prof.capture_profile = True
+
+    @profiled("sleep", prof)
+    def nap(seconds):
+        time.sleep(seconds)
+        return "z"
+
+    nap(0.001)
+    nap(0.02)
+    assert prof.slowest[0] == "sleep" and prof.slowest[1] >= 0.02
+    assert prof.dump_slowest(str(tmp_path / "slow.prof"))
+    assert pstats.Stats(str(tmp_path / "slow.prof")).total_calls > 0
+
+    prof.export_json(str(tmp_path / "ops.json"))
+    with open(tmp_path / "ops.json", encoding="utf-8") as f:
+        assert json.load(f)["sleep"]["calls"] == 2
+    prof.export_csv(str(tmp_path / "ops.csv"))
+    with open(tmp_path / "ops.csv", newline="", encoding="utf-8") as f:
+        header, row = list(csv.reader(f))
+    assert header[-len(BUCKET_LABELS):] == list(BUCKET_LABELS) and row[:2] == ["sleep", "2"]
+    prof.reset()
+    assert prof.summary() == {} and not prof.dump_slowest(str(tmp_path / "none.prof"))
+
+
+def test_worker_records_travel_back_with_the_reply():
+    pool = WorkerPool(1)
+    try:
+        job = pool.submit("profiling:run_operation", (True, "differentiate", "x^3"))
+        while not job.done:
+            pool.wait(10)
+    finally:
+        pool.shutdown()
+    assert job.status == DONE
+    prof = Profiler()
+    prof.merge(job.extras.get("profile"))
+    assert prof.summary()["differentiate"]["calls"] == 1
+    assert prof.slowest is not None and prof.slowest[0] == "differentiate"
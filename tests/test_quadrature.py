@@ -0,0 +1,69 @@
+import math
+
+import mpmath
+import numpy as np
+import pytest
+
+import quadrature
+
+
+@pytest.mark.parametrize("f, a, b, exact", [
+    (np.sin, 0.0, math.pi, 2.0),
+    (lambda t: np.exp(-t**2), -math.inf, math.inf, math.sqrt(math.pi)),
+    (lambda t: 1 / (1 + t**2), 0.0, math.inf, math.pi / 2),
+    (lambda t: np.exp(t), -math.inf, 0.0, 1.0),
+    (np.sqrt, 0.0, 1.0, 2 / 3),
+])
+def test_integrals(f, a, b, exact):
+    res = quadrature.integrate(f, a, b)
+    assert res.converged
+    assert abs(res.value - exact) <= 1e-9 * max(1.0, abs(exact))
+
+
+def test_reversed_and_empty_ranges():
+    assert quadrature.integrate(np.cos, 1.0, 1.0).value == 0.0
+    assert abs(quadrature.integrate(np.cos, 1.0, 0.0).value + math.sin(1.0)) < 1e-12
+
+
+def test_constant_integrand_broadcasts():
+    assert abs(quadrature.integrate(lambda t: 3.0, 0.0, 2.0).value - 6.0) < 1e-12
+
+
+def test_non_finite_integrand_is_an_error():
+    with pytest.raises(ValueError):
+        quadrature.integrate(lambda t: 1 / t, -1.0, 1.0)
+
+
+def test_interval_cap_reports_non_convergence():
+    res = quadrature.integrate(lambda t: np.sin(1 / t), 1e-6, 1.0, max_intervals=16)
+    assert not res.converged and res.intervals <= 32
+    assert "NOT converged" in quadrature.format_result(res)
+
+
+@pytest.mark.parametrize("f, a, b", [
+    (lambda t: 1j * t, 0.0, 1.0),
+    (lambda t: np.exp(1j * t), 0.0, math.pi),
+])
+def test_non_real_integrand_is_an_error(f, a, b):
+    with pytest.raises(ValueError, match="not real"):
+        quadrature.integrate(f, a, b)
+
+
+def test_complex_dtype_with_real_values():
+    res = quadrature.integrate(lambda t: np.exp(1j * t) * np.exp(-1j * t) + 0j, 0.0, 2.0)
+    assert abs(res.value - 2.0) < 1e-12
+
+
+def test_functions_without_a_numpy_ufunc():
+    # lambdify's numpy code for gamma raises TypeError on arrays; it is evaluated point by point
+    from session import expression
+    res = quadrature.integrate(expression("gamma(x)").vectorized, 1.0, 2.0)
+    exact = float(mpmath.quad(mpmath.gamma, [1, 2]))
+    assert res.converged and abs(res.value - exact) < 1e-9
+
+
+def test_compute_definite_integral_errors():
+    import compute
+    for expr, a, b in [("I*x", "0", "1"), ("exp(I*x)", "0", "pi"), ("gamma(x)", "-1", "1")]:
+        with pytest.raises(ValueError):
+            compute.compute_definite_integral(expr, a, b)
@@ -0,0 +1,94 @@
+import math
+import time
+
+import numpy as np
+import pytest
+import sympy as sp
+
+import compute
+import roots
+
+x = sp.symbols("x")
+
+
+def _values(text, lo, hi):
+    return [v for v, _, _ in compute._real_roots(text, lo, hi).roots]
+
+
+def test_sturm_polynomial_with_multiplicity():
+    res = roots.sturm_roots(sp.Poly((x - 1)**2 * (x + 2) * (x**2 + 1), x), -5, 5)
+    assert res.method == roots.STURM and not res.unresolved
+    assert [(round(v, 12), m) for v, m, _ in res.roots] == [(-2.0, 1), (1.0, 2)]
+
+
+def test_sturm_matches_numpy_for_a_wiggly_polynomial():
+    p = sp.Poly(sp.chebyshevt(25, x), x)
+    found = [v for v, _, _ in roots.sturm_roots(p, -1, 1).roots]
+    expected = np.sort(np.cos((2 * np.arange(25) + 1) * np.pi / 50))
+    assert np.allclose(found, expected, atol=1e-12)
+
+
+def test_scan_transcendental():
+    found = _values("cos(x) = x/10", -20, 20)
+    assert len(found) == 7
+    assert all(abs(math.cos(v) - v / 10) < 1e-12 for v in found)
+
+
+def test_poles_are_not_roots():
+    found = _values("tan(x)", -4, 4)
+    assert np.allclose(found, [-math.pi, 0.0, math.pi], atol=1e-12)
+
+
+def test_double_root_is_not_proven_simple():
+    res = compute._real_roots("cos(x) - 1", -1, 1)
+    assert len(res.roots) == 1 and abs(res.roots[0][0]) < 1e-6
+
+
+def test_merge_of_farmed_parts():
+    parts = [roots.as_plain(compute._real_roots("sin(x)", a, b)) for a, b in ((-10, 0), (0, 10))]
+    merged = roots.merge(parts)
+    assert len(merged.roots) == 7           # x = 0 found by both halves is listed once
+
+
+def test_jumps_are_not_roots_and_stop_early():
+    # floor has no enclosure: the grid is scanned once instead of bisected to MAX_PIECES
+    start = time.perf_counter()
+    res = compute._real_roots("floor(x) - 0.5", -2, 2)
+    assert time.perf_counter() - start < 5
+    assert res.roots == [] and res.unresolved == [(-2.0, 2.0)] and res.method == roots.GRID_SCAN
+    assert [round(v, 12) for v in _values("floor(x) + x - 0.5", -2, 2)] == [0.5]
+
+
+def test_functions_without_a_numpy_ufunc():
+    res = compute._real_roots("gamma(x) - 2", 0.5, 4)
+    assert [round(v, 9) for v, _, _ in res.roots] == [3.0] and res.unresolved
+
+
+def test_enclosable():
+    assert roots.enclosable(sp.sin(x) * sp.exp(x) + sp.sqrt(2) * x**sp.Rational(1, 3))
+    assert not roots.enclosable(sp.floor(x) - 1)
+    assert not roots.enclosable(sp.gamma(x))
+
+
+@pytest.mark.parametrize("text, lo, hi", [("x*y", -1, 1), ("5", -1, 1), ("x", 1, -1), ("x", "-oo", 1)])
+def test_bad_input(text, lo, hi):
+    with pytest.raises(ValueError):
+        compute._real_roots(text, lo, hi)
+
+
+def test_enclosure_contains_the_range():
+    lo, hi = roots.enclose(sp.sin(x) * x, np.array([0.0, 2.0]), np.array([1.0, 4.0]))
+    ts = np.linspace(2.0, 4.0, 1001)
+    assert lo[1] <= (np.sin(ts) * ts).min() and (np.sin(ts) * ts).max() <= hi[1]
+
+
+def test_solve_falls_back_and_leaves_nothing_running(monkeypatch):
+    import threading
+    import time
+    monkeypatch.setattr(compute, "SOLVE_BUDGET", 0.2)
+    threads = threading.active_count()
+    out = compute.compute_solve.__wrapped__("cos(x) = x/9.5")
+    assert out.startswith("sp.solve timed out after 0.2 s") and "7 real root(s)" in out
+    cpu = time.process_time()
+    time.sleep(0.5)
+    assert time.process_time() - cpu < 0.1 and threading.active_count() == threads
@@ -0,0 +1,55 @@
+import numpy as np
+
+import sampling
+from sampling import SampleCache, evaluate, mark_poles
+
+
+def test_evaluate_drops_complex_and_infinite_values():
+    xs = np.array([-1.0, 0.0, 4.0])
+    with np.errstate(all="ignore"):
+        ys = evaluate(lambda t: np.sqrt(t.astype(complex)) / t, xs)
+    assert np.isnan(ys[0]) and np.isnan(ys[1]) and ys[2] == 0.5
+    assert np.array_equal(evaluate(lambda t: 3.0, xs), [3.0, 3.0, 3.0])    # constants broadcast
+
+
+def test_pole_breaks_the_line():
+    xs, ys, _ = SampleCache(np.tan).view(1.0, 2.0, 200)
+    breaks = xs[np.isnan(ys)]
+    assert breaks.size and np.all(np.abs(breaks - np.pi / 2) < 1e-2)
+    # no line segment is drawn across the pole
+    seg = ~np.isnan(ys[:-1]) & ~np.isnan(ys[1:])
+    assert not np.any(seg & (xs[:-1] < np.pi / 2) & (xs[1:] > np.pi / 2))
+
+
+def test_steep_but_continuous_jump_is_not_broken():
+    xs, ys, _ = SampleCache(lambda t: np.tanh(200 * t)).view(-1.0, 1.0, 200)
+    assert not np.isnan(ys).any()
+    assert mark_poles(np.array([0.0, 1.0]), np.array([1.0, 2.0]), 0.5, 1.0)[0].size == 2
+
+
+def test_refinement_concentrates_points_at_the_kink():
+    cache = SampleCache(lambda t: np.sqrt(np.abs(t)))
+    cache.view(-1.0 + 1e-3, 1.0, 100)
+    near = np.abs(cache.xs) < 0.01
+    step = 2.0 / (100 * sampling.OVERSAMPLE)
+    assert near.sum() > 0.02 / step + 2             # denser than the base grid
+    assert np.min(np.abs(cache.xs)) < step / 2 ** (sampling.REFINE_DEPTH - 2)
+
+
+def test_pan_and_zoom_reuse_cached_points():
+    cache = SampleCache(np.sin)
+    cache.view(0.0, 10.0, 100)
+    first = cache.evaluations
+    cache.view(0.0, 10.0, 100)
+    assert cache.evaluations == first
+    cache.view(5.0, 15.0, 100)                      # half the view is new
+    assert cache.evaluations - first <= 0.6 * first
+
+
+def test_cache_is_trimmed_around_the_view():
+    cache = SampleCache(np.sin, max_points=500)
+    cache.view(0.0, 10.0, 100)
+    cache.view(100.0, 110.0, 100)
+    assert cache.xs.size <= 500 and cache.xs.min() >= 0.0
+    assert np.all(np.diff(cache.xs) > 0)
+    assert np.all(cache.xs[-400:] >= 100.0)
@@ -0,0 +1,87 @@
+import asyncio
+import json
+
+from cache import RESULT_CACHE
+from service import ComputeService
+
+
+def run(scenario, **options):
+    """Run scenario(service) on a fresh one-worker service."""
+    async def main():
+        service = ComputeService(workers=1, **options)
+        service.start()
+        try:
+            return await scenario(service)
+        finally:
+            await service.stop()
+    RESULT_CACHE.clear()
+    try:
+        return asyncio.run(main())
+    finally:
+        RESULT_CACHE.clear()
+
+
+def post(service, **request):
+    return service.handle_request("POST", "/compute", json.dumps(request).encode())
+
+
+async def busy(service, seconds):
+    # keep the only worker occupied; the poller must know there is work
+    job = service.pool.submit("time:sleep", (seconds,))
+    service._futures[job.id] = asyncio.get_running_loop().create_future()
+    service._wake.set()
+    return job
+
+
+def test_compute_then_cache_hit():
+    async def scenario(service):
+        first = await post(service, op="differentiate", expr="x^3")
+        second = await post(service, op="differentiate", expr="x ^ 3")
+        return first, second, service.metrics.counts
+    (s1, r1), (s2, r2), counts = run(scenario)
+    assert (s1, r1["result"]) == (200, "3*x**2")
+    assert (s2, r2["result"]) == (200, "3*x**2")
+    assert counts["jobs"] == 1 and counts["cache_hits"] == 1
+
+
+def test_identical_requests_in_flight_share_one_job():
+    async def scenario(service):
+        await busy(service, 0.5)
+        replies = await asyncio.gather(*(post(service, op="factor", expr="x^2 - 1") for _ in range(3)))
+        return replies, service.metrics.counts
+    replies, counts = run(scenario)
+    assert all(status == 200 and r["result"] == "(x - 1)*(x + 1)" for status, r in replies)
+    assert counts["jobs"] == 1 and counts["deduplicated"] == 2
+
+
+def test_full_queue_is_refused_with_503():
+    async def scenario(service):
+        await busy(service, 1.0)
+        status, reply = await post(service, op="differentiate", expr="sin(x)")
+        return status, reply, service.metrics.counts
+    status, reply, counts = run(scenario, max_queue=1)
+    assert status == 503 and reply["status"] == "rejected"
+    assert counts["rejected"] == 1 and counts["jobs"] == 0
+
+
+def test_request_timeout_is_504_and_the_service_recovers():
+    async def scenario(service):
+        blocker = await busy(service, 30)
+        timed_out = await post(service, op="differentiate", expr="cos(x)", timeout=0.3)
+        service.pool.cancel(blocker)
+        ok = await post(service, op="differentiate", expr="cos(x)", timeout=30)
+        return timed_out, ok, service.metrics.counts
+    (s1, r1), (s2, r2), counts = run(scenario)
+    assert s1 == 504 and r1["status"] == "timeout"
+    assert (s2, r2["result"]) == (200, "-sin(x)")
+    assert counts["timeouts"] == 1 and counts["ok"] == 1
+
+
+def test_bad_requests():
+    async def scenario(service):
+        return [await post(service, op="nope", expr="x"),
+                await post(service, op="simplify", expr=" "),
+                await service.handle_request("POST", "/compute", b"{not json"),
+                await service.handle_request("GET", "/compute", b""),
+                await service.handle_request("GET", "/missing", b"")]
+    assert [status for status, _ in run(scenario)] == [400, 400, 400, 405, 404]
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+import sympy as sp
+
+from session import Session, expression
+
+x, y = sp.symbols("x y")
+
+
+def test_same_text_shares_one_expression():
+    s = Session()
+    e = s.get("x**3 - 3*x - 6")
+    assert s.get("x**3-3*x -6") is e            # whitespace ignored
+    assert s.get("x**3 - 3*x - 6", y) is not e   # another variable, another entry
+    assert len(s) == 2
+
+
+def test_derived_forms_are_computed_once():
+    e = Session().get("x**3 - 3*x - 6")
+    assert e.derivative is e.derivative and e.derivative == 3 * x**2 - 3
+    assert e.compiled is e.compiled
+    f, fp = e.compiled
+    assert (f(2.0), fp(2.0)) == (-4.0, 9.0)
+    assert e.samples is e.samples and e.derivative_samples(1) is e.derivative_samples(1)
+
+
+def test_least_recently_used_entry_is_evicted():
+    s = Session(max_entries=2)
+    a, b = s.get("x + 1"), s.get("x + 2")
+    assert s.get("x + 1") is a                  # a is now the most recent
+    s.get("x + 3")
+    assert len(s) == 2
+    assert s.get("x + 1") is a
+    assert s.get("x + 2") is not b              # b was evicted and parsed again
+
+
+def test_parse_errors_are_not_stored():
+    s = Session()
+    with pytest.raises(Exception):
+        s.get("x +* 2")
+    assert len(s) == 0
+
+
+def test_module_session():
+    assert expression("sin(x) + 1") is expression("sin(x)+1")
+
+
+def test_vectorized_falls_back_to_pointwise_evaluation():
+    e = Session().get("gamma(x)")
+    values = e.vectorized(np.array([1.0, 4.0]))
+    assert np.allclose(values.real, [1.0, 6.0])
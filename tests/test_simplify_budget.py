@@ -0,0 +1,50 @@
+import time
+
+import sympy as sp
+
+import simplify_budget
+
+x = sp.symbols("x")
+HARD = sp.sympify("(sin(x)**2 + cos(x)**2)**7*(x**4 - 1)/(x**2 + 1) + ((x + 1)**12 - (x - 1)**12)/(x + 2)**3"
+                  " + tan(x)*cot(x)*exp(log(x**3 + x))/sqrt(x**2)")
+
+
+def test_value_and_error():
+    assert simplify_budget.run_with_deadline(sp.expand, (x + 1)**2, 10) == (x**2 + 2*x + 1, None)
+    assert simplify_budget.run_with_deadline(lambda e: 1 / 0, x, 10) == (None, "error")
+
+
+def test_deadline_stops_the_work():
+    cpu, start = time.process_time(), time.monotonic()
+    assert simplify_budget.run_with_deadline(sp.simplify, HARD, 0.3) == (None, "timed out")
+    assert time.monotonic() - start < 1.0
+    time.sleep(0.5)
+    assert time.process_time() - cpu < 0.25        # nothing keeps simplifying in the background
+
+
+def test_tiered_simplify_improves_within_budget():
+    res = simplify_budget.tiered_simplify((x**2 - 1)/(x - 1) + sp.sin(x)**2 + sp.cos(x)**2, 5.0)
+    assert res.expr == x + 2 and not res.budget_exhausted
+    assert [p.name for p in res.passes] == [name for name, _ in simplify_budget.PASSES]
+
+
+def test_tiered_simplify_reports_the_pass_that_ran_out():
+    res = simplify_budget.tiered_simplify(HARD, 0.2)
+    assert res.budget_exhausted
+    assert res.passes[-1].status == "timed out"
+    assert "time budget reached" in simplify_budget.format_passes(res)
+
+
+def test_all_passes_reported_before_the_deadline(monkeypatch):
+    # the child reports every pass, then is killed before it exits
+    run_passes = simplify_budget._run_passes
+
+    def slow_exit(expr, passes, send):
+        run_passes(expr, passes, send)
+        time.sleep(10)
+    monkeypatch.setattr(simplify_budget, "_run_passes", slow_exit)
+    passes = [("expand", sp.expand), ("factor", sp.factor)]
+    res = simplify_budget.tiered_simplify((x + 1)**2 - 1, 1.0, passes)
+    assert not res.budget_exhausted
+    assert [p.name for p in res.passes] == ["expand", "factor"]
+    assert res.expr == x * (x + 2)
@@ -0,0 +1,78 @@
+from collections import deque
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("tkinter")
+
+import C_calc
+from cache import RESULT_CACHE, make_key
+from workers import Job
+
+GUI = C_calc.CalculatorGUI
+
+
+class FakePool:
+    def __init__(self):
+        self.cancelled = []
+
+    def cancel(self, job):
+        self.cancelled.append(job)
+        job.status = "cancelled"
+
+
+class FakeMaster:
+    def after(self, ms, fn):
+        return "after#1"
+
+    def after_cancel(self, ident):
+        pass
+
+
+def fake_gui(text):
+    return SimpleNamespace(master=FakeMaster(), pool=FakePool(), _speculative={}, _speculate_after=None,
+                           speculate_var=SimpleNamespace(get=lambda: True), _get_expr=lambda: text,
+                           _speculation_spent=deque(), _speculate=lambda: None)
+
+
+def speculative_job(gui, operation, expr, status):
+    key = make_key(operation, expr, ())
+    job = Job("profiling:run_operation", (False, operation, expr), None, 2.0, ("speculate", key), background=True)
+    job.status = status
+    gui._speculative[key] = job
+    return key, job
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    RESULT_CACHE.clear()
+    yield
+    RESULT_CACHE.clear()
+
+
+def test_edit_cancels_only_pending_speculation():
+    gui = fake_gui("x^2 + 1")
+    _, running = speculative_job(gui, "factor", "x^2", "running")
+    _, pending = speculative_job(gui, "simplify", "x^2", "pending")
+    kept, current = speculative_job(gui, "factor", "x^2 + 1", "running")
+    GUI._on_expr_changed(gui)
+    # the running job keeps its warm worker; both old jobs are forgotten
+    assert gui.pool.cancelled == [pending]
+    assert running.status == "running"
+    assert gui._speculative == {kept: current}
+
+
+def test_result_of_a_dropped_job_is_not_cached():
+    gui = fake_gui("x^2 + 1")
+    old_key, old = speculative_job(gui, "factor", "x^2", "running")
+    GUI._on_expr_changed(gui)
+    old.status, old.result = "done", "x**2"
+    GUI._speculation_finished(gui, old)
+    assert RESULT_CACHE.get(old_key) == (False, None)
+    assert len(gui._speculation_spent) == 1         # its CPU time still counts against the budget
+
+    key, job = speculative_job(gui, "factor", "x^2 + 1", "running")
+    job.status, job.result = "done", "x**2 + 1"
+    GUI._speculation_finished(gui, job)
+    assert RESULT_CACHE.get(key) == (True, "x**2 + 1")
+    assert gui._speculative == {}
@@ -0,0 +1,73 @@
+import sqlite3
+
+import pytest
+import sympy as sp
+
+import store
+from cache import ResultCache, cached
+
+
+@pytest.fixture
+def result_store(tmp_path):
+    s = store.enable_store(str(tmp_path / "results.sqlite3"))
+    yield s
+    store.disable_store()
+
+
+def test_round_trip(result_store):
+    key = store.store_key("simplify", "x + x")
+    assert result_store.get(key) == (False, None)
+    result_store.put(key, "2*x")
+    assert result_store.get(key) == (True, "2*x")
+    # another connection (another process, another session) sees it
+    reopened = store.ResultStore(result_store.path)
+    assert reopened.get(key) == (True, "2*x")
+    result_store.clear()
+    assert reopened.get(key) == (False, None)
+
+
+def test_keys_are_canonical_and_versioned(monkeypatch):
+    assert store.store_key("simplify", "2*x") == store.store_key("simplify", "x*2")
+    assert store.store_key("simplify", "x**2") == store.store_key("simplify", "x^2")
+    assert store.store_key("simplify", "x") != store.store_key("factor", "x")
+    assert store.store_key("newton", "x", ("1",)) != store.store_key("newton", "x", ("2",))
+    # results from another SymPy version are never served
+    key = store.store_key("simplify", "x")
+    monkeypatch.setattr(sp, "__version__", "0.0.1")
+    assert store.store_key("simplify", "x") != key
+
+
+def test_prune_keeps_the_newest(tmp_path):
+    s = store.ResultStore(str(tmp_path / "small.sqlite3"), max_entries=3)
+    for i in range(5):
+        s.put(f"k{i}", str(i))
+    s.prune()
+    assert s.stats()["entries"] == 3
+    assert s.get("k0") == (False, None) and s.get("k4") == (True, "4")
+
+
+def test_apply_setting():
+    try:
+        store.apply_setting("1")
+        assert store.RESULT_STORE is not None and store.RESULT_STORE.path == store.default_path()
+        store.apply_setting("off")
+        assert store.RESULT_STORE is None
+    finally:
+        store.disable_store()
+
+
+def test_persisted_results_survive_the_memory_cache(result_store):
+    calls = []
+
+    @cached("shout", cache=ResultCache(), persist=True)
+    def shout(expr_str):
+        calls.append(expr_str)
+        return expr_str.upper()
+
+    assert shout("x*y") == "X*Y"
+    # a new session: empty memory cache, same store
+    shout2 = cached("shout", cache=ResultCache(), persist=True)(shout.__wrapped__)
+    assert shout2("y*x") == "X*Y"           # canonical key: y*x is x*y
+    assert calls == ["x*y"]
+    (rows,) = sqlite3.connect(result_store.path).execute("SELECT COUNT(*) FROM results").fetchone()
+    assert rows == 1
@@ -0,0 +1,60 @@
+import math
+
+import numpy as np
+import pytest
+
+import compute
+import systems
+
+
+def solve(text, start):
+    eqs, variables = systems.parse_system(text)
+    return systems.newton_system(eqs, variables, systems.parse_point(start, len(variables)))
+
+
+def test_parse_system():
+    eqs, variables = systems.parse_system("x^2 + y^2 = 4\nx*y = 1")
+    assert [v.name for v in variables] == ["x", "y"] and len(eqs) == 2
+    with pytest.raises(ValueError, match="as many equations"):
+        systems.parse_system("x + y = 1")
+
+
+@pytest.mark.parametrize("text", ["x + I*y = 1; y = 2", "x + (-2)^(1/3) = y; y = 1"])
+def test_complex_systems_are_rejected(text):
+    with pytest.raises(ValueError, match="real equations"):
+        systems.parse_system(text)
+    with pytest.raises(ValueError):
+        compute.compute_system_newton(text, "0,0")
+
+
+def test_converges_quadratically():
+    res = solve("x^2 + y^2 = 4; x*y = 1", "1, 0.5")
+    assert res.status == [systems.CONVERGED] and res.iterations[0] <= 8
+    x, y = res.points[0]
+    assert abs(x * x + y * y - 4) < 1e-12 and abs(x * y - 1) < 1e-12
+
+
+def test_damping_reaches_a_root_from_far_away():
+    res = solve("exp(x) - y = 0; x + y = 3", "10, -20")
+    assert res.status == [systems.CONVERGED]
+    assert abs(math.exp(res.points[0][0]) + res.points[0][0] - 3) < 1e-10
+
+
+def test_left_the_domain_is_its_own_status():
+    res = solve("sqrt(x) + y = 1; x - y = 0", "-1, -1")
+    assert res.status == [systems.DOMAIN]
+    assert solve("sqrt(x) + y = 1; x - y = 0", "1, 1").status == [systems.CONVERGED]
+
+
+def test_singular_jacobian():
+    assert solve("x + y = 1; 2*x + 2*y = 3", "0, 0").status == [systems.SINGULAR]
+    # already on a root: converged although J is singular there
+    assert solve("x*y = 0; x + y = 0", "0, 0").status == [systems.CONVERGED]
+
+
+def test_multistart_finds_all_roots():
+    eqs, variables = systems.parse_system("x^2 + y^2 = 4; x*y = 1")
+    res = systems.newton_system(eqs, variables, systems.start_box(-3, 3, 2, count=100))
+    distinct, hits = systems.cluster_points(res.points[np.array(res.status) == systems.CONVERGED], 1e-7)
+    assert len(distinct) == 4 and sum(hits) == res.status.count(systems.CONVERGED)
+    assert "(100 starts)" in systems.format_multistart(res)
@@ -0,0 +1,90 @@
+import sqlite3
+
+import pytest
+
+from workers import WorkerPool, CANCELLED, DONE, TIMEOUT
+
+
+@pytest.fixture
+def pool():
+    p = WorkerPool(2)
+    yield p
+    p.shutdown()
+
+
+def drain(pool, jobs):
+    while not all(j.done for j in jobs):
+        pool.wait(10)
+
+
+def test_result_and_error(pool):
+    ok = pool.submit("math:sqrt", (16.0,))
+    bad = pool.submit("math:sqrt", (-1.0,))
+    drain(pool, [ok, bad])
+    assert (ok.status, ok.result) == (DONE, 4.0)
+    assert bad.status == "error" and "domain" in bad.error
+
+
+def test_cancel_running_and_pending(pool):
+    running = [pool.submit("time:sleep", (30,)) for _ in range(pool.size)]
+    queued = pool.submit("time:sleep", (30,))
+    pool.cancel(queued)
+    assert queued.status == CANCELLED and queued.started == queued.finished
+    pool.cancel(running[0])
+    assert running[0].status == CANCELLED
+    # the killed worker was replaced: the pool still runs jobs
+    job = pool.submit("math:floor", (2.5,))
+    drain(pool, [job])
+    assert job.result == 2
+    pool.cancel_all()
+    assert pool.active() == 0
+
+
+def test_timeout(pool):
+    job = pool.submit("time:sleep", (30,), timeout=0.5)
+    drain(pool, [job])
+    assert job.status == TIMEOUT and job.elapsed < 10
+    after = pool.submit("math:floor", (1.5,))
+    drain(pool, [after])
+    assert after.result == 1
+
+
+def test_broadcast_reaches_every_worker(pool):
+    jobs = pool.broadcast("os:getpid")
+    drain(pool, jobs)
+    assert len({j.result for j in jobs}) == pool.size
+
+
+def test_broadcast_waits_for_a_busy_worker(pool):
+    busy = pool.submit("time:sleep", (0.5,))
+    jobs = pool.broadcast("os:getpid")
+    drain(pool, jobs + [busy])
+    assert all(j.status == DONE for j in jobs)
+    assert max(j.started for j in jobs) >= busy.finished
+
+
+def test_store_enabled_in_running_workers(pool, tmp_path):
+    # workers read CCALC_RESULT_STORE only at start; the GUI broadcasts the toggle
+    path = str(tmp_path / "results.sqlite3")
+    drain(pool, pool.broadcast("os:getpid"))        # workers already running
+    drain(pool, pool.broadcast("store:apply_setting", (path,)))
+    jobs = [pool.submit("compute:compute_simplify", (f"sin(x)^2 + cos(x)^2 + {i}",)) for i in range(3)]
+    drain(pool, jobs)
+    assert all(j.status == DONE for j in jobs)
+    (rows,) = sqlite3.connect(path).execute("SELECT COUNT(*) FROM results").fetchone()
+    assert rows == 3
+    drain(pool, pool.broadcast("store:apply_setting", ("0",)))
+    drain(pool, [pool.submit("compute:compute_simplify", ("sin(x)^2 + cos(x)^2 + 7",))])
+    (rows,) = sqlite3.connect(path).execute("SELECT COUNT(*) FROM results").fetchone()
+    assert rows == 3
+
+
+def test_broadcast_clears_worker_caches(pool):
+    drain(pool, [pool.submit("compute:compute_simplify", ("2*x + x",))])
+    before = pool.broadcast("cache:RESULT_CACHE.stats")
+    drain(pool, before)
+    assert sum(j.result["entries"] for j in before) >= 1
+    drain(pool, pool.broadcast("cache:RESULT_CACHE.clear"))
+    after = pool.broadcast("cache:RESULT_CACHE.stats")
+    drain(pool, after)
+    assert sum(j.result["entries"] for j in after) == 0
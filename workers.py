@@ -0,0 +1,300 @@
+"""
+workers.py
+Small process pool for computations that must be cancellable and time-limited
+
+Unlike concurrent.futures, a running job can be killed: its worker process is
+terminated and replaced. Jobs name their function as "module:function" so the
+submitting process never has to import the (heavy) computation modules.
+"""
+
+import importlib
+import itertools
+import multiprocessing as mp
+import os
+import time
+from collections import deque
+from multiprocessing.connection import wait as wait_connections
+
+PENDING, RUNNING, DONE, ERROR, CANCELLED, TIMEOUT = (
+    "pending", "running", "done", "error", "cancelled", "timeout")
+
+
+# name -> callable run in the worker after each job; its value is sent back in Job.extras
+_REPLY_HOOKS = {}
+
+
+def add_reply_hook(name: str, fn):
+    _REPLY_HOOKS[name] = fn
+
+
+def _collect_extras() -> dict:
+    extras = {}
+    for name, fn in _REPLY_HOOKS.items():
+        try:
+            value = fn()
+        except Exception:
+            continue
+        if value is not None:
+            extras[name] = value
+    return extras
+
+
+def default_size() -> int:
+    return max(2, min(4, (os.cpu_count() or 2) - 1))
+
+
+def _resolve(target: str):
+    # "module:function", or "module:OBJECT.method" for a module-level instance
+    module, _, name = target.partition(":")
+    obj = importlib.import_module(module)
+    for part in name.split("."):
+        obj = getattr(obj, part)
+    return obj
+
+
+def in_worker() -> bool:
+    return _IN_WORKER
+
+
+_IN_WORKER = False
+
+
+def _worker_main(conn, preload):
+    global _IN_WORKER
+    _IN_WORKER = True
+    for module in preload:
+        try:
+            importlib.import_module(module)
+        except Exception:
+            pass
+    while True:
+        try:
+            msg = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            return
+        if msg is None:
+            return
+        job_id, target, args, kwargs = msg
+        try:
+            reply = (job_id, True, _resolve(target)(*args, **kwargs))
+        except Exception as e:
+            reply = (job_id, False, str(e) or type(e).__name__)
+        try:
+            conn.send(reply + (_collect_extras(),))
+        except Exception as e:       # unpicklable result
+            conn.send((job_id, False, f"Could not return result: {e}", {}))
+
+
+class Job:
+    _ids = itertools.count(1)
+
+    def __init__(self, target, args, kwargs, timeout, tag, affinity=None, background=False, pin=None):
+        self.id = next(Job._ids)
+        self.target = target
+        self.args = args
+        self.kwargs = kwargs or {}
+        self.timeout = timeout
+        self.tag = tag              # caller's label, e.g. the expression the job belongs to
+        self.affinity = affinity    # jobs with the same key prefer the worker that last ran it
+        self.background = background    # runs only when it leaves a worker free for other jobs
+        self.pin = pin              # the only worker that may run it (see WorkerPool.broadcast)
+        self.status = PENDING
+        self.result = None
+        self.error = None
+        self.extras = {}            # values from worker reply hooks, e.g. profiling records
+        self.submitted = time.monotonic()
+        self.started = None
+        self.finished = None
+
+    @property
+    def elapsed(self) -> float:
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.monotonic()) - self.started
+
+    @property
+    def done(self) -> bool:
+        return self.status not in (PENDING, RUNNING)
+
+
+class _Worker:
+    def __init__(self, ctx, preload):
+        self.conn, child = ctx.Pipe()
+        self.proc = ctx.Process(target=_worker_main, args=(child, preload), daemon=True)
+        self.proc.start()
+        child.close()
+        self.job = None
+        self.recent = deque(maxlen=32)  # affinity keys of jobs run here (warm per-process state)
+
+    def kill(self):
+        try:
+            self.conn.close()
+        finally:
+            if self.proc.is_alive():
+                self.proc.terminate()
+            self.proc.join(1)
+
+
+class WorkerPool:
+    def __init__(self, size=None, preload=(), start_method="spawn"):
+        self.size = size or default_size()
+        self.preload = tuple(preload)
+        self._ctx = mp.get_context(start_method)
+        self._workers = []
+        self._pending = deque()
+        self._finished = []
+
+    def start(self):
+        """Start the worker processes now (otherwise they start on first submit)."""
+        while len(self._workers) < self.size:
+            self._workers.append(_Worker(self._ctx, self.preload))
+
+    def submit(self, target: str, args=(), kwargs=None, timeout=None, tag=None, affinity=None,
+               background=False) -> Job:
+        """Queue a job; `affinity` (e.g. the expression text) routes it to an idle
+        worker that already ran a job with the same key, when there is one.
+
+        Background jobs wait behind all other jobs and never take the last idle worker.
+        """
+        job = Job(target, tuple(args), kwargs, timeout, tag, affinity, background)
+        self._pending.append(job)
+        self._dispatch()
+        return job
+
+    def broadcast(self, target: str, args=(), kwargs=None, timeout=None, tag=None) -> list:
+        """Queue one job per worker, e.g. to change or query per-process state such as caches.
+
+        Each job waits for its own worker to finish what it is running; a worker that is
+        replaced meanwhile runs it in its fresh successor.
+        """
+        self.start()
+        jobs = [Job(target, tuple(args), kwargs, timeout, tag, pin=w) for w in self._workers]
+        self._pending.extend(jobs)
+        self._dispatch()
+        return jobs
+
+    def promote(self, job: Job, timeout=None):
+        """Turn a background job into a normal one (e.g. the user asked for its result)."""
+        job.background = False
+        job.timeout = timeout
+        self._dispatch()
+
+    def cancel(self, job: Job):
+        if job.status == PENDING:
+            self._pending.remove(job)
+            self._finish(job, CANCELLED)
+        elif job.status == RUNNING:
+            self._replace(self._worker_of(job))
+            self._finish(job, CANCELLED)
+
+    def cancel_all(self):
+        for job in list(self._pending) + self.running():
+            self.cancel(job)
+
+    def running(self) -> list:
+        return [w.job for w in self._workers if w.job is not None]
+
+    def pending(self) -> list:
+        return list(self._pending)
+
+    def active(self) -> int:
+        return len(self._pending) + len(self.running())
+
+    def poll(self) -> list:
+        """Collect finished jobs without blocking; enforces timeouts."""
+        now = time.monotonic()
+        for w in list(self._workers):
+            job = w.job
+            if job is None:
+                continue
+            try:
+                ready = w.conn.poll()
+                if ready:
+                    job_id, ok, value, job.extras = w.conn.recv()
+            except (EOFError, OSError):
+                self._replace(w)
+                self._finish(job, ERROR, error="Worker process died.")
+                continue
+            if ready:
+                w.job = None
+                if ok:
+                    self._finish(job, DONE, result=value)
+                else:
+                    self._finish(job, ERROR, error=value)
+            elif job.timeout is not None and now - job.started > job.timeout:
+                self._replace(w)
+                self._finish(job, TIMEOUT, error=f"Timed out after {job.timeout:g} s.")
+        self._dispatch()
+        finished, self._finished = self._finished, []
+        return finished
+
+    def wait(self, timeout=None) -> list:
+        """Block until at least one job finishes (or timeout) and return the finished jobs."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            finished = self.poll()
+            if finished or not self.active():
+                return finished
+            now = time.monotonic()
+            limits = [j.started + j.timeout - now for j in self.running() if j.timeout is not None]
+            if deadline is not None:
+                limits.append(deadline - now)
+                if deadline <= now:
+                    return finished
+            busy = [w.conn for w in self._workers if w.job is not None]
+            if not busy:            # only background jobs left, waiting for a free worker
+                return finished
+            wait_connections(busy, max(0.0, min(limits)) if limits else None)
+
+    def shutdown(self):
+        self._pending.clear()
+        for w in self._workers:
+            try:
+                if w.job is None:
+                    w.conn.send(None)
+            except OSError:
+                pass
+            w.kill()
+        self._workers = []
+
+    def _worker_of(self, job):
+        return next(w for w in self._workers if w.job is job)
+
+    def _replace(self, worker):
+        worker.kill()
+        self._workers.remove(worker)
+        fresh = _Worker(self._ctx, self.preload)
+        self._workers.append(fresh)
+        for job in self._pending:
+            if job.pin is worker:
+                job.pin = fresh
+
+    def _finish(self, job, status, result=None, error=None):
+        job.status, job.result, job.error = status, result, error
+        job.finished = time.monotonic()
+        if job.started is None:
+            job.started = job.finished
+        self._finished.append(job)
+
+    def _dispatch(self):
+        self.start()
+        while self._pending:
+            idle = [w for w in self._workers if w.job is None]
+            job = next((j for j in self._pending if not j.background and (j.pin is None or j.pin in idle)), None)
+            if job is None and len(idle) > 1:
+                job = next((j for j in self._pending if j.background), None)
+            if not idle or job is None:
+                return
+            self._pending.remove(job)
+            w = job.pin or next((w for w in idle if job.affinity is not None and job.affinity in w.recent), idle[0])
+            try:
+                w.conn.send((job.id, job.target, job.args, job.kwargs))
+            except OSError:
+                self._pending.appendleft(job)
+                self._replace(w)
+                continue
+            w.job = job
+            if job.affinity is not None:
+                w.recent.append(job.affinity)
+            job.status = RUNNING
+            job.started = time.monotonic()